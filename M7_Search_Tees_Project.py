@@ -11,10 +11,20 @@ Provides interactive menu for data management and tree height analysis.
 """
 
 import os
-from SearchTrees import BSTMap, AVLTreeMap
+import argparse
+from SearchTrees import BSTMap
+from tree_engines import (DEFAULT_ENGINE, create_tree_map, available_engines,
+                          describe_engine)
 from schedule import Schedule
 from schedule_item import ScheduleItem
-from csv_loader import load_schedule_from_csv, create_sample_csv
+from csv_loader import parse_schedule_csv, ingest_records, create_sample_csv
+from meeting_times import format_week_minute
+
+# engines whose height() is an AVL tree's, so the 1.44 × log₂ bound holds
+AVL_ENGINES = ("avl", "array-avl", "persistent-avl")
+# engines whose height() counts levels of a multiway structure, which
+# can't be set against a binary tree's height
+MULTIWAY_ENGINES = ("btree", "skiplist")
 
 
 def clear_screen():
@@ -29,25 +39,90 @@ def print_header(title):
     print(f"{'='*80}\n")
 
 
-def display_menu():
+def display_menu(engine=DEFAULT_ENGINE):
     """Display the main menu"""
-    print_header("Course Schedule System - BST vs AVL Comparison")
+    print_header(f"Course Schedule System - BST vs {engine.upper()} Comparison")
     print("1.  Load Data from CSV")
     print("2.  Display All Courses (BST)")
-    print("3.  Display All Courses (AVL)")
+    print(f"3.  Display All Courses ({engine.upper()})")
     print("4.  Search by CRN")
     print("5.  Search by Course Code")
     print("6.  Search by Instructor")
     print("7.  Display Tree Heights")
-    print("8.  Compare BST vs AVL Heights")
+    print(f"8.  Compare BST vs {engine.upper()} Heights")
     print("9.  Display Statistics")
     print("10. Create Sample CSV")
+    print("11. Select Tree Engine")
+    print("12. Search by Meeting Time")
+    print("13. Find Room/Instructor Conflicts")
+    print("14. Toggle Operation Statistics")
     print("0.  Exit")
     print(f"{'='*80}")
 
 
-def load_data_menu(bst_schedule, avl_schedule):
-    """Handle loading data from CSV"""
+def enable_tree_stats(schedule):
+    """Turn on operation counters for a schedule's tree, if the engine has them"""
+    if hasattr(schedule.tree_map, "enable_stats"):
+        schedule.tree_map.enable_stats()
+
+
+def disable_tree_stats(schedule):
+    """Turn off operation counters for a schedule's tree, restoring the plain methods"""
+    if hasattr(schedule.tree_map, "disable_stats"):
+        schedule.tree_map.disable_stats()
+
+
+def toggle_stats_menu(bst_schedule, avl_schedule, stats):
+    """Switch operation statistics on or off for both trees; returns the new setting"""
+    print_header("Operation Statistics")
+    stats = not stats
+    for schedule in (bst_schedule, avl_schedule):
+        if stats:
+            enable_tree_stats(schedule)
+        else:
+            disable_tree_stats(schedule)
+    if stats:
+        print("✓ Statistics on: searches, inserts and deletes are counted and timed")
+        print("  (engines without counters are skipped)")
+    else:
+        print("✓ Statistics off: trees run their plain, uninstrumented methods")
+    return stats
+
+
+def search_both(bst_schedule, avl_schedule, engine, find):
+    """
+    Run a query against both schedules, so both trees' statistics measure
+    the same workload, and return the BST's results
+    """
+    print(f"\nSearching in BST and {engine.upper()}...")
+    bst_result = find(bst_schedule)
+    if find(avl_schedule) != bst_result:
+        print(f"\n! BST and {engine.upper()} returned different results")
+    return bst_result
+
+
+def print_measured_search_cost(label, schedule):
+    """Print the measured search path length and rotation counts of a tree"""
+    average_depth = schedule.get_average_depth()
+    if average_depth is not None:
+        print(f"   • {label} average key depth: {average_depth:.2f} nodes "
+              f"visited per successful search")
+    stats = getattr(schedule.tree_map, "stats", None)
+    if stats is None:
+        return
+    search = stats.get("search")
+    if search.calls:
+        print(f"   • {label} measured over {search.calls:,} searches: "
+              f"{search.average('nodes_visited'):.2f} nodes, "
+              f"{search.average('comparisons'):.2f} key comparisons, "
+              f"p50 ≤ {search.latency_percentile(0.5):,} ns")
+    if stats.rotation_count:
+        cases = ", ".join(f"{kind} {count:,}" for kind, count in stats.rotations.items())
+        print(f"   • {label} rebalancing so far: {stats.rotation_count:,} ({cases})")
+
+
+def load_data_menu(bst_schedule, avl_schedule, engine=DEFAULT_ENGINE, stats=False):
+    """Handle loading data from CSV; the second schedule uses the selected engine"""
     print_header("Load Data from CSV")
     filename = input("Enter CSV filename (or press Enter for 'courses_2023.csv'): ").strip()
     
@@ -65,17 +140,24 @@ def load_data_menu(bst_schedule, avl_schedule):
     try:
         # Create new tree maps and schedules
         new_bst = BSTMap()
-        new_avl = AVLTreeMap()
+        new_avl = create_tree_map(engine)
         temp_bst_schedule = Schedule(new_bst)
         temp_avl_schedule = Schedule(new_avl)
+        if stats:
+            enable_tree_stats(temp_bst_schedule)
+            enable_tree_stats(temp_avl_schedule)
+        
+        # Parse the file once; both trees share the same item objects
+        print(f"\nParsing CSV...")
+        records = parse_schedule_csv(filename, fast=True)
         
         # Load into BST
-        print(f"\nLoading into BST...")
-        bst_count = load_schedule_from_csv(filename, temp_bst_schedule)
+        print(f"Loading into BST...")
+        bst_count = ingest_records(records, temp_bst_schedule)
         
-        # Load into AVL
-        print(f"Loading into AVL...")
-        avl_count = load_schedule_from_csv(filename, temp_avl_schedule)
+        # Load into the selected engine
+        print(f"Loading into {engine.upper()}...")
+        avl_count = ingest_records(records, temp_avl_schedule)
         
         # Update schedules
         bst_schedule.tree_map = new_bst
@@ -84,7 +166,7 @@ def load_data_menu(bst_schedule, avl_schedule):
         actual_filename = filename if filename else "courses_2023.csv"
         print(f"\n✓ Successfully loaded {bst_count} courses from '{actual_filename}' into both trees!")
         print(f"  BST Height: {bst_schedule.get_tree_height()}")
-        print(f"  AVL Height: {avl_schedule.get_tree_height()}")
+        print(f"  {engine.upper()} Height: {avl_schedule.get_tree_height()}")
         
         return True
     
@@ -95,13 +177,13 @@ def load_data_menu(bst_schedule, avl_schedule):
         return False
 
 
-def search_by_crn(bst_schedule, avl_schedule):
+def search_by_crn(bst_schedule, avl_schedule, engine=DEFAULT_ENGINE):
     """Search for a course by CRN"""
     print_header("Search by CRN")
     crn = input("Enter CRN (Class Number): ").strip()
     
-    print(f"\nSearching in BST...")
-    item = bst_schedule.find_by_crn(crn)
+    item = search_both(bst_schedule, avl_schedule, engine,
+                       lambda schedule: schedule.find_by_crn(crn))
     
     if item:
         print(f"\n✓ Found:")
@@ -110,13 +192,13 @@ def search_by_crn(bst_schedule, avl_schedule):
         print(f"\n✗ No course found with CRN: {crn}")
 
 
-def search_by_course_code(bst_schedule, avl_schedule):
+def search_by_course_code(bst_schedule, avl_schedule, engine=DEFAULT_ENGINE):
     """Search for courses by course code"""
     print_header("Search by Course Code")
     code = input("Enter course code (e.g., CS101, MATH201): ").strip()
     
-    print(f"\nSearching in BST...")
-    items = bst_schedule.find_by_course_code(code)
+    items = search_both(bst_schedule, avl_schedule, engine,
+                        lambda schedule: schedule.find_by_course_code(code))
     
     if items:
         print(f"\n✓ Found {len(items)} course(s):")
@@ -126,13 +208,13 @@ def search_by_course_code(bst_schedule, avl_schedule):
         print(f"\n✗ No courses found with code: {code}")
 
 
-def search_by_instructor(bst_schedule, avl_schedule):
+def search_by_instructor(bst_schedule, avl_schedule, engine=DEFAULT_ENGINE):
     """Search for courses by instructor"""
     print_header("Search by Instructor")
     instructor = input("Enter instructor name (partial match allowed): ").strip()
     
-    print(f"\nSearching in BST...")
-    items = bst_schedule.find_by_instructor(instructor)
+    items = search_both(bst_schedule, avl_schedule, engine,
+                        lambda schedule: schedule.find_by_instructor(instructor))
     
     if items:
         print(f"\n✓ Found {len(items)} course(s):")
@@ -142,8 +224,49 @@ def search_by_instructor(bst_schedule, avl_schedule):
         print(f"\n✗ No courses found for instructor: {instructor}")
 
 
-def display_tree_heights(bst_schedule, avl_schedule):
-    """Display height information for both trees"""
+def search_by_meeting_time(schedule):
+    """Find courses meeting on a day at a time or within a time range"""
+    print_header("Search by Meeting Time")
+    day = input("Enter day (M, T, W, R, F or Mon-Sun): ").strip()
+    start = input("Enter time (e.g. 1:00 PM or 13:00): ").strip()
+    end = input("Enter end time for a range (or press Enter for that moment): ").strip()
+    
+    try:
+        if end:
+            items = schedule.find_meetings_between(day, start, end)
+            when = f"{day} {start}-{end}"
+        else:
+            items = schedule.find_meetings_at(day, start)
+            when = f"{day} {start}"
+    except ValueError as e:
+        print(f"\n✗ {e}")
+        return
+    
+    if items:
+        print(f"\n✓ Found {len(items)} course(s) meeting {when}:")
+        for item in items:
+            print(f"  {item}")
+    else:
+        print(f"\n✗ No courses meet {when}")
+
+
+def find_conflicts_menu(schedule):
+    """Report rooms and instructors booked for two courses at once"""
+    print_header("Room/Instructor Conflicts")
+    conflicts = schedule.find_conflicts()
+    if not conflicts:
+        print("✓ No double-booked rooms or instructors")
+        return
+    
+    print(f"Found {len(conflicts)} overlapping meeting(s):\n")
+    for kind, resource, item_a, item_b, start, end in conflicts:
+        print(f"  {kind:<10} {resource:<25} {format_week_minute(start)}-"
+              f"{format_week_minute(end).split(' ', 1)[1]}: "
+              f"CRN {item_a.crn} ({item_a.course_code}) / CRN {item_b.crn} ({item_b.course_code})")
+
+
+def display_tree_heights(bst_schedule, avl_schedule, engine=DEFAULT_ENGINE):
+    """Display height information for the BST and the selected engine"""
     print_header("Tree Height Information")
     
     bst_height = bst_schedule.get_tree_height()
@@ -159,9 +282,12 @@ def display_tree_heights(bst_schedule, avl_schedule):
         log_n = math.log2(bst_count) if bst_count > 0 else 1
         print(f"  Height/log₂(n): {bst_height / log_n:.2f}")
     
-    print(f"\nAVL (Balanced Tree):")
+    print(f"\n{engine.upper()} ({describe_engine(engine)}):")
     print(f"  Items: {avl_count}")
     print(f"  Height: {avl_height}")
+    if engine in MULTIWAY_ENGINES:
+        print(f"  (levels of a multiway structure, not comparable to a binary tree's height)")
+        return
     if avl_count > 0:
         import math
         log_n = math.log2(avl_count) if avl_count > 0 else 1
@@ -170,9 +296,12 @@ def display_tree_heights(bst_schedule, avl_schedule):
     print(f"\nHeight Difference: {abs(bst_height - avl_height)} edges")
 
 
-def compare_heights(bst_schedule, avl_schedule):
-    """Compare BST and AVL tree heights with analysis"""
-    print_header("BST vs AVL Height Comparison")
+def compare_heights(bst_schedule, avl_schedule, engine=DEFAULT_ENGINE):
+    """Compare the BST's height with the selected engine's, with analysis"""
+    label = engine.upper()
+    is_avl = engine in AVL_ENGINES
+    comparable = engine not in MULTIWAY_ENGINES
+    print_header(f"BST vs {label} Height Comparison")
     
     bst_height = bst_schedule.get_tree_height()
     avl_height = avl_schedule.get_tree_height()
@@ -188,10 +317,15 @@ def compare_heights(bst_schedule, avl_schedule):
     
     print(f"Number of Nodes: {n}")
     print(f"Optimal Height (⌊log₂(n)⌋): {optimal_height}")
-    print(f"AVL Maximum Theoretical: {avl_max_theoretical} (≤ 1.44 × log₂(n+2))")
+    if is_avl:
+        print(f"AVL Maximum Theoretical: {avl_max_theoretical} (≤ 1.44 × log₂(n+2))")
     print(f"\nBST Height: {bst_height}")
-    print(f"AVL Height: {avl_height}")
-    print(f"\nDifference: {abs(bst_height - avl_height)} edges")
+    print(f"{label} Height: {avl_height}")
+    if comparable:
+        print(f"\nDifference: {abs(bst_height - avl_height)} edges")
+    else:
+        print(f"\n{label} height counts levels of a multiway structure, "
+              f"so it is not comparable to the BST's")
     
     # Calculate efficiency ratios
     bst_efficiency = (optimal_height / bst_height * 100) if bst_height > 0 else 100
@@ -209,54 +343,62 @@ def compare_heights(bst_schedule, avl_schedule):
     print(f"   • Worst case: O(n) for degenerate tree (becomes linked list)")
     print(f"   • Average case: O(log n) for random insertions")
     
-    print(f"\n2. AVL Performance:")
-    print(f"   • Height: {avl_height} (vs optimal {optimal_height})")
-    print(f"   • Height excess: {avl_height - optimal_height} edges")
-    print(f"   • Efficiency: {avl_efficiency:.1f}% of optimal")
-    print(f"   • AVL maintains balance: height ≤ 1.44 × log₂(n+2)")
-    print(f"   • Guaranteed O(log n) for all operations")
-    print(f"   • Self-balancing through rotations")
+    print(f"\n2. {label} Performance ({describe_engine(engine)}):")
+    print(f"   • Height: {avl_height}" + (f" (vs optimal {optimal_height})" if comparable else ""))
+    if comparable:
+        print(f"   • Height excess: {avl_height - optimal_height} edges")
+        print(f"   • Efficiency: {avl_efficiency:.1f}% of optimal")
+    if is_avl:
+        print(f"   • AVL maintains balance: height ≤ 1.44 × log₂(n+2)")
+        print(f"   • Guaranteed O(log n) for all operations")
+        print(f"   • Self-balancing through rotations")
     
     print(f"\n3. Comparison:")
-    if bst_height == avl_height:
+    if not comparable:
+        print(f"   • Heights are not comparable; see the measured search costs below")
+    elif bst_height == avl_height:
         print(f"   • Both trees have the same height!")
         print(f"   • This suggests the CRNs created a naturally balanced BST.")
         print(f"   • With {n} courses, this is somewhat unusual.")
     elif bst_height > avl_height:
         diff_pct = ((bst_height - avl_height) / avl_height * 100) if avl_height > 0 else 0
-        speedup = bst_height / avl_height if avl_height > 0 else 1
         print(f"   • BST is {bst_height - avl_height} edges taller ({diff_pct:.1f}% taller)")
-        print(f"   • AVL's balancing reduced tree height significantly")
-        print(f"   • AVL search is approximately {speedup:.1f}x faster in worst case")
+        if is_avl:
+            print(f"   • AVL's balancing reduced tree height significantly")
+        bst_depth = bst_schedule.get_average_depth()
+        avl_depth = avl_schedule.get_average_depth()
+        if bst_depth is not None and avl_depth:
+            ratio = bst_depth / avl_depth
+            print(f"   • Measured: an average BST search visits {ratio:.1f}x as many nodes")
         print(f"   • With {n} courses, this difference is substantial!")
     else:
-        print(f"   • Unexpected: BST is shorter than AVL")
+        print(f"   • Unexpected: BST is shorter than {label}")
         print(f"   • This suggests the CRNs were in optimal insertion order")
     
     print(f"\n4. Practical Impact on {n} Courses:")
-    print(f"   • BST worst-case search: ~{bst_height} comparisons")
-    print(f"   • AVL worst-case search: ~{avl_height} comparisons")
-    if bst_height > avl_height:
-        saved = bst_height - avl_height
-        print(f"   • AVL saves up to {saved} comparisons per search!")
-        print(f"   • For 1000 searches: ~{saved * 1000:,} fewer comparisons")
+    print(f"   • BST worst-case search: {bst_height + 1} nodes visited")
+    if comparable:
+        print(f"   • {label} worst-case search: {avl_height + 1} nodes visited")
+    print_measured_search_cost("BST", bst_schedule)
+    print_measured_search_cost(label, avl_schedule)
     
     print(f"\n5. Why The Difference Exists:")
     print(f"   • CRNs (Class Numbers) determine insertion order")
     print(f"   • If CRNs are sequential/sorted → BST degenerates")
     print(f"   • If CRNs are random → BST stays more balanced")
-    print(f"   • AVL guarantees balance regardless of CRN pattern")
+    if is_avl:
+        print(f"   • AVL guarantees balance regardless of CRN pattern")
     print(f"   • Real course data often has patterns (sorted sections, etc.)")
 
 
-def display_statistics(bst_schedule, avl_schedule):
-    """Display detailed statistics for both trees"""
+def display_statistics(bst_schedule, avl_schedule, engine=DEFAULT_ENGINE):
+    """Display detailed statistics for both schedules"""
     print_header("Schedule Statistics")
     
     print("BST Schedule:")
     bst_schedule.display_statistics()
     
-    print("\nAVL Schedule:")
+    print(f"\n{engine.upper()} Schedule:")
     avl_schedule.display_statistics()
 
 
@@ -281,42 +423,80 @@ def create_sample_csv_menu():
         print(f"\n✗ Failed to create sample CSV.")
 
 
-def main():
-    """Main program loop"""
-    # Initialize both tree types
+def select_engine_menu(avl_schedule, engine, stats=False):
+    """Switch the second schedule to another tree engine, keeping its data"""
+    print_header("Select Tree Engine")
+    for name in available_engines():
+        marker = "*" if name == engine else " "
+        print(f" {marker} {name:<12} {describe_engine(name)}")
+    name = input(f"\nEnter engine name (or press Enter to keep '{engine}'): ").strip().lower()
+    
+    if not name or name == engine:
+        return engine
+    try:
+        new_map = create_tree_map(name)
+    except ValueError as e:
+        print(f"\n✗ {e}")
+        return engine
+    
+    # the old map yields its items in key order, so the new one bulk-loads them
+    new_map.bulk_load(avl_schedule.tree_map.inorder_items())
+    avl_schedule.tree_map = new_map
+    if stats:
+        enable_tree_stats(avl_schedule)
+    print(f"\n✓ Switched to '{name}' ({avl_schedule.get_item_count()} courses, "
+          f"height {avl_schedule.get_tree_height()})")
+    return name
+
+
+def main(engine=DEFAULT_ENGINE, stats=False):
+    """Main program loop; stats turns on operation counters from the start"""
+    # Initialize the BST and the selected engine (AVL by default)
     bst_schedule = Schedule(BSTMap())
-    avl_schedule = Schedule(AVLTreeMap())
+    avl_schedule = Schedule(create_tree_map(engine))
+    if stats:
+        enable_tree_stats(bst_schedule)
+        enable_tree_stats(avl_schedule)
     
     print("\nWelcome to the Course Schedule System!")
-    print("This system compares Binary Search Trees (BST) vs AVL Trees")
+    print(f"This system compares a Binary Search Tree (BST) with a second engine "
+          f"({engine}: {describe_engine(engine)})")
     print("Default data file: courses_2023.csv")
     
     while True:
-        display_menu()
+        display_menu(engine)
         choice = input("\nEnter your choice: ").strip()
         
         if choice == '1':
-            load_data_menu(bst_schedule, avl_schedule)
+            load_data_menu(bst_schedule, avl_schedule, engine, stats)
         elif choice == '2':
             print_header("All Courses (BST)")
             bst_schedule.display_all()
         elif choice == '3':
-            print_header("All Courses (AVL)")
+            print_header(f"All Courses ({engine.upper()})")
             avl_schedule.display_all()
         elif choice == '4':
-            search_by_crn(bst_schedule, avl_schedule)
+            search_by_crn(bst_schedule, avl_schedule, engine)
         elif choice == '5':
-            search_by_course_code(bst_schedule, avl_schedule)
+            search_by_course_code(bst_schedule, avl_schedule, engine)
         elif choice == '6':
-            search_by_instructor(bst_schedule, avl_schedule)
+            search_by_instructor(bst_schedule, avl_schedule, engine)
         elif choice == '7':
-            display_tree_heights(bst_schedule, avl_schedule)
+            display_tree_heights(bst_schedule, avl_schedule, engine)
         elif choice == '8':
-            compare_heights(bst_schedule, avl_schedule)
+            compare_heights(bst_schedule, avl_schedule, engine)
         elif choice == '9':
-            display_statistics(bst_schedule, avl_schedule)
+            display_statistics(bst_schedule, avl_schedule, engine)
         elif choice == '10':
             create_sample_csv_menu()
+        elif choice == '11':
+            engine = select_engine_menu(avl_schedule, engine, stats)
+        elif choice == '12':
+            search_by_meeting_time(avl_schedule)
+        elif choice == '13':
+            find_conflicts_menu(avl_schedule)
+        elif choice == '14':
+            stats = toggle_stats_menu(bst_schedule, avl_schedule, stats)
         elif choice == '0':
             print_header("Thank you for using Course Schedule System!")
             print("Goodbye!\n")
@@ -328,4 +508,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Course Schedule System")
+    parser.add_argument("--engine", choices=available_engines(), default=DEFAULT_ENGINE,
+                        help="tree engine compared against the BST (default: %(default)s)")
+    parser.add_argument("--stats", action="store_true",
+                        help="count and time tree operations from the start "
+                             "(menu option 14 toggles this)")
+    args = parser.parse_args()
+    main(args.engine, args.stats)
\ No newline at end of file
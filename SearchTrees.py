@@ -5,84 +5,660 @@ This file provides:
 - BSTMap: Binary Search Tree Map (unbalanced)
 - AVLTreeMap: Self-balancing AVL Tree Map
 *** Height methods have been implemented by students ***
+
+All operations are iterative (explicit stacks / path lists) so that deep,
+degenerate trees never hit Python's recursion limit. The only recursive
+helper is the balanced bulk build, whose depth is bounded by log2(n).
+
+enable_stats() turns on operation counters and latency histograms for one
+map (see tree_stats.py); disabled maps run the plain methods.
 """
 
+import time
+from bisect import bisect_left
+from tree_stats import TreeStats
+
+# search_many() stops splitting probe groups this small (separate loops are
+# cheaper than further bisects in CPython)
+_SEARCH_MANY_GROUP = 8
+
+# ---------------------------------------------------------
+# ------------------ SHARED READ OPERATIONS ----------------
+# ---------------------------------------------------------
+class _TreeMapBase:
+    """Operations shared by BSTMap and AVLTreeMap."""
+
+    _node_class = None  # set by each subclass
+    stats = None  # TreeStats while enable_stats() is on
+    # True for maps that report every node a write builds through
+    # _count_allocations(); for the others stats count one node per new key
+    _counts_allocations = False
+
+    def __init__(self):
+        self._root = None
+
+    # ------------------------ BULK LOAD ------------------------
+    @classmethod
+    def from_sorted_items(cls, items):
+        """Build a perfectly balanced map from (key, value) pairs sorted by key."""
+        tree_map = cls()
+        tree_map.bulk_load(items)
+        return tree_map
+
+    def bulk_load(self, items):
+        """
+        Add (key, value) pairs sorted by key in O(n + m) time.
+
+        The new pairs are merged with the existing contents and the whole
+        tree is rebuilt perfectly balanced. As with insert(), a later value
+        for a repeated key replaces the earlier one.
+
+        Raises:
+            ValueError: If the keys are not in ascending order
+        """
+        keys, values = _merge_sorted(self.inorder_items(), _dedupe_sorted(items))
+        self._root = self._build_balanced(keys, values, 0, len(keys) - 1)
+
+    def _build_balanced(self, keys, values, lo, hi):
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = self._node_class(keys[mid], values[mid])
+        node.left = self._build_balanced(keys, values, lo, mid - 1)
+        node.right = self._build_balanced(keys, values, mid + 1, hi)
+        self._pull(node)
+        return node
+
+    def _get_size(self, node):
+        return node.size if node else 0
+
+    def _pull(self, node):
+        """Recompute node's augmented fields (subtree size) from its children."""
+        node.size = 1 + self._get_size(node.left) + self._get_size(node.right)
+
+    # ------------------------ SIZE / RANK ------------------------
+    def __len__(self):
+        """Number of keys in the map, in O(1)."""
+        return self._get_size(self._root)
+
+    def rank(self, key):
+        """Return the number of keys strictly less than key, in O(log n)."""
+        rank = 0
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                rank += self._get_size(node.left) + 1
+                node = node.right
+            else:
+                return rank + self._get_size(node.left)
+        return rank
+
+    def select(self, index):
+        """
+        Return the (key, value) pair with the given 0-based rank, in O(log n).
+
+        Negative indexes count from the end, as with lists.
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("select index out of range")
+        node = self._root
+        while True:
+            left_size = self._get_size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index > left_size:
+                index -= left_size + 1
+                node = node.right
+            else:
+                return (node.key, node.value)
+
+    def items_by_rank(self, start, stop=None):
+        """Yield (key, value) pairs with ranks in [start, stop), in O(log n + k)."""
+        n = len(self)
+        start, stop, _ = slice(start, stop).indices(n)
+        if start >= stop:
+            return
+        # descend to the start rank, keeping the ancestors we still owe a visit
+        stack = []
+        node = self._root
+        index = start
+        while node is not None:
+            left_size = self._get_size(node.left)
+            if index < left_size:
+                stack.append(node)
+                node = node.left
+            elif index > left_size:
+                index -= left_size + 1
+                node = node.right
+            else:
+                stack.append(node)
+                break
+        yield from self._resume_inorder(stack, stop - start)
+
+    def _resume_inorder(self, stack, limit=None):
+        """Continue an in-order walk whose pending ancestors are on stack."""
+        while stack and limit != 0:
+            node = stack.pop()
+            yield (node.key, node.value)
+            if limit is not None:
+                limit -= 1
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    # ------------------------ SEARCH ------------------------
+    def search(self, key):
+        """Return the value matching key, or None if not found."""
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node.value
+        return None
+
+    # the same lookup under a name enable_stats() never wraps, for callers
+    # (like Schedule) whose internal probes shouldn't count as searches
+    get = search
+
+    def search_many(self, keys):
+        """
+        Look up many keys at once.
+
+        The probe keys are sorted and routed down the tree together: at each
+        node the sorted probes are split around its key (one bisect), so
+        probes sharing a path prefix share that part of the walk. Groups of
+        at most _SEARCH_MANY_GROUP probes finish with plain search loops
+        from the node they reached.
+
+        Returns:
+            list: The value for each key in input order, None for misses
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        if self._root is None or not keys:
+            return results
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        probes = [keys[i] for i in order]
+        stack = [(self._root, 0, len(probes))]  # (subtree, probe range)
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi - lo <= _SEARCH_MANY_GROUP:
+                for j in range(lo, hi):
+                    key = probes[j]
+                    n = node
+                    while n is not None:
+                        if key < n.key:
+                            n = n.left
+                        elif key > n.key:
+                            n = n.right
+                        else:
+                            results[order[j]] = n.value
+                            break
+                continue
+            node_key = node.key
+            mid = bisect_left(probes, node_key, lo, hi)
+            end = mid
+            while end < hi and not node_key < probes[end]:
+                results[order[end]] = node.value  # (repeated) probes for this key
+                end += 1
+            if lo < mid and node.left is not None:
+                stack.append((node.left, lo, mid))
+            if end < hi and node.right is not None:
+                stack.append((node.right, end, hi))
+        return results
+
+    # ------------------- TRAVERSAL (INORDER) -------------------
+    def inorder_items(self):
+        """Yield (key, value) pairs in sorted order."""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield (node.key, node.value)
+            node = node.right
+
+    # ------------------------ ORDERED QUERIES ------------------------
+    def min(self):
+        """Return the (key, value) pair with the smallest key, or None if empty."""
+        node = self._root
+        if node is None:
+            return None
+        while node.left is not None:
+            node = node.left
+        return (node.key, node.value)
+
+    def max(self):
+        """Return the (key, value) pair with the largest key, or None if empty."""
+        node = self._root
+        if node is None:
+            return None
+        while node.right is not None:
+            node = node.right
+        return (node.key, node.value)
+
+    def floor(self, key):
+        """Return the pair with the largest key <= key, or None if there is none."""
+        best = None
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                best = node
+                if not node.key < key:
+                    break  # exact match
+                node = node.right
+        return (best.key, best.value) if best is not None else None
+
+    def ceiling(self, key):
+        """Return the pair with the smallest key >= key, or None if there is none."""
+        best = None
+        node = self._root
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                best = node
+                if not key < node.key:
+                    break  # exact match
+                node = node.left
+        return (best.key, best.value) if best is not None else None
+
+    def items_from(self, key):
+        """Lazily yield (key, value) pairs with keys >= key in sorted order."""
+        # collect the ancestors whose keys are >= key; they are visited in order
+        stack = []
+        node = self._root
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+        return self._resume_inorder(stack)
+
+    def range_items(self, lo, hi):
+        """Lazily yield (key, value) pairs with lo <= key <= hi, in O(log n + k)."""
+        for key, value in self.items_from(lo):
+            if hi < key:
+                return
+            yield (key, value)
+
+    # ------------------------ DELETE ------------------------
+    def delete_many(self, keys):
+        """
+        Delete every key in keys that is present.
+
+        Returns:
+            list: The removed (key, value) pairs in key order
+        """
+        removed = []
+        for key in sorted(set(keys)):
+            value = self.delete(key)
+            if value is not None:
+                removed.append((key, value))
+        return removed
+
+    def _detach(self, key):
+        """
+        Unlink the node holding key and shrink the sizes above it.
+
+        A node with two children takes over its in-order successor's entry
+        and the successor (which has no left child) is unlinked instead.
+
+        Returns:
+            tuple: (removed value, path of ancestors of the unlinked node),
+            or None if key is not present
+        """
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        else:
+            return None
+
+        value = node.value
+        if node.left is not None and node.right is not None:
+            target = node
+            path.append(node)
+            node = node.right
+            while node.left is not None:
+                path.append(node)
+                node = node.left
+            target.key = node.key
+            target.value = node.value
+
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self._root = child
+        else:
+            parent = path[-1]
+            if parent.left is node:
+                parent.left = child
+            else:
+                parent.right = child
+        for ancestor in path:
+            ancestor.size -= 1
+        return value, path
+
+    # ------------------- ROTATIONS -------------------
+    # used by the self-balancing subclasses; _pull keeps their augmented
+    # fields (height, size, ...) current
+
+    def _replace_child(self, path, old, new):
+        """Put new where old was, under path[-1] (or as the root)."""
+        if not path:
+            self._root = new
+        elif path[-1].left is old:
+            path[-1].left = new
+        else:
+            path[-1].right = new
+
+    def _rotate_left(self, z):
+        y = z.right
+        z.right = y.left
+        y.left = z
+        self._pull(z)
+        self._pull(y)
+        return y
+
+    def _rotate_right(self, z):
+        y = z.left
+        z.left = y.right
+        y.right = z
+        self._pull(z)
+        self._pull(y)
+        return y
+
+    def _count_rotation(self, case):
+        """
+        Count a rebalancing step while stats are on, by its AVL case: a
+        single right/left rotation is LL/RR, a double one LR/RL.
+        """
+        if self.stats is not None:
+            self.stats.count_rotation(case)
+
+    def _count_allocations(self, count):
+        """Count nodes built by a write while stats are on."""
+        if self.stats is not None:
+            self.stats.count_allocations(count)
+
+    # ------------------------ INSTRUMENTATION ------------------------
+    _INSTRUMENTED = ("search", "insert", "delete")
+
+    def enable_stats(self, stats=None):
+        """
+        Start recording search/insert/delete statistics and return the
+        TreeStats they go to (a new one unless stats is given).
+
+        Counting versions of the three methods are installed on this
+        instance only; the class methods are untouched, so maps without
+        stats pay nothing. Rotations are counted by the self-balancing maps
+        (AVL, red-black tree, treap).
+        """
+        self.stats = stats if stats is not None else TreeStats()
+        for operation in self._INSTRUMENTED:
+            setattr(self, operation, self._instrumented(operation))
+        return self.stats
+
+    def disable_stats(self):
+        """Stop recording and restore the plain methods."""
+        for operation in self._INSTRUMENTED:
+            self.__dict__.pop(operation, None)
+        self.stats = None
+
+    def _instrumented(self, operation):
+        """Wrap a bound method so each call is counted and timed."""
+        method = getattr(type(self), operation).__get__(self)
+        stats = self.stats
+        trace = self._trace
+        clock = time.perf_counter_ns
+
+        def call(key, *args):
+            # the search path is traced before the (timed) call, since the
+            # call may restructure it
+            comparisons, visited, node = trace(key)
+            allocations = 0
+            if node is None:
+                allocations = operation == "insert" and not self._counts_allocations
+            elif operation == "delete" and node.left is not None and node.right is not None:
+                successor = node.right  # _detach also walks to the successor
+                while successor is not None:
+                    visited += 1
+                    successor = successor.left
+            rotations = stats.rotation_count
+            allocated = stats.allocation_count
+            start = clock()
+            result = method(key, *args)
+            elapsed = clock() - start
+            stats.record(operation, elapsed, comparisons, visited,
+                         int(allocations) + stats.allocation_count - allocated,
+                         stats.rotation_count - rotations)
+            return result
+
+        return call
+
+    def _trace(self, key):
+        """
+        Follow the search path of key, counting as search() does.
+
+        Returns:
+            tuple: (key comparisons, nodes visited, node holding key or None)
+        """
+        comparisons = 0
+        visited = 0
+        node = self._root
+        while node is not None:
+            visited += 1
+            comparisons += 1
+            if key < node.key:
+                node = node.left
+                continue
+            comparisons += 1
+            if key > node.key:
+                node = node.right
+            else:
+                return comparisons, visited, node
+        return comparisons, visited, None
+
+    # ------------------------ HEIGHT ------------------------
+    def average_depth(self):
+        """
+        Average number of nodes on the root-to-key path over all keys, i.e.
+        the nodes a successful search visits on average (0.0 if empty).
+        """
+        total = 0
+        depth = 0
+        level = [self._root] if self._root is not None else []
+        while level:
+            depth += 1
+            total += depth * len(level)
+            level = [child for node in level
+                     for child in (node.left, node.right) if child is not None]
+        return total / len(self) if total else 0.0
+
+    def _subtree_height(self, node):
+        """Return height of the subtree (-1 for None) using a level-order walk."""
+        height = -1
+        level = [node] if node is not None else []
+        while level:
+            height += 1
+            next_level = []
+            for n in level:
+                if n.left is not None:
+                    next_level.append(n.left)
+                if n.right is not None:
+                    next_level.append(n.right)
+            level = next_level
+        return height
+
+
+def _dedupe_sorted(items):
+    """Yield (key, value) pairs from a sorted iterable, keeping the last of equal keys."""
+    it = iter(items)
+    for prev_key, prev_value in it:
+        break
+    else:
+        return
+    for key, value in it:
+        if key < prev_key:
+            raise ValueError(f"bulk_load requires sorted keys: {key!r} follows {prev_key!r}")
+        if key > prev_key:
+            yield prev_key, prev_value
+        prev_key, prev_value = key, value
+    yield prev_key, prev_value
+
+
+def _merge_sorted(old_items, new_items):
+    """Merge two sorted (key, value) streams into key/value lists; new_items win ties."""
+    keys = []
+    values = []
+    old_items = iter(old_items)
+    new_items = iter(new_items)
+    old = next(old_items, None)
+    new = next(new_items, None)
+    while old is not None and new is not None:
+        if old[0] < new[0]:
+            keys.append(old[0])
+            values.append(old[1])
+            old = next(old_items, None)
+        else:
+            if not new[0] < old[0]:
+                old = next(old_items, None)  # replaced by the new value
+            keys.append(new[0])
+            values.append(new[1])
+            new = next(new_items, None)
+    for rest, pending in ((old_items, old), (new_items, new)):
+        if pending is not None:
+            keys.append(pending[0])
+            values.append(pending[1])
+            for key, value in rest:
+                keys.append(key)
+                values.append(value)
+    return keys, values
+
+
+def _split_sorted(items, keys):
+    """
+    Split sorted (key, value) pairs by a sorted list of distinct keys.
+
+    Returns:
+        tuple: (kept keys, kept values, removed (key, value) pairs), where
+        a pair is removed if its key is in keys
+    """
+    kept_keys = []
+    kept_values = []
+    removed = []
+    i = 0
+    for key, value in items:
+        while i < len(keys) and keys[i] < key:
+            i += 1
+        if i < len(keys) and not key < keys[i]:
+            removed.append((key, value))
+        else:
+            kept_keys.append(key)
+            kept_values.append(value)
+    return kept_keys, kept_values, removed
+
+
 # ---------------------------------------------------------
 # --------------- BINARY SEARCH TREE (BST) ---------------
 # ---------------------------------------------------------
 class _BSTNode:
     """Node of a Binary Search Tree."""
-    __slots__ = "key", "value", "left", "right"
-    
+    __slots__ = "key", "value", "left", "right", "size"
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
         self.left = None
         self.right = None
+        self.size = 1  # number of nodes in this subtree
 
 
-class BSTMap:
+class BSTMap(_TreeMapBase):
     """Unbalanced Binary Search Tree Map."""
-    
+
+    _node_class = _BSTNode
+
     def __init__(self):
-        self._root = None
-    
+        super().__init__()
+        # Cached tree height. Inserts can only deepen the tree, so they keep
+        # it current; deletes and bulk loads reset it to None (dirty).
+        self._height = -1
+
     # ------------------------ INSERT ------------------------
     def insert(self, key, value):
         """Insert or update a key-value pair."""
-        self._root = self._insert_recursive(self._root, key, value)
-    
-    def _insert_recursive(self, node, key, value):
-        if node is None:
-            return _BSTNode(key, value)
-        if key < node.key:
-            node.left = self._insert_recursive(node.left, key, value)
-        elif key > node.key:
-            node.right = self._insert_recursive(node.right, key, value)
-        else:
-            node.value = value  # update existing key
-        return node
-    
-    # ------------------------ SEARCH ------------------------
-    def search(self, key):
-        """Return the value matching key, or None if not found."""
-        return self._search_recursive(self._root, key)
-    
-    def _search_recursive(self, node, key):
-        if node is None:
-            return None
-        if key < node.key:
-            return self._search_recursive(node.left, key)
-        elif key > node.key:
-            return self._search_recursive(node.right, key)
-        else:
-            return node.value
-    
-    # ------------------- TRAVERSAL (INORDER) -------------------
-    def inorder_items(self):
-        """Yield (key, value) pairs in sorted order."""
-        yield from self._inorder_recursive(self._root)
-    
-    def _inorder_recursive(self, node):
-        if node is not None:
-            yield from self._inorder_recursive(node.left)
-            yield (node.key, node.value)
-            yield from self._inorder_recursive(node.right)
-    
-    # ------------------------ HEIGHT ------------------------
-    #Returns height of BST tree
-    def height(self):
-        return self._height_recursive(self._root)
+        if self._root is None:
+            self._root = _BSTNode(key, value)
+            self._height = 0
+            return
+        path = []
+        node = self._root
+        while True:
+            path.append(node)
+            if key < node.key:
+                if node.left is None:
+                    node.left = _BSTNode(key, value)
+                    break
+                node = node.left
+            elif key > node.key:
+                if node.right is None:
+                    node.right = _BSTNode(key, value)
+                    break
+                node = node.right
+            else:
+                node.value = value  # update existing key
+                return
+        for node in path:
+            node.size += 1
+        # the new leaf sits at depth len(path)
+        if self._height is not None and len(path) > self._height:
+            self._height = len(path)
 
-    #returns height of the subtree and -1 for none
-    def _height_recursive(self, node):
-        if node is None:
-            return -1
+    def bulk_load(self, items):
+        super().bulk_load(items)
+        self._height = None
 
-        left_height = self._height_recursive(node.left)
-        right_height = self._height_recursive(node.right)
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        detached = self._detach(key)
+        if detached is None:
+            return None
+        self._height = None
+        return detached[0]
 
-        return 1 + max(left_height, right_height)
+    # ------------------------ HEIGHT ------------------------
+    #Returns height of BST tree (-1 for an empty tree); only walks the
+    #tree when a delete or bulk load has invalidated the cached value
+    def height(self):
+        if self._height is None:
+            self._height = self._subtree_height(self._root)
+        return self._height
 
 
 
@@ -92,139 +668,144 @@ class BSTMap:
 # ---------------------------------------------------------
 class _AVLNode:
     """Node of an AVL Tree."""
-    __slots__ = "key", "value", "left", "right", "height"
-    
+    __slots__ = "key", "value", "left", "right", "height", "size"
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
         self.left = None
         self.right = None
         self.height = 0  # used for AVL balancing
+        self.size = 1  # number of nodes in this subtree
 
 
-class AVLTreeMap:
+class AVLTreeMap(_TreeMapBase):
     """Self-balancing AVL Tree Map."""
-    
-    def __init__(self):
-        self._root = None
-    
+
+    _node_class = _AVLNode
+
     # ------------------------ INSERT ------------------------
     def insert(self, key, value):
-        self._root = self._insert_recursive(self._root, key, value)
-    
-    def _insert_recursive(self, node, key, value):
-        if node is None:
-            return _AVLNode(key, value)
-        if key < node.key:
-            node.left = self._insert_recursive(node.left, key, value)
-        elif key > node.key:
-            node.right = self._insert_recursive(node.right, key, value)
+        """Insert or update a key-value pair, rebalancing on the way back up."""
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                node.value = value  # update existing
+                return
+
+        new_node = self._node_class(key, value)
+        if not path:
+            self._root = new_node
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
         else:
-            node.value = value  # update existing
-            return node
-        
-        # update height
-        node.height = 1 + max(self._get_height(node.left),
-                              self._get_height(node.right))
-        
-        # compute balance factor
-        balance = self._get_balance(node)
-        
-        # perform rotations if unbalanced
-        # Case 1: Left Left
-        if balance > 1 and key < node.left.key:
-            return self._rotate_right(node)
-        
-        # Case 2: Right Right
-        if balance < -1 and key > node.right.key:
-            return self._rotate_left(node)
-        
-        # Case 3: Left Right
-        if balance > 1 and key > node.left.key:
-            node.left = self._rotate_left(node.left)
-            return self._rotate_right(node)
-        
-        # Case 4: Right Left
-        if balance < -1 and key < node.right.key:
-            node.right = self._rotate_right(node.right)
-            return self._rotate_left(node)
-        
-        return node
-    
-    # ------------------------ SEARCH ------------------------
-    def search(self, key):
-        return self._search_recursive(self._root, key)
-    
-    def _search_recursive(self, node, key):
-        if node is None:
+            parent.right = new_node
+        for node in path:
+            node.size += 1
+        self._rebalance_path(path)
+
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        detached = self._detach(key)
+        if detached is None:
             return None
-        if key < node.key:
-            return self._search_recursive(node.left, key)
-        elif key > node.key:
-            return self._search_recursive(node.right, key)
-        else:
-            return node.value
-    
-    # ------------------- TRAVERSAL (INORDER) -------------------
-    def inorder_items(self):
-        yield from self._inorder_recursive(self._root)
-    
-    def _inorder_recursive(self, node):
-        if node:
-            yield from self._inorder_recursive(node.left)
-            yield (node.key, node.value)
-            yield from self._inorder_recursive(node.right)
-    
+        value, path = detached
+        self._rebalance_path(path)
+        return value
+
+    def delete_many(self, keys):
+        """
+        Delete every key in keys that is present.
+
+        Large batches (more than 1/8 of the tree) are applied with one
+        in-order pass and a linear balanced rebuild instead of one
+        O(log n) delete per key.
+
+        Returns:
+            list: The removed (key, value) pairs in key order
+        """
+        keys = sorted(set(keys))
+        if len(keys) * 8 <= len(self):
+            return super().delete_many(keys)
+
+        kept_keys, kept_values, removed = _split_sorted(self.inorder_items(), keys)
+        self._root = self._build_balanced(kept_keys, kept_values, 0, len(kept_keys) - 1)
+        return removed
+
     # ------------------- AVL UTILITIES -------------------
     def _get_height(self, node):
         return node.height if node else -1
-    
+
     def _get_balance(self, node):
         return self._get_height(node.left) - self._get_height(node.right)
-    
-    def _rotate_left(self, z):
-        y = z.right
-        T2 = y.left
-        
-        # perform rotation
-        y.left = z
-        z.right = T2
-        
-        # update heights
-        z.height = 1 + max(self._get_height(z.left),
-                           self._get_height(z.right))
-        y.height = 1 + max(self._get_height(y.left),
-                           self._get_height(y.right))
-        
-        return y
-    
-    def _rotate_right(self, z):
-        y = z.left
-        T3 = y.right
-        
-        # perform rotation
-        y.right = z
-        z.left = T3
-        
-        # update heights
-        z.height = 1 + max(self._get_height(z.left),
-                           self._get_height(z.right))
-        y.height = 1 + max(self._get_height(y.left),
-                           self._get_height(y.right))
-        
-        return y
-    
-    # ------------------------ HEIGHT ------------------------
-    # true height of AVL tree
 
-    def height(self):
-        return self._height_recursive(self._root)
+    def _pull(self, node):
+        """Recompute node's height and subtree size from its children."""
+        node.height = 1 + max(self._get_height(node.left),
+                              self._get_height(node.right))
+        node.size = 1 + self._get_size(node.left) + self._get_size(node.right)
 
-    def _height_recursive(self, node):
-        if node is None:
-            return -1
+    def _rebalance(self, node):
+        """Restore the AVL property at node and return the new subtree root."""
+        self._pull(node)
+        balance = self._get_balance(node)
+
+        if balance > 1:
+            # Case 3: Left Right (Case 1, Left Left, needs only the right rotation)
+            if self._get_balance(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+                case = "LR"
+            else:
+                case = "LL"
+            self._count_rotation(case)
+            return self._rotate_right(node)
+
+        if balance < -1:
+            # Case 4: Right Left (Case 2, Right Right, needs only the left rotation)
+            if self._get_balance(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+                case = "RL"
+            else:
+                case = "RR"
+            self._count_rotation(case)
+            return self._rotate_left(node)
+
+        return node
+
+    def _rebalance_path(self, path):
+        """Rebalance every node on a root-to-leaf path, deepest first."""
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            subtree = self._rebalance(node)
 
-        left_height = self._height_recursive(node.left)
-        right_height = self._height_recursive(node.right)
+            # re-link the (possibly rotated) subtree into its parent
+            if i == 0:
+                self._root = subtree
+            else:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = subtree
+                else:
+                    parent.right = subtree
+
+            # ancestors are unaffected once a subtree keeps its old height
+            if subtree.height == old_height:
+                break
+
+    # ------------------------ HEIGHT ------------------------
+    # true height of AVL tree, kept in the root's height field (O(1))
+
+    def height(self):
+        return self._get_height(self._root)
 
-        return 1 + max(left_height, right_height)
\ No newline at end of file
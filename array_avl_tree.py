@@ -0,0 +1,501 @@
+"""
+array_avl_tree.py
+ArrayAVLTreeMap: an AVL tree map stored as parallel columns (struct of arrays)
+instead of one Python object per node.
+
+Node i is described by keys[i], values[i], left[i], right[i], height[i] and
+size[i]. Child links are slot indexes (NIL = -1), and slots freed by delete
+are reused through a free list. Keys, links, heights and sizes live in
+array.array columns, so a node costs a few machine words instead of an
+_AVLNode object; values stay in a plain list.
+
+By default keys are kept in a plain list, so any comparable keys work
+(e.g. the CRN strings of Schedule's default codec). With
+Schedule(..., key_codec=IntKeyCodec()), pass key_typecode="q" to store the
+keys in a 64-bit int array column as well.
+
+The API matches AVLTreeMap, so it drops into Schedule unchanged.
+"""
+
+from array import array
+from bisect import bisect_left
+from SearchTrees import _SEARCH_MANY_GROUP, _dedupe_sorted, _merge_sorted, _split_sorted
+
+NIL = -1
+
+
+class ArrayAVLTreeMap:
+    """Self-balancing AVL Tree Map with array-backed node storage."""
+
+    def __init__(self, key_typecode=None):
+        self._key_typecode = key_typecode
+        self._clear()
+
+    def _clear(self):
+        self._keys = array(self._key_typecode) if self._key_typecode else []
+        self._values = []
+        self._left = array("i")
+        self._right = array("i")
+        self._height = array("b")
+        self._size = array("i")
+        self._free = []
+        self._root = NIL
+
+    def _new_node(self, key, value):
+        if self._free:
+            i = self._free.pop()
+            self._keys[i] = key
+            self._values[i] = value
+            self._left[i] = NIL
+            self._right[i] = NIL
+            self._height[i] = 0
+            self._size[i] = 1
+            return i
+        self._keys.append(key)
+        self._values.append(value)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        self._height.append(0)
+        self._size.append(1)
+        return len(self._values) - 1
+
+    def _free_node(self, i):
+        self._values[i] = None  # drop the reference; the slot is reused later
+        self._free.append(i)
+
+    # ------------------------ BULK LOAD ------------------------
+    @classmethod
+    def from_sorted_items(cls, items, key_typecode=None):
+        """Build a perfectly balanced map from (key, value) pairs sorted by key."""
+        tree_map = cls(key_typecode)
+        tree_map.bulk_load(items)
+        return tree_map
+
+    def bulk_load(self, items):
+        """
+        Add (key, value) pairs sorted by key in O(n + m) time.
+
+        The new pairs are merged with the existing contents and the columns
+        are rebuilt as a perfectly balanced tree laid out in key order.
+
+        Raises:
+            ValueError: If the keys are not in ascending order
+        """
+        keys, values = _merge_sorted(self.inorder_items(), _dedupe_sorted(items))
+        self._build_columns(keys, values)
+
+    def _build_columns(self, keys, values):
+        """Replace the tree with a balanced one over sorted keys (slot i = rank i)."""
+        n = len(keys)
+        self._clear()
+        self._keys.extend(keys)
+        self._values = list(values)
+        self._left = array("i", [NIL]) * n
+        self._right = array("i", [NIL]) * n
+        self._height = array("b", [0]) * n
+        self._size = array("i", [1]) * n
+        self._root = self._build_balanced(0, n - 1)
+
+    def _build_balanced(self, lo, hi):
+        if lo > hi:
+            return NIL
+        mid = (lo + hi) // 2
+        self._left[mid] = self._build_balanced(lo, mid - 1)
+        self._right[mid] = self._build_balanced(mid + 1, hi)
+        self._pull(mid)
+        return mid
+
+    # ------------------------ INSERT ------------------------
+    def insert(self, key, value):
+        """Insert or update a key-value pair, rebalancing on the way back up."""
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        i = self._root
+        while i != NIL:
+            k = keys[i]
+            if key < k:
+                path.append(i)
+                i = left[i]
+            elif key > k:
+                path.append(i)
+                i = right[i]
+            else:
+                self._values[i] = value  # update existing
+                return
+
+        new = self._new_node(key, value)
+        if not path:
+            self._root = new
+            return
+        parent = path[-1]
+        if key < keys[parent]:
+            left[parent] = new
+        else:
+            right[parent] = new
+        for i in path:
+            self._size[i] += 1
+        self._rebalance_path(path)
+
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        i = self._root
+        while i != NIL:
+            k = keys[i]
+            if key < k:
+                path.append(i)
+                i = left[i]
+            elif key > k:
+                path.append(i)
+                i = right[i]
+            else:
+                break
+        else:
+            return None
+
+        value = self._values[i]
+        if left[i] != NIL and right[i] != NIL:
+            # take over the in-order successor's entry and unlink it instead
+            target = i
+            path.append(i)
+            i = right[i]
+            while left[i] != NIL:
+                path.append(i)
+                i = left[i]
+            keys[target] = keys[i]
+            self._values[target] = self._values[i]
+
+        child = left[i] if left[i] != NIL else right[i]
+        if not path:
+            self._root = child
+        else:
+            parent = path[-1]
+            if left[parent] == i:
+                left[parent] = child
+            else:
+                right[parent] = child
+        self._free_node(i)
+        for j in path:
+            self._size[j] -= 1
+        self._rebalance_path(path)
+        return value
+
+    def delete_many(self, keys):
+        """
+        Delete every key in keys that is present.
+
+        Large batches (more than 1/8 of the tree) are applied with one
+        in-order pass and a linear rebuild, which also compacts the columns.
+
+        Returns:
+            list: The removed (key, value) pairs in key order
+        """
+        keys = sorted(set(keys))
+        removed = []
+        if len(keys) * 8 <= len(self):
+            for key in keys:
+                value = self.delete(key)
+                if value is not None:
+                    removed.append((key, value))
+            return removed
+
+        kept_keys, kept_values, removed = _split_sorted(self.inorder_items(), keys)
+        self._build_columns(kept_keys, kept_values)
+        return removed
+
+    # ------------------- AVL UTILITIES -------------------
+    def _get_height(self, i):
+        return self._height[i] if i != NIL else -1
+
+    def _get_size(self, i):
+        return self._size[i] if i != NIL else 0
+
+    def _get_balance(self, i):
+        return self._get_height(self._left[i]) - self._get_height(self._right[i])
+
+    def _pull(self, i):
+        """Recompute slot i's height and subtree size from its children."""
+        l, r = self._left[i], self._right[i]
+        self._height[i] = 1 + max(self._get_height(l), self._get_height(r))
+        self._size[i] = 1 + self._get_size(l) + self._get_size(r)
+
+    def _rebalance(self, i):
+        """Restore the AVL property at slot i and return the new subtree root."""
+        self._pull(i)
+        balance = self._get_balance(i)
+
+        if balance > 1:
+            # Left Right needs the extra left rotation; Left Left does not
+            if self._get_balance(self._left[i]) < 0:
+                self._left[i] = self._rotate_left(self._left[i])
+            return self._rotate_right(i)
+
+        if balance < -1:
+            # Right Left needs the extra right rotation; Right Right does not
+            if self._get_balance(self._right[i]) > 0:
+                self._right[i] = self._rotate_right(self._right[i])
+            return self._rotate_left(i)
+
+        return i
+
+    def _rebalance_path(self, path):
+        """Rebalance every slot on a root-to-leaf path, deepest first."""
+        left, right = self._left, self._right
+        for p in range(len(path) - 1, -1, -1):
+            i = path[p]
+            old_height = self._height[i]
+            subtree = self._rebalance(i)
+
+            # re-link the (possibly rotated) subtree into its parent
+            if p == 0:
+                self._root = subtree
+            else:
+                parent = path[p - 1]
+                if left[parent] == i:
+                    left[parent] = subtree
+                else:
+                    right[parent] = subtree
+
+            # ancestors are unaffected once a subtree keeps its old height
+            if self._height[subtree] == old_height:
+                break
+
+    def _rotate_left(self, z):
+        y = self._right[z]
+        self._right[z] = self._left[y]
+        self._left[y] = z
+        self._pull(z)
+        self._pull(y)
+        return y
+
+    def _rotate_right(self, z):
+        y = self._left[z]
+        self._left[z] = self._right[y]
+        self._right[y] = z
+        self._pull(z)
+        self._pull(y)
+        return y
+
+    # ------------------------ SEARCH ------------------------
+    def search(self, key):
+        """Return the value matching key, or None if not found."""
+        keys, left, right = self._keys, self._left, self._right
+        i = self._root
+        while i != NIL:
+            k = keys[i]
+            if key < k:
+                i = left[i]
+            elif key > k:
+                i = right[i]
+            else:
+                return self._values[i]
+        return None
+
+    get = search  # see _TreeMapBase.get
+
+    def search_many(self, keys):
+        """
+        Look up many keys at once, routing the sorted probes down the tree
+        together; see AVLTreeMap.search_many.
+
+        Returns:
+            list: The value for each key in input order, None for misses
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        if self._root == NIL or not keys:
+            return results
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        probes = [keys[i] for i in order]
+        tree_keys, left, right, values = self._keys, self._left, self._right, self._values
+        stack = [(self._root, 0, len(probes))]  # (subtree, probe range)
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi - lo <= _SEARCH_MANY_GROUP:
+                for j in range(lo, hi):
+                    key = probes[j]
+                    i = node
+                    while i != NIL:
+                        k = tree_keys[i]
+                        if key < k:
+                            i = left[i]
+                        elif key > k:
+                            i = right[i]
+                        else:
+                            results[order[j]] = values[i]
+                            break
+                continue
+            node_key = tree_keys[node]
+            mid = bisect_left(probes, node_key, lo, hi)
+            end = mid
+            while end < hi and not node_key < probes[end]:
+                results[order[end]] = values[node]
+                end += 1
+            if lo < mid and left[node] != NIL:
+                stack.append((left[node], lo, mid))
+            if end < hi and right[node] != NIL:
+                stack.append((right[node], end, hi))
+        return results
+
+    # ------------------- TRAVERSAL (INORDER) -------------------
+    def inorder_items(self):
+        """Yield (key, value) pairs in sorted order."""
+        stack = []
+        i = self._root
+        left = self._left
+        while i != NIL:
+            stack.append(i)
+            i = left[i]
+        return self._resume_inorder(stack)
+
+    def _resume_inorder(self, stack, limit=None):
+        """Continue an in-order walk whose pending ancestors are on stack."""
+        keys, values, left, right = self._keys, self._values, self._left, self._right
+        while stack and limit != 0:
+            i = stack.pop()
+            yield (keys[i], values[i])
+            if limit is not None:
+                limit -= 1
+            i = right[i]
+            while i != NIL:
+                stack.append(i)
+                i = left[i]
+
+    # ------------------------ SIZE / RANK ------------------------
+    def __len__(self):
+        """Number of keys in the map, in O(1)."""
+        return self._get_size(self._root)
+
+    def rank(self, key):
+        """Return the number of keys strictly less than key, in O(log n)."""
+        rank = 0
+        i = self._root
+        while i != NIL:
+            k = self._keys[i]
+            if key < k:
+                i = self._left[i]
+            elif key > k:
+                rank += self._get_size(self._left[i]) + 1
+                i = self._right[i]
+            else:
+                return rank + self._get_size(self._left[i])
+        return rank
+
+    def select(self, index):
+        """
+        Return the (key, value) pair with the given 0-based rank, in O(log n).
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("select index out of range")
+        i = self._root
+        while True:
+            left_size = self._get_size(self._left[i])
+            if index < left_size:
+                i = self._left[i]
+            elif index > left_size:
+                index -= left_size + 1
+                i = self._right[i]
+            else:
+                return (self._keys[i], self._values[i])
+
+    def items_by_rank(self, start, stop=None):
+        """Yield (key, value) pairs with ranks in [start, stop), in O(log n + k)."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return iter(())
+        stack = []
+        i = self._root
+        index = start
+        while i != NIL:
+            left_size = self._get_size(self._left[i])
+            if index < left_size:
+                stack.append(i)
+                i = self._left[i]
+            elif index > left_size:
+                index -= left_size + 1
+                i = self._right[i]
+            else:
+                stack.append(i)
+                break
+        return self._resume_inorder(stack, stop - start)
+
+    # ------------------------ ORDERED QUERIES ------------------------
+    def min(self):
+        """Return the (key, value) pair with the smallest key, or None if empty."""
+        i = self._root
+        if i == NIL:
+            return None
+        while self._left[i] != NIL:
+            i = self._left[i]
+        return (self._keys[i], self._values[i])
+
+    def max(self):
+        """Return the (key, value) pair with the largest key, or None if empty."""
+        i = self._root
+        if i == NIL:
+            return None
+        while self._right[i] != NIL:
+            i = self._right[i]
+        return (self._keys[i], self._values[i])
+
+    def floor(self, key):
+        """Return the pair with the largest key <= key, or None if there is none."""
+        best = NIL
+        i = self._root
+        while i != NIL:
+            k = self._keys[i]
+            if key < k:
+                i = self._left[i]
+            else:
+                best = i
+                if not k < key:
+                    break  # exact match
+                i = self._right[i]
+        return (self._keys[best], self._values[best]) if best != NIL else None
+
+    def ceiling(self, key):
+        """Return the pair with the smallest key >= key, or None if there is none."""
+        best = NIL
+        i = self._root
+        while i != NIL:
+            k = self._keys[i]
+            if k < key:
+                i = self._right[i]
+            else:
+                best = i
+                if not key < k:
+                    break  # exact match
+                i = self._left[i]
+        return (self._keys[best], self._values[best]) if best != NIL else None
+
+    def items_from(self, key):
+        """Lazily yield (key, value) pairs with keys >= key in sorted order."""
+        stack = []
+        i = self._root
+        while i != NIL:
+            if self._keys[i] < key:
+                i = self._right[i]
+            else:
+                stack.append(i)
+                i = self._left[i]
+        return self._resume_inorder(stack)
+
+    def range_items(self, lo, hi):
+        """Lazily yield (key, value) pairs with lo <= key <= hi, in O(log n + k)."""
+        for key, value in self.items_from(lo):
+            if hi < key:
+                return
+            yield (key, value)
+
+    # ------------------------ HEIGHT ------------------------
+    def height(self):
+        """Height of the tree (-1 for an empty tree), in O(1)."""
+        return self._get_height(self._root)
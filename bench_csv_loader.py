@@ -0,0 +1,84 @@
+"""
+bench_csv_loader.py
+Measures CSV parsing throughput (rows/sec) of the DictReader path versus the
+positional fast path of csv_loader.parse_schedule_csv on a synthetic file in
+the courses_2023.csv layout.
+
+Usage: python bench_csv_loader.py [rows] [filename]
+"""
+
+import csv
+import os
+import random
+import sys
+import time
+
+from csv_loader import parse_schedule_csv
+
+COURSES_2023_HEADER = ['Subject', 'Catalog', 'Section', 'Component', 'Session', 'MinUnits',
+                       'Units', 'TotEnrl', 'CapEnrl', 'Instructor', 'Capacity', 'Room',
+                       'Mtg Start', 'Mtg End', 'Days', 'Start Date', 'End Date', 'Term',
+                       'Campus', 'Class Nbr', 'Total Credits', 'DUP', 'FULL', 'OVER']
+
+SUBJECTS = ['AIR', 'ART', 'BIO', 'BUS', 'CHM', 'CSC', 'ENG', 'HIS', 'MTH', 'PHY', 'PSY', 'SPA']
+COMPONENTS = ['LEC', 'LAB', 'DED', 'SEM']
+LAST_NAMES = ['Scott', 'Mims', 'Cannon', 'Nguyen', 'Garcia', 'Patel', 'Kim', 'Brown', 'Lopez']
+FIRST_NAMES = ['Terrence D', 'Craig A', 'Tiffany Thomas', 'Ana', 'Raj', 'Min', 'Lee', 'Sam']
+DAYS = ['M', 'T', 'W', 'R', 'F', 'MW', 'TR', 'MWF']
+TIMES = [('8:00:00 AM', '9:15:00 AM'), ('9:00:00 AM', '10:40:00 AM'),
+         ('11:00:00 AM', '12:40:00 PM'), ('1:00:00 PM', '2:15:00 PM'),
+         ('5:00:00 PM', '6:50:00 PM'), ('', '')]
+
+
+def write_synthetic_csv(filename, rows, seed=0):
+    """
+    Write a courses_2023.csv-style file with unique, shuffled Class Nbr values.
+
+    Args:
+        filename (str): Path of the CSV file to create
+        rows (int): Number of data rows
+        seed (int, optional): Random seed, so runs are repeatable
+    """
+    rng = random.Random(seed)
+    crns = list(range(10000, 10000 + rows))
+    rng.shuffle(crns)
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(COURSES_2023_HEADER)
+        for crn in crns:
+            units = rng.choice('01234')
+            start, end = rng.choice(TIMES)
+            writer.writerow([
+                rng.choice(SUBJECTS), f" {rng.randint(100, 499)}", f"{rng.randint(1, 60):02d}",
+                rng.choice(COMPONENTS), '1', units, units, rng.randint(0, 30), '30',
+                f"{rng.choice(LAST_NAMES)},{rng.choice(FIRST_NAMES)}", '30',
+                str(rng.randint(100, 450)), start, end, rng.choice(DAYS),
+                '1/9/2023', '5/6/2023', '2232', 'MAIN', crn, rng.randint(0, 90), '', '', ''])
+
+
+def time_parse(filename, fast):
+    """Return (rows parsed, seconds) for one parse of filename."""
+    start = time.perf_counter()
+    records = parse_schedule_csv(filename, fast=fast)
+    return len(records), time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    filename = sys.argv[2] if len(sys.argv) > 2 else f"synthetic_{rows}.csv"
+
+    if not os.path.exists(filename):
+        print(f"Writing {rows:,} synthetic rows to '{filename}'...")
+        write_synthetic_csv(filename, rows)
+
+    results = {}
+    for label, fast in (("DictReader path", False), ("Fast path", True)):
+        count, seconds = time_parse(filename, fast)
+        results[label] = count / seconds
+        print(f"{label:<16} {count:>10,} rows in {seconds:7.2f}s  = {count / seconds:>12,.0f} rows/sec")
+
+    print(f"Speedup: {results['Fast path'] / results['DictReader path']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+bench_item_memory.py
+Reports bytes per ScheduleItem before and after the compact representation:
+- before: a plain (dict-backed) dataclass with one string object per field
+- after:  the slotted ScheduleItem with repeated values pooled by the loader
+
+Usage: python bench_item_memory.py [csv filename]
+"""
+
+import sys
+from dataclasses import astuple, fields, make_dataclass
+
+from csv_loader import parse_schedule_csv
+from schedule_item import ScheduleItem
+
+# Same fields as ScheduleItem, but without __slots__ (the old layout)
+DictScheduleItem = make_dataclass("DictScheduleItem",
+                                  [(field.name, str) for field in fields(ScheduleItem)])
+
+
+def item_bytes(items):
+    """
+    Total bytes held by items: the objects, their __dict__ (if any) and
+    every distinct string they reference (shared strings count once).
+    """
+    total = 0
+    seen = set()
+    for item in items:
+        total += sys.getsizeof(item)
+        if hasattr(item, "__dict__"):
+            total += sys.getsizeof(item.__dict__)
+        for value in astuple(item):
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else None
+
+    plain = parse_schedule_csv(filename, fast=True, intern_strings=False)
+    before = [DictScheduleItem(*astuple(item)) for item in plain]
+    after = parse_schedule_csv(filename, fast=True)
+
+    n = len(after)
+    if n == 0:
+        print("No items loaded.")
+        return
+    before_bytes = item_bytes(before)
+    after_bytes = item_bytes(after)
+    print(f"Items: {n:,}")
+    print(f"Before (dict dataclass, unshared strings): {before_bytes / n:8.1f} bytes/item")
+    print(f"After  (slotted, pooled strings):          {after_bytes / n:8.1f} bytes/item")
+    print(f"Saved: {(1 - after_bytes / before_bytes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
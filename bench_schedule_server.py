@@ -0,0 +1,219 @@
+"""
+bench_schedule_server.py
+Load generator for schedule_server.py. Reports requests/sec and latency
+percentiles (p50, p90, p99, p99.9, max) for a mix of queries.
+
+By default it starts the server as a subprocess on a free port, loading
+--csv, and stops it afterwards. --port or --unix target a server that is
+already running; the query keys still come from --csv, which should be the
+file that server loaded.
+
+Each connection keeps --depth requests in flight (pipelined), and a
+request's latency runs from writing it to reading its response line. The
+request lines are built before the clock starts.
+
+Usage:
+    python bench_schedule_server.py --connections 8 --depth 16 --requests 50000
+    python bench_schedule_server.py --port 8765 --mix crn=80,code=10,instructor=10
+    python bench_schedule_server.py --engine btree --output server.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+
+from csv_loader import parse_schedule_csv
+from tree_engines import DEFAULT_ENGINE, available_engines
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedule_server.py")
+DEFAULT_MIX = "crn=60,many=10,code=15,instructor=10,stats=5"
+REQUEST_KINDS = ("crn", "many", "code", "instructor", "stats")
+
+
+def parse_mix(text):
+    """Parse 'crn=60,code=40' into ([kinds], [weights])."""
+    kinds, weights = [], []
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in REQUEST_KINDS:
+            raise ValueError(f"unknown request kind '{kind}' (expected one of {', '.join(REQUEST_KINDS)})")
+        kinds.append(kind)
+        weights.append(float(weight or 1))
+    return kinds, weights
+
+
+def make_requests(count, mix, records, many_size, rng):
+    """Build count encoded request lines drawn from the mix."""
+    kinds, weights = mix
+    crns = [item.crn for item in records]
+    codes = sorted({item.course_code for item in records})
+    # instructors are queried by last name, a partial match
+    names = sorted({item.instructor.split(",")[0].strip().lower() for item in records} - {""})
+    lines = []
+    for request_id, kind in enumerate(rng.choices(kinds, weights, k=count)):
+        if kind == "crn":
+            request = {"op": "find_by_crn", "crn": rng.choice(crns)}
+        elif kind == "many":
+            request = {"op": "find_many", "crns": rng.choices(crns, k=many_size)}
+        elif kind == "code":
+            request = {"op": "find_by_course_code", "code": rng.choice(codes)}
+        elif kind == "instructor":
+            request = {"op": "find_by_instructor", "name": rng.choice(names)}
+        else:
+            request = {"op": "stats"}
+        request["id"] = request_id
+        lines.append((json.dumps(request) + "\n").encode())
+    return lines
+
+
+async def run_connection(reader, writer, lines, depth, latencies):
+    """Send lines pipelined depth deep; return the number of error responses."""
+    clock = time.perf_counter_ns
+    window = asyncio.Semaphore(depth)
+    sent_at = deque()  # responses arrive in request order
+
+    async def send():
+        for line in lines:
+            await window.acquire()
+            sent_at.append(clock())
+            writer.write(line)
+            await writer.drain()
+
+    sender = asyncio.create_task(send())
+    errors = 0
+    for _ in range(len(lines)):
+        response = await reader.readline()
+        latencies.append(clock() - sent_at.popleft())
+        window.release()
+        if not response:
+            raise ConnectionError("server closed the connection")
+        if response.find(b'"ok":true', 0, 64) < 0:
+            errors += 1
+    await sender
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+
+async def start_server(csv_filename, engine):
+    """Start schedule_server.py on a free port; return (process, host, port)."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, SERVER_SCRIPT, "--csv", csv_filename, "--engine", engine,
+        "--port", "0", stdout=asyncio.subprocess.PIPE)
+    banner = (await process.stdout.readline()).decode().strip()
+    if not banner.startswith("Serving"):
+        await process.wait()
+        raise RuntimeError(f"server failed to start (exit code {process.returncode})")
+    host, _, port = banner.rsplit(" ", 1)[1].rpartition(":")
+    return process, host, int(port)
+
+
+def percentile(samples, fraction):
+    """Value at the given fraction of sorted samples (nearest rank)."""
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+async def run(args):
+    records = parse_schedule_csv(args.csv, fast=True)
+    if not records:
+        raise ValueError(f"no records in '{args.csv}'")
+    rng = random.Random(args.seed)
+    lines = make_requests(args.requests, parse_mix(args.mix), records, args.many_size, rng)
+
+    process = None
+    host, port = args.host, args.port
+    if args.unix is None and port is None:
+        process, host, port = await start_server(args.csv, args.engine)
+    try:
+        connections = []
+        for _ in range(args.connections):
+            if args.unix is not None:
+                connections.append(await asyncio.open_unix_connection(args.unix))
+            else:
+                connections.append(await asyncio.open_connection(host, port))
+
+        # requests are dealt round-robin to the connections
+        latencies = []
+        start = time.perf_counter()
+        errors = await asyncio.gather(*[
+            run_connection(reader, writer, lines[i::args.connections], args.depth, latencies)
+            for i, (reader, writer) in enumerate(connections)])
+        elapsed = time.perf_counter() - start
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "connections": args.connections,
+        "depth": args.depth,
+        "mix": args.mix,
+        "engine": args.engine if process is not None else None,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "errors": sum(errors),
+        "latency_us": {
+            "p50": round(percentile(latencies, 0.50) / 1000, 1),
+            "p90": round(percentile(latencies, 0.90) / 1000, 1),
+            "p99": round(percentile(latencies, 0.99) / 1000, 1),
+            "p99.9": round(percentile(latencies, 0.999) / 1000, 1),
+            "max": round(latencies[-1] / 1000, 1),
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test schedule_server.py.")
+    parser.add_argument("--csv", default="courses_2023.csv",
+                        help="CSV the queries are drawn from (and the spawned server loads)")
+    parser.add_argument("--engine", choices=available_engines(), default=DEFAULT_ENGINE,
+                        help="tree engine of the spawned server (default: %(default)s)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int,
+                        help="port of a running server (default: spawn one)")
+    parser.add_argument("--unix", metavar="PATH", help="Unix socket of a running server")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=16,
+                        help="requests in flight per connection (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=20_000,
+                        help="total requests (default: %(default)s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="weighted request kinds (default: %(default)s)")
+    parser.add_argument("--many-size", type=int, default=20,
+                        help="CRNs per find_many request (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+    if args.connections < 1 or args.depth < 1 or args.requests < 1:
+        parser.error("--connections, --depth and --requests must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        sys.exit(str(e))
+    result = asyncio.run(run(args))
+    latency = result["latency_us"]
+    print(f"{result['requests']:,} requests over {result['connections']} connection(s), "
+          f"depth {result['depth']}, in {result['elapsed_s']:.2f} s")
+    print(f"throughput: {result['requests_per_s']:,.0f} req/s   errors: {result['errors']}")
+    print("latency (µs): " + "  ".join(f"{name}={value:,.0f}" for name, value in latency.items()))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to '{args.output}'")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+bench_tree_engines.py
+Measured performance of every registered tree engine (see tree_engines.py)
+on synthetic catalogs of different sizes and CRN insertion orders:
+- sorted:    ascending CRNs (degenerates the plain BST into a list)
+- reverse:   descending CRNs
+- random:    shuffled CRNs
+- clustered: grouped by subject, ascending CRNs within each subject (like a
+             registrar export sorted by department)
+
+For each engine/size/order it times, per call: insert, search hits, search
+misses, height, inorder_items (whole traversal) and the Schedule queries
+find_by_crn, find_by_course_code, find_by_instructor, find_by_crn_range and
+get_items_page. It reports p50/p99/mean latencies in nanoseconds and the
+peak traced memory of building the map. Results are written as JSON;
+--baseline compares them with an earlier run and flags regressions.
+
+Usage:
+    python bench_tree_engines.py --sizes 10000,100000,1000000 --output results.json
+    python bench_tree_engines.py --engines avl,btree --orders random --sizes 10000000
+    python bench_tree_engines.py --baseline old.json --output new.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from bench_csv_loader import SUBJECTS, COMPONENTS, LAST_NAMES, FIRST_NAMES, DAYS
+from schedule import Schedule
+from schedule_item import ScheduleItem
+from tree_engines import available_engines, create_tree_map
+
+ORDERS = ("sorted", "reverse", "random", "clustered")
+CRN_BASE = 10_000_000  # 8-digit CRNs, so string order matches numeric order
+MAX_INSERT_SAMPLES = 200_000  # beyond this, every k-th insert is timed
+
+
+# ---------------------------------------------------------
+# ----------------------- CATALOGS ------------------------
+# ---------------------------------------------------------
+def make_catalog(size, seed=0):
+    """
+    Build size synthetic ScheduleItems with CRNs CRN_BASE + 2*i (so every
+    CRN_BASE + 2*i + 1 is a guaranteed miss). Repeated field values are
+    shared string objects, as the CSV loader's string pool would make them.
+    """
+    rng = random.Random(seed)
+    codes = [f"{subject} {number}" for subject in SUBJECTS for number in range(100, 500, 7)]
+    instructors = [f"{last},{first}" for last in LAST_NAMES for first in FIRST_NAMES]
+    titles = [f"{component} {code}" for component in COMPONENTS for code in codes[:40]]
+    credits = ["0", "1", "2", "3", "4"]
+    times = ["8:00 AM - 9:15 AM", "11:00 AM - 12:40 PM", "1:00 PM - 2:15 PM", "TBA"]
+    rooms = [str(room) for room in range(100, 450)]
+    return [ScheduleItem(str(CRN_BASE + 2 * i), rng.choice(codes), rng.choice(titles),
+                         rng.choice(instructors), rng.choice(credits), rng.choice(DAYS),
+                         rng.choice(times), rng.choice(rooms))
+            for i in range(size)]
+
+
+def order_catalog(items, order, seed=0):
+    """Return items (sorted by CRN) rearranged into the given insertion order."""
+    if order == "sorted":
+        return list(items)
+    if order == "reverse":
+        return items[::-1]
+    if order == "random":
+        shuffled = list(items)
+        random.Random(seed).shuffle(shuffled)
+        return shuffled
+    if order == "clustered":
+        # stable sort: CRNs stay ascending inside each subject
+        return sorted(items, key=lambda item: item.course_code.split()[0])
+    raise ValueError(f"Unknown order '{order}' (expected one of {', '.join(ORDERS)})")
+
+
+# ---------------------------------------------------------
+# ----------------------- TIMING --------------------------
+# ---------------------------------------------------------
+def summarize(samples):
+    """Return count and p50/p99/mean of nanosecond samples."""
+    if not samples:
+        return {"count": 0}
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        "count": n,
+        "p50_ns": samples[(n - 1) // 2],
+        "p99_ns": samples[min(n - 1, (99 * n) // 100)],
+        "mean_ns": round(sum(samples) / n, 1),
+    }
+
+
+def time_calls(func, args):
+    """Call func(arg) for every arg; return the per-call times in ns."""
+    clock = time.perf_counter_ns
+    samples = []
+    append = samples.append
+    for arg in args:
+        start = clock()
+        func(arg)
+        append(clock() - start)
+    return samples
+
+
+def time_inserts(tree_map, items):
+    """Insert every item, timing every k-th call (all of them for small catalogs)."""
+    clock = time.perf_counter_ns
+    insert = tree_map.insert
+    stride = max(1, len(items) // MAX_INSERT_SAMPLES)
+    samples = []
+    for i, item in enumerate(items):
+        if i % stride:
+            insert(item.crn, item)
+        else:
+            start = clock()
+            insert(item.crn, item)
+            samples.append(clock() - start)
+    return samples
+
+
+def peak_build_memory(engine, items):
+    """Peak bytes traced while inserting items into a fresh map (items excluded)."""
+    tracemalloc.start()
+    try:
+        tree_map = create_tree_map(engine)
+        for item in items:
+            tree_map.insert(item.crn, item)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# ---------------------------------------------------------
+# ----------------------- BENCHMARK -----------------------
+# ---------------------------------------------------------
+def bench_case(engine, catalog, order, queries, rng, measure_memory=True):
+    """Benchmark one engine on one ordering of a catalog; return a result dict."""
+    items = order_catalog(catalog, order, rng.random())
+    size = len(items)
+    tree_map = create_tree_map(engine)
+    ops = {"insert": summarize(time_inserts(tree_map, items))}
+
+    hits = [item.crn for item in rng.choices(catalog, k=queries)]
+    misses = [str(CRN_BASE + 2 * rng.randrange(size) + 1) for _ in range(queries)]
+    ops["search_hit"] = summarize(time_calls(tree_map.search, hits))
+    ops["search_miss"] = summarize(time_calls(tree_map.search, misses))
+    ops["height"] = summarize(time_calls(lambda _: tree_map.height(), range(100)))
+    ops["inorder_items"] = summarize(time_calls(lambda _: sum(1 for _ in tree_map.inorder_items()),
+                                                range(3)))
+
+    schedule = Schedule(tree_map)
+    sample = rng.choices(catalog, k=min(queries, 1000))
+    codes = [item.course_code for item in sample]
+    # partial, lower-case surnames, as typed into the menu
+    instructors = [item.instructor.split(",")[0][:4].lower() for item in sample]
+    ranges = [(item.crn, str(int(item.crn) + 200)) for item in sample]  # ~100 CRNs each
+    pages = [rng.randrange(max(1, size - 50)) for _ in sample]
+    ops["find_by_crn"] = summarize(time_calls(schedule.find_by_crn, hits))
+    ops["find_by_course_code"] = summarize(time_calls(schedule.find_by_course_code, codes))
+    ops["find_by_instructor"] = summarize(time_calls(schedule.find_by_instructor, instructors))
+    ops["find_by_crn_range"] = summarize(
+        time_calls(lambda bounds: schedule.find_by_crn_range(*bounds), ranges))
+    ops["get_items_page"] = summarize(
+        time_calls(lambda start: schedule.get_items_page(start, start + 50), pages))
+
+    result = {"engine": engine, "size": size, "order": order,
+              "height": tree_map.height(), "ops": ops}
+    if measure_memory:
+        del schedule, tree_map
+        result["peak_memory_bytes"] = peak_build_memory(engine, items)
+    return result
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Print p50 ratios against a baseline run's results and return the
+    number of operations that got slower than tolerance allows.
+    """
+    previous = {(r["engine"], r["size"], r["order"]): r for r in baseline["results"]}
+    regressions = 0
+    for result in results:
+        old = previous.get((result["engine"], result["size"], result["order"]))
+        if old is None or "ops" not in old or "ops" not in result:
+            continue
+        for op, stats in result["ops"].items():
+            old_stats = old["ops"].get(op, {})
+            if not stats.get("p50_ns") or not old_stats.get("p50_ns"):
+                continue
+            ratio = stats["p50_ns"] / old_stats["p50_ns"]
+            if ratio > 1 + tolerance:
+                regressions += 1
+                print(f"  REGRESSION {result['engine']:<12} n={result['size']:<9,} "
+                      f"{result['order']:<9} {op:<20} p50 {old_stats['p50_ns']:>9,} -> "
+                      f"{stats['p50_ns']:>9,} ns ({ratio:.2f}x)")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the registered tree engines.")
+    parser.add_argument("--sizes", default="10000,100000",
+                        help="comma-separated catalog sizes, e.g. 10000,1000000,10000000")
+    parser.add_argument("--orders", default=",".join(ORDERS),
+                        help="comma-separated insertion orders (%(default)s)")
+    parser.add_argument("--engines", default=",".join(available_engines()),
+                        help="comma-separated engine names (default: all registered)")
+    parser.add_argument("--queries", type=int, default=10_000,
+                        help="lookups timed per search operation (%(default)s)")
+    parser.add_argument("--bst-limit", type=int, default=20_000,
+                        help="largest catalog given to the plain BST in a non-random "
+                             "order, where it degenerates to O(n) per insert (%(default)s)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the separate build that measures peak memory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_tree_engines.json",
+                        help="JSON results file (%(default)s)")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed p50 slowdown vs the baseline (%(default)s = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    orders = args.orders.split(",")
+    engines = args.engines.split(",")
+    for engine in engines:
+        create_tree_map(engine)  # fail fast on unknown names
+    for order in orders:
+        if order not in ORDERS:
+            sys.exit(f"Unknown order '{order}' (expected one of {', '.join(ORDERS)})")
+
+    rng = random.Random(args.seed)
+    results = []
+    for size in sizes:
+        catalog = make_catalog(size, args.seed)
+        for order in orders:
+            for engine in engines:
+                if engine == "bst" and order != "random" and size > args.bst_limit:
+                    results.append({"engine": engine, "size": size, "order": order,
+                                    "skipped": f"size above --bst-limit {args.bst_limit}"})
+                    continue
+                result = bench_case(engine, catalog, order, args.queries, rng,
+                                    not args.no_memory)
+                results.append(result)
+                ops = result["ops"]
+                memory = result.get("peak_memory_bytes")
+                print(f"{engine:<12} n={size:<10,} {order:<9} height={result['height']:<5} "
+                      f"insert p50={ops['insert']['p50_ns']:>6,}ns  "
+                      f"search p50={ops['search_hit']['p50_ns']:>6,}ns "
+                      f"p99={ops['search_hit']['p99_ns']:>7,}ns"
+                      + (f"  peak={memory / size:6.1f} B/item" if memory else ""))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": args.seed,
+            "queries": args.queries,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nComparing with '{args.baseline}' (tolerance {args.tolerance:.0%}):")
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        print(f"{regressions} regression(s) found")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
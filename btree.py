@@ -0,0 +1,484 @@
+"""
+btree.py
+BTreeMap: an in-memory B-tree map.
+
+Nodes hold up to 2t-1 sorted keys (t = min_degree), so a tree of a million
+CRNs is only 3-4 levels deep and each level is searched with bisect over a
+plain list. That trades pointer chasing for contiguous, cache-friendly key
+arrays. Every node also stores its subtree size, giving rank(), select()
+and paging in O(t log n) like the size-augmented binary trees.
+"""
+
+from bisect import bisect_left, bisect_right
+from SearchTrees import _SEARCH_MANY_GROUP, _dedupe_sorted, _merge_sorted, _split_sorted
+
+
+class _BTreeNode:
+    """Node of a B-Tree. children is None for leaves."""
+    __slots__ = "keys", "values", "children", "size"
+
+    def __init__(self, keys, values, children=None):
+        self.keys = keys
+        self.values = values
+        self.children = children
+        self.size = len(keys)  # number of keys in this subtree
+        if children is not None:
+            for child in children:
+                self.size += child.size
+
+
+class BTreeMap:
+    """B-Tree Map with minimum degree min_degree (t >= 2)."""
+
+    def __init__(self, min_degree=32):
+        if min_degree < 2:
+            raise ValueError("min_degree must be at least 2")
+        self._t = min_degree
+        self._root = None
+
+    @classmethod
+    def from_sorted_items(cls, items):
+        """Build a map from (key, value) pairs sorted by key, in O(n)."""
+        tree = cls()
+        tree.bulk_load(items)
+        return tree
+
+    def __len__(self):
+        return self._root.size if self._root is not None else 0
+
+    # ------------------------ INSERT ------------------------
+    def insert(self, key, value):
+        """Insert or update a key-value pair, splitting full nodes on the way back up."""
+        if self._root is None:
+            self._root = _BTreeNode([key], [value])
+            return
+        path = []  # (node, child index) for every internal node passed
+        node = self._root
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and not key < node.keys[i]:
+                node.values[i] = value  # update existing
+                return
+            if node.children is None:
+                break
+            path.append((node, i))
+            node = node.children[i]
+
+        node.keys.insert(i, key)
+        node.values.insert(i, value)
+        node.size += 1
+        for ancestor, _ in path:
+            ancestor.size += 1
+
+        max_keys = 2 * self._t - 1
+        while len(node.keys) > max_keys:
+            right = self._split(node)
+            median_key = node.keys.pop()
+            median_value = node.values.pop()
+            if path:
+                parent, i = path.pop()
+                parent.keys.insert(i, median_key)
+                parent.values.insert(i, median_value)
+                parent.children.insert(i + 1, right)
+                node = parent
+            else:
+                self._root = _BTreeNode([median_key], [median_value], [node, right])
+                break
+
+    def _split(self, node):
+        """Move the keys after the median into a new right sibling (median stays last)."""
+        t = self._t
+        children = None
+        if node.children is not None:
+            children = node.children[t + 1:]
+            del node.children[t + 1:]
+        right = _BTreeNode(node.keys[t + 1:], node.values[t + 1:], children)
+        del node.keys[t + 1:]
+        del node.values[t + 1:]
+        node.size -= right.size
+        node.size -= 1  # the median, which is about to move up
+        return right
+
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        path = []  # (node, child index) for every internal node passed
+        node = self._root
+        while node is not None:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and not key < node.keys[i]:
+                break
+            if node.children is None:
+                return None
+            path.append((node, i))
+            node = node.children[i]
+        else:
+            return None
+
+        value = node.values[i]
+        if node.children is None:
+            del node.keys[i]
+            del node.values[i]
+        else:
+            # replace the entry with its in-order predecessor from a leaf
+            target = node
+            path.append((node, i))
+            node = node.children[i]
+            while node.children is not None:
+                path.append((node, len(node.children) - 1))
+                node = node.children[-1]
+            target.keys[i] = node.keys.pop()
+            target.values[i] = node.values.pop()
+        node.size -= 1
+        for ancestor, _ in path:
+            ancestor.size -= 1
+
+        self._fix_underflow(node, path)
+        return value
+
+    def _fix_underflow(self, node, path):
+        """Borrow from or merge with a sibling until no node on path is short of keys."""
+        min_keys = self._t - 1
+        while path and len(node.keys) < min_keys:
+            parent, i = path.pop()
+            siblings = parent.children
+            if i > 0 and len(siblings[i - 1].keys) > min_keys:
+                # borrow through the parent from the left sibling
+                left = siblings[i - 1]
+                node.keys.insert(0, parent.keys[i - 1])
+                node.values.insert(0, parent.values[i - 1])
+                parent.keys[i - 1] = left.keys.pop()
+                parent.values[i - 1] = left.values.pop()
+                moved = 1
+                if left.children is not None:
+                    child = left.children.pop()
+                    node.children.insert(0, child)
+                    moved += child.size
+                left.size -= moved
+                node.size += moved
+                return
+            if i + 1 < len(siblings) and len(siblings[i + 1].keys) > min_keys:
+                # borrow through the parent from the right sibling
+                right = siblings[i + 1]
+                node.keys.append(parent.keys[i])
+                node.values.append(parent.values[i])
+                parent.keys[i] = right.keys.pop(0)
+                parent.values[i] = right.values.pop(0)
+                moved = 1
+                if right.children is not None:
+                    child = right.children.pop(0)
+                    node.children.append(child)
+                    moved += child.size
+                right.size -= moved
+                node.size += moved
+                return
+            # merge with a sibling around the separating key
+            if i > 0:
+                i -= 1
+            left, right = siblings[i], siblings[i + 1]
+            left.keys.append(parent.keys.pop(i))
+            left.values.append(parent.values.pop(i))
+            left.keys += right.keys
+            left.values += right.values
+            if left.children is not None:
+                left.children += right.children
+            left.size += 1 + right.size
+            del siblings[i + 1]
+            node = parent
+
+        root = self._root
+        if not root.keys:
+            self._root = root.children[0] if root.children is not None else None
+
+    def delete_many(self, keys):
+        """
+        Delete every key in keys that is present.
+
+        Large batches (more than 1/8 of the tree) are applied with one
+        in-order pass and a linear rebuild instead of one delete per key.
+
+        Returns:
+            list: The removed (key, value) pairs in key order
+        """
+        keys = sorted(set(keys))
+        removed = []
+        if len(keys) * 8 <= len(self):
+            for key in keys:
+                value = self.delete(key)
+                if value is not None:
+                    removed.append((key, value))
+            return removed
+
+        kept_keys, kept_values, removed = _split_sorted(self.inorder_items(), keys)
+        self._root = self._build(kept_keys, kept_values)
+        return removed
+
+    # ------------------------ BULK LOAD ------------------------
+    def bulk_load(self, items):
+        """
+        Load (key, value) pairs sorted by key in O(n + m), merging them with
+        the current contents (new values win on duplicate keys).
+
+        Raises:
+            ValueError: If items are not sorted by key
+        """
+        keys, values = _merge_sorted(self.inorder_items(), _dedupe_sorted(items))
+        self._root = self._build(keys, values)
+
+    def _build(self, keys, values):
+        """Build a tree from sorted keys/values, splitting them evenly per level."""
+        if not keys:
+            return None
+        # lowest height whose capacity, (2t)^(h+1) - 1 keys, fits everything
+        fanout = 2 * self._t
+        height = 0
+        capacity = fanout - 1
+        while capacity < len(keys):
+            height += 1
+            capacity = capacity * fanout + fanout - 1
+        return self._build_subtree(keys, values, 0, len(keys), height)
+
+    def _build_subtree(self, keys, values, lo, hi, height):
+        if height == 0:
+            return _BTreeNode(keys[lo:hi], values[lo:hi])
+        fanout = 2 * self._t
+        child_capacity = fanout ** height - 1
+        n = hi - lo
+        # fewest children that can hold n - (children - 1) keys, but at least 2
+        count = max(2, -(-(n + 1) // (child_capacity + 1)))
+        base, extra = divmod(n - count + 1, count)
+        node_keys = []
+        node_values = []
+        children = []
+        start = lo
+        for c in range(count):
+            end = start + base + (c < extra)
+            children.append(self._build_subtree(keys, values, start, end, height - 1))
+            if end < hi:
+                node_keys.append(keys[end])
+                node_values.append(values[end])
+            start = end + 1
+        return _BTreeNode(node_keys, node_values, children)
+
+    # ------------------------ SEARCH ------------------------
+    def search(self, key):
+        """Return the value for key, or None."""
+        node = self._root
+        while node is not None:
+            keys = node.keys
+            i = bisect_left(keys, key)
+            if i < len(keys) and not key < keys[i]:
+                return node.values[i]
+            if node.children is None:
+                return None
+            node = node.children[i]
+        return None
+
+    get = search  # see _TreeMapBase.get
+
+    def search_many(self, keys):
+        """
+        Look up many keys at once. The sorted probes are routed down the tree
+        together: each node hands every child the run of probes that falls
+        between two of its keys, and small runs (see
+        SearchTrees._SEARCH_MANY_GROUP) finish with plain search loops.
+
+        Returns:
+            list: The value for each key in input order, None for misses
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        if self._root is None or not keys:
+            return results
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        probes = [keys[i] for i in order]
+        stack = [(self._root, 0, len(probes))]  # (subtree, probe range)
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi - lo <= _SEARCH_MANY_GROUP:
+                for j in range(lo, hi):
+                    key = probes[j]
+                    n = node
+                    while n is not None:
+                        i = bisect_left(n.keys, key)
+                        if i < len(n.keys) and not key < n.keys[i]:
+                            results[order[j]] = n.values[i]
+                            break
+                        n = n.children[i] if n.children is not None else None
+                continue
+            node_keys = node.keys
+            p = lo
+            while p < hi:
+                i = bisect_left(node_keys, probes[p])
+                if i < len(node_keys) and not probes[p] < node_keys[i]:
+                    q = bisect_right(probes, node_keys[i], p, hi)
+                    for j in range(p, q):
+                        results[order[j]] = node.values[i]
+                else:
+                    # probes below node_keys[i] all belong to children[i]
+                    q = bisect_left(probes, node_keys[i], p, hi) if i < len(node_keys) else hi
+                    if node.children is not None:
+                        stack.append((node.children[i], p, q))
+                p = q
+        return results
+
+    # ------------------------ RANK / SELECT ------------------------
+    def rank(self, key):
+        """Return the number of keys strictly less than key."""
+        count = 0
+        node = self._root
+        while node is not None:
+            i = bisect_left(node.keys, key)
+            count += i
+            if node.children is None:
+                break
+            for child in node.children[:i]:
+                count += child.size
+            node = node.children[i]
+        return count
+
+    def _seek_rank(self, index):
+        """Return a traversal stack positioned at the entry with rank index."""
+        stack = []
+        node = self._root
+        while node.children is not None:
+            for i, child in enumerate(node.children):
+                if index < child.size:
+                    stack.append([node, i])
+                    node = child
+                    break
+                index -= child.size
+                if index == 0:
+                    stack.append([node, i])
+                    return stack
+                index -= 1
+        stack.append([node, index])
+        return stack
+
+    def select(self, index):
+        """
+        Return the (key, value) pair with the given 0-based rank.
+
+        Negative indexes count from the end, as with lists.
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("select index out of range")
+        node, i = self._seek_rank(index)[-1]
+        return (node.keys[i], node.values[i])
+
+    def items_by_rank(self, start, stop=None):
+        """Yield (key, value) pairs with ranks in [start, stop)."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return
+        yield from self._resume_inorder(self._seek_rank(start), stop - start)
+
+    # ------------------------ TRAVERSAL ------------------------
+    # Traversal stacks hold [node, i] entries: the next entry to yield from
+    # node is keys[i], once everything in children[i] has been yielded.
+    def _push_leftmost(self, stack, node):
+        while node is not None:
+            stack.append([node, 0])
+            node = node.children[0] if node.children is not None else None
+
+    def _resume_inorder(self, stack, limit=None):
+        """Yield (key, value) pairs from a traversal stack, at most limit of them."""
+        while stack:
+            entry = stack[-1]
+            node, i = entry
+            if i >= len(node.keys):
+                stack.pop()
+                continue
+            if limit is not None:
+                if limit == 0:
+                    return
+                limit -= 1
+            yield (node.keys[i], node.values[i])
+            entry[1] = i + 1
+            if node.children is not None:
+                self._push_leftmost(stack, node.children[i + 1])
+
+    def inorder_items(self):
+        """Yield (key, value) pairs in key order."""
+        stack = []
+        self._push_leftmost(stack, self._root)
+        return self._resume_inorder(stack)
+
+    def min(self):
+        """Return the (key, value) pair with the smallest key, or None."""
+        node = self._root
+        if node is None:
+            return None
+        while node.children is not None:
+            node = node.children[0]
+        return (node.keys[0], node.values[0])
+
+    def max(self):
+        """Return the (key, value) pair with the largest key, or None."""
+        node = self._root
+        if node is None:
+            return None
+        while node.children is not None:
+            node = node.children[-1]
+        return (node.keys[-1], node.values[-1])
+
+    def floor(self, key):
+        """Return the (key, value) pair with the largest key <= key, or None."""
+        best = None
+        node = self._root
+        while node is not None:
+            i = bisect_right(node.keys, key)
+            if i > 0:
+                best = (node.keys[i - 1], node.values[i - 1])
+                if not best[0] < key:
+                    return best
+            node = node.children[i] if node.children is not None else None
+        return best
+
+    def ceiling(self, key):
+        """Return the (key, value) pair with the smallest key >= key, or None."""
+        best = None
+        node = self._root
+        while node is not None:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys):
+                best = (node.keys[i], node.values[i])
+                if not key < best[0]:
+                    return best
+            node = node.children[i] if node.children is not None else None
+        return best
+
+    def items_from(self, key):
+        """Yield (key, value) pairs with keys >= key, in key order."""
+        stack = []
+        node = self._root
+        while node is not None:
+            i = bisect_left(node.keys, key)
+            stack.append([node, i])
+            if i < len(node.keys) and not key < node.keys[i]:
+                break
+            node = node.children[i] if node.children is not None else None
+        return self._resume_inorder(stack)
+
+    def range_items(self, lo, hi):
+        """Yield (key, value) pairs with lo <= key <= hi, in key order."""
+        for key, value in self.items_from(lo):
+            if hi < key:
+                return
+            yield key, value
+
+    # ------------------------ HEIGHT ------------------------
+    def height(self):
+        """Levels below the root (-1 if empty); all leaves are at the same depth."""
+        h = -1
+        node = self._root
+        while node is not None:
+            h += 1
+            node = node.children[0] if node.children is not None else None
+        return h
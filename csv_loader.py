@@ -1,18 +1,92 @@
 import csv
+import glob
+import heapq
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import itemgetter
 from schedule_item import ScheduleItem
+from key_codecs import StrKeyCodec
 
+# Warnings from the fast parser are summarized; at most this many row numbers are listed
+MAX_WARNING_ROWS = 10
 
-def load_schedule_from_csv(filename=None, schedule=None):
+# How parse_schedule_files() resolves a CRN found in more than one file
+DUPLICATE_POLICIES = ('last', 'first', 'error')
+
+# Target size of one chunk in parse_schedule_csv_chunked()
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+class StringPool(dict):
+    """
+    Shared pool of field strings; pool[value] returns the pooled copy.
+    
+    Instructor, room, days, credits and similar values repeat across many
+    rows, so pooling them lets every item point at one string object.
+    Pass the same pool to several parse_schedule_csv() calls to share
+    strings across files.
+    """
+    
+    def __missing__(self, value):
+        self[value] = value
+        return value
+
+
+def load_schedule_from_csv(filename=None, schedule=None, bulk=False, fast=False, pool=None,
+                           parallel=False):
     """
     Load course schedule data from a CSV file into a Schedule object.
     
+    This is parse_schedule_csv() followed by ingest_records(); call those
+    directly to fill several schedules from a single parse.
+    
     Args:
         filename (str, optional): Path to the CSV file. Defaults to 'courses_2023.csv'
         schedule (Schedule): Schedule object to populate
+        bulk (bool, optional): Sort the parsed rows by CRN once and build a
+            balanced tree in linear time instead of inserting row by row.
+            Note that this also balances a BSTMap, so its height no longer
+            reflects the file's insertion order.
+        fast (bool, optional): Use the positional fast parser (see
+            parse_schedule_csv)
+        pool (StringPool, optional): Shared string pool (see parse_schedule_csv)
+        parallel (bool, optional): Parse byte-range chunks of the file in
+            worker processes and bulk-build the tree (see
+            parse_schedule_csv_chunked); bulk, fast and pool are ignored
         
     Returns:
         int: Number of courses loaded
         
+    Raises:
+        FileNotFoundError: If the CSV file doesn't exist
+        ValueError: If CSV has invalid data or missing required columns
+    """
+    if parallel:
+        return load_schedule_csv_chunked(filename, schedule)
+    records = parse_schedule_csv(filename, fast=fast, pool=pool)
+    return ingest_records(records, schedule, bulk=bulk)
+
+
+def parse_schedule_csv(filename=None, fast=False, pool=None, intern_strings=True):
+    """
+    Parse a course schedule CSV file into ScheduleItem records.
+    
+    Args:
+        filename (str, optional): Path to the CSV file. Defaults to 'courses_2023.csv'
+        fast (bool, optional): Resolve column positions once from the header
+            and read rows with csv.reader instead of csv.DictReader. Produces
+            the same records, but skipped rows are reported in one summary
+            warning per problem instead of one line per row.
+        pool (StringPool, optional): Pool used to share repeated field
+            values (everything but the CRN); a new pool is used if omitted
+        intern_strings (bool, optional): Set to False to keep a separate
+            string object per field, as csv produces them
+        
+    Returns:
+        tuple: Immutable batch of ScheduleItem objects in file order
+        
     Raises:
         FileNotFoundError: If the CSV file doesn't exist
         ValueError: If CSV has invalid data or missing required columns
@@ -21,7 +95,15 @@ def load_schedule_from_csv(filename=None, schedule=None):
     if filename is None or filename.strip() == '':
         filename = 'courses_2023.csv'
     
-    count = 0
+    if not intern_strings:
+        intern = str  # str(s) returns s itself: no sharing
+    else:
+        intern = (pool if pool is not None else StringPool()).__getitem__
+    
+    if fast:
+        return _parse_schedule_csv_fast(filename, intern)
+    
+    records = []
     
     try:
         with open(filename, 'r', encoding='utf-8') as csvfile:
@@ -81,30 +163,495 @@ def load_schedule_from_csv(filename=None, schedule=None):
                     # Create ScheduleItem from row data
                     item = ScheduleItem(
                         crn=crn,
-                        course_code=course_code,
-                        course_title=course_title,
-                        instructor=instructor,
-                        credits=credits,
-                        days=days,
-                        time=time,
-                        location=location
+                        course_code=intern(course_code),
+                        course_title=intern(course_title),
+                        instructor=intern(instructor),
+                        credits=intern(credits),
+                        days=intern(days),
+                        time=intern(time),
+                        location=intern(location)
                     )
                     
-                    # Add to schedule
-                    schedule.add_course(item)
-                    count += 1
+                    records.append(item)
                     
                 except KeyError as e:
                     print(f"Warning: Row {row_num} missing field {e}, skipping...")
                 except Exception as e:
                     print(f"Warning: Error processing row {row_num}: {e}, skipping...")
             
-            return count
+            return tuple(records)
+            
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file '{filename}' not found")
+    except Exception as e:
+        raise Exception(f"Error reading CSV file: {e}")
+
+
+def _parse_schedule_csv_fast(filename, intern):
+    """
+    Fast path of parse_schedule_csv(): positional columns, no per-row dicts.
+    
+    Args:
+        filename (str): Path to the CSV file
+        intern (callable): Maps a field value to its shared copy
+        
+    Returns:
+        tuple: Immutable batch of ScheduleItem objects in file order
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as csvfile:
+            reader = csv.reader(csvfile)
+            header = [field.strip() for field in next(reader, [])]
+            records, missing_crn_rows, malformed_rows, _ = _read_fast_rows(
+                reader, header, intern)
             
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV file '{filename}' not found")
     except Exception as e:
         raise Exception(f"Error reading CSV file: {e}")
+    
+    _warn_rows(missing_crn_rows, "missing CRN/Class Nbr")
+    _warn_rows(malformed_rows, "with more fields than the header")
+    return tuple(records)
+
+
+def _read_fast_rows(reader, header, intern, row_num=1):
+    """
+    Row loop of the fast parser, shared with the chunked parser.
+    
+    Args:
+        reader: csv.reader positioned after the header
+        header (list): Stripped column names
+        intern (callable): Maps a field value to its shared copy
+        row_num (int, optional): Number of the row before the first one
+            read (1 = the header); blank lines are not counted
+        
+    Returns:
+        tuple: (records, rows missing a CRN, rows with too many fields,
+        number of the last row read)
+        
+    Raises:
+        ValueError: If the header matches neither CSV layout
+    """
+    records = []
+    missing_crn_rows = []
+    malformed_rows = []
+    width = len(header)
+    
+    # Column name -> position (a repeated name keeps the last, like DictReader)
+    positions = {name: i for i, name in enumerate(header)}
+    has_simple_format = 'crn' in positions or 'CRN' in positions
+    has_2023_format = 'Class Nbr' in positions
+    
+    if not has_simple_format and not has_2023_format:
+        raise ValueError(f"CSV format not recognized. Found columns: {header}")
+    
+    # Columns missing from the header read as a constant default, which
+    # is appended to every row after the real columns
+    defaults = []
+    
+    def column(*names, default=''):
+        for name in names:
+            if name in positions:
+                return positions[name]
+        defaults.append(default)
+        return width + len(defaults) - 1
+    
+    if has_2023_format:
+        fields = itemgetter(
+            column('Class Nbr'), column('Subject'), column('Catalog'),
+            column('Component'), column('Instructor', default='TBA'),
+            column('Units', 'Total Credits', default='0'), column('Days'),
+            column('Mtg Start'), column('Mtg End'), column('Room', default='TBA'))
+    else:
+        fields = itemgetter(
+            column('crn', 'CRN'), column('course_code', 'Course Code'),
+            column('course_title', 'Course Title'), column('instructor', 'Instructor'),
+            column('credits', 'Credits'), column('days', 'Days'),
+            column('time', 'Time'), column('location', 'Location'))
+    padding = [''] * width
+    
+    for row in reader:
+        if not row:
+            continue
+        row_num += 1
+        if len(row) != width:
+            if len(row) > width:
+                malformed_rows.append(row_num)
+                continue
+            row += padding[len(row):]
+        row += defaults
+        
+        if has_2023_format:
+            (crn, subject, catalog, component, instructor,
+             credits, days, start_time, end_time, location) = fields(row)
+            subject = subject.strip()
+            catalog = catalog.strip()
+            start_time = start_time.strip()
+            end_time = end_time.strip()
+            item = ScheduleItem(
+                crn.strip(), intern(f"{subject}{catalog}"),
+                intern(f"{subject} {catalog} - {component.strip()}"),
+                intern(instructor.strip()), intern(credits.strip()),
+                intern(days.strip()),
+                intern(f"{start_time}-{end_time}" if start_time and end_time else ''),
+                intern(location.strip()))
+        else:
+            crn, *rest = fields(row)
+            item = ScheduleItem(crn.strip(), *[intern(value.strip()) for value in rest])
+        
+        if not item.crn:
+            missing_crn_rows.append(row_num)
+            continue
+        records.append(item)
+    
+    return records, missing_crn_rows, malformed_rows, row_num
+
+
+def _warn_rows(row_nums, reason):
+    """Print one summary warning for a list of skipped row numbers."""
+    if not row_nums:
+        return
+    shown = ', '.join(str(n) for n in row_nums[:MAX_WARNING_ROWS])
+    more = f", ... ({len(row_nums) - MAX_WARNING_ROWS} more)" if len(row_nums) > MAX_WARNING_ROWS else ''
+    print(f"Warning: Skipped {len(row_nums)} row(s) {reason}: rows {shown}{more}")
+
+
+def ingest_records(records, *schedules, bulk=False):
+    """
+    Add a batch of parsed records to one or more Schedule objects.
+    
+    Every schedule receives the same ScheduleItem objects, so loading the
+    same file into several trees costs one parse and one copy of the data.
+    
+    Args:
+        records (tuple): ScheduleItem objects, e.g. from parse_schedule_csv()
+        *schedules (Schedule): Schedule objects to populate
+        bulk (bool, optional): Sort the records by tree key once (shared by
+            schedules with equal key codecs) and bulk-build each tree in
+            linear time
+        
+    Returns:
+        int: Number of records ingested into each schedule
+    """
+    if bulk:
+        # Stable sort keeps file order for repeated CRNs, so the
+        # last row still wins just like with add_course. Schedules with
+        # equal key codecs share one sort.
+        sorted_by_codec = {}
+        for schedule in schedules:
+            sorted_records = sorted_by_codec.get(schedule.key_codec)
+            if sorted_records is None:
+                sorted_records = sorted(records, key=schedule.item_key)
+                sorted_by_codec[schedule.key_codec] = sorted_records
+            schedule.add_items_sorted(sorted_records)
+    else:
+        for schedule in schedules:
+            for item in records:
+                schedule.add_course(item)
+    return len(records)
+
+
+def load_schedule_files(sources, schedule, duplicates='last', max_workers=None):
+    """
+    Load several CSV files (e.g. one per term and campus) into a Schedule.
+    
+    The files are parsed in parallel by parse_schedule_files() and the
+    merged, CRN-sorted records are bulk-built into the schedule's tree in
+    linear time (merged with anything it already holds).
+    
+    Args:
+        sources (str or list): A glob pattern such as 'terms/*.csv', or a
+            list of file paths
+        schedule (Schedule): Schedule object to populate
+        duplicates (str, optional): Policy for a CRN in several files (see
+            parse_schedule_files)
+        max_workers (int, optional): Worker processes; defaults to the CPU count
+        
+    Returns:
+        int: Number of courses loaded
+        
+    Raises:
+        FileNotFoundError: If a file is missing or a pattern matches nothing
+        ValueError: For an unknown policy, or a duplicate CRN with 'error'
+    """
+    records = parse_schedule_files(sources, schedule.key_codec, duplicates, max_workers)
+    schedule.add_items_sorted(records)
+    return len(records)
+
+
+def parse_schedule_files(sources, key_codec=None, duplicates='last', max_workers=None):
+    """
+    Parse several CSV files in a process pool and merge them by tree key.
+    
+    Each worker runs the fast parser on one file and returns a compact
+    batch: the encoded keys plus one plain tuple of fields per row, sorted
+    by key with repeated CRNs inside the file resolved last-row-wins (as
+    sequential loading does). Plain tuples pickle several times faster than
+    ScheduleItem objects, and repeated strings in a batch unpickle as one
+    shared object. The parent k-way merges the sorted batches in
+    O(n log k), applies the duplicate policy across files and pools the
+    field strings in one StringPool, so a value repeated across files is
+    still stored once.
+    
+    Args:
+        sources (str or list): A glob pattern, or a list of file paths
+        key_codec (optional): Codec whose key order the result follows;
+            StrKeyCodec() if omitted (pass schedule.key_codec)
+        duplicates (str, optional): For a CRN in more than one file,
+            'last' keeps the row from the file listed last (a glob lists
+            files in name order), 'first' keeps the earliest, 'error'
+            raises ValueError
+        max_workers (int, optional): Worker processes; defaults to the CPU
+            count. A single file or max_workers=1 is parsed in-process.
+        
+    Returns:
+        tuple: ScheduleItem objects sorted by tree key, one per CRN
+        
+    Raises:
+        FileNotFoundError: If a file is missing or a pattern matches nothing
+        ValueError: For an unknown policy, or a duplicate CRN with 'error'
+    """
+    if duplicates not in DUPLICATE_POLICIES:
+        raise ValueError(f"duplicates must be one of {DUPLICATE_POLICIES}, got {duplicates!r}")
+    if key_codec is None:
+        key_codec = StrKeyCodec()
+    if isinstance(sources, str):
+        filenames = sorted(glob.glob(sources))
+        if not filenames:
+            raise FileNotFoundError(f"No CSV files match '{sources}'")
+    else:
+        filenames = list(sources)
+    
+    pool = StringPool()
+    workers = min(max_workers or os.cpu_count() or 1, len(filenames))
+    if workers <= 1:
+        batches = [_parse_file_batch(filename, key_codec, False, pool) for filename in filenames]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(_parse_file_batch, filenames, repeat(key_codec)))
+    
+    return _merge_batches(batches, duplicates, filenames, pool)
+
+
+def _merge_batches(batches, duplicates='last', sources=None, pool=None):
+    """
+    K-way merge sorted (keys, rows) batches into ScheduleItem objects.
+    
+    Args:
+        batches (list): (keys, rows) pairs, each sorted by key and unique;
+            rows are field tuples from a worker process, or ScheduleItem
+            objects when parsed in-process
+        duplicates (str, optional): 'last', 'first' or 'error' for a key in
+            several batches (see parse_schedule_files)
+        sources (list, optional): Name of each batch, for the 'error' message
+        pool (StringPool, optional): Pool for the fields of tuple rows (all
+            but the CRN); ScheduleItem rows are expected to be pooled already
+        
+    Returns:
+        tuple: ScheduleItem objects sorted by key, one per key
+    """
+    # (key, batch index, row) in key order; equal keys come out by batch index
+    merged = heapq.merge(*[zip(keys, repeat(index), rows)
+                           for index, (keys, rows) in enumerate(batches)])
+    # each batch unpickles its own copy of a repeated string, so the rows
+    # from workers go through one pool to share values across batches
+    intern = (pool if pool is not None else StringPool()).__getitem__
+    records = []
+    last_key = last_index = None
+    for key, index, row in merged:
+        if records and key == last_key:
+            if duplicates == 'error':
+                raise ValueError(f"CRN {records[-1].crn} appears in both '{sources[last_index]}' "
+                                 f"and '{sources[index]}'")
+            if duplicates == 'first':
+                continue
+            records.pop()
+        if type(row) is not ScheduleItem:
+            crn, *fields = row
+            row = ScheduleItem(crn, *map(intern, fields))
+        records.append(row)
+        last_key, last_index = key, index
+    return tuple(records)
+
+
+def _sorted_batch(records, key_codec, as_rows=True):
+    """
+    Sort parsed records into a (keys, rows) batch, one row per key (a later
+    record replaces an earlier one with the same key). With as_rows=False
+    the ScheduleItem objects are kept, for batches that are not pickled.
+    """
+    by_key = {}
+    encode = key_codec.encode
+    for item in records:
+        by_key[encode(item.crn)] = item
+    keys = sorted(by_key)
+    if not as_rows:
+        return keys, [by_key[key] for key in keys]
+    rows = [(item.crn, item.course_code, item.course_title, item.instructor,
+             item.credits, item.days, item.time, item.location)
+            for item in map(by_key.__getitem__, keys)]
+    return keys, rows
+
+
+def _parse_file_batch(filename, key_codec, as_rows=True, pool=None):
+    """
+    Worker for parse_schedule_files(): parse one file into a sorted batch.
+    In-process callers pass their StringPool to share it across files.
+    
+    Returns:
+        tuple: (keys, rows) sorted by key, one entry per CRN, where each row
+        is a tuple of the eight ScheduleItem fields (see _sorted_batch)
+    """
+    intern = (pool if pool is not None else StringPool()).__getitem__
+    return _sorted_batch(_parse_schedule_csv_fast(filename, intern), key_codec, as_rows)
+
+
+def load_schedule_csv_chunked(filename, schedule, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                              max_workers=None):
+    """
+    Load one large CSV file into a Schedule, parsing chunks in parallel.
+    
+    See parse_schedule_csv_chunked(); the merged records are bulk-built
+    into the schedule's tree in linear time.
+    
+    Returns:
+        int: Number of courses loaded
+    """
+    records = parse_schedule_csv_chunked(filename, schedule.key_codec, chunk_bytes,
+                                         max_workers)
+    schedule.add_items_sorted(records)
+    return len(records)
+
+
+def parse_schedule_csv_chunked(filename=None, key_codec=None, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                               max_workers=None):
+    """
+    Parse one large CSV file in byte-range chunks on a process pool.
+    
+    The data rows are cut into ranges of about chunk_bytes that end on
+    record boundaries (see _chunk_boundaries), and each worker parses its
+    range with the fast parser and returns a sorted batch. The parent
+    k-way merges the batches, keeping the last row for a repeated CRN as
+    sequential loading does, and pools the field strings of all chunks in
+    one StringPool. Workers number rows from the start of their
+    chunk, and the parent offsets them by the rows in earlier chunks, so
+    the skipped-row warnings name the same rows as parse_schedule_csv().
+    
+    Args:
+        filename (str, optional): Path to the CSV file. Defaults to 'courses_2023.csv'
+        key_codec (optional): Codec whose key order the result follows;
+            StrKeyCodec() if omitted (pass schedule.key_codec)
+        chunk_bytes (int, optional): Target size of each chunk
+        max_workers (int, optional): Worker processes; defaults to the CPU
+            count. With one chunk or max_workers=1 the chunks are parsed
+            in-process.
+        
+    Returns:
+        tuple: ScheduleItem objects sorted by tree key, one per CRN
+        
+    Raises:
+        FileNotFoundError: If the CSV file doesn't exist
+        ValueError: If CSV has invalid data or missing required columns
+    """
+    if filename is None or filename.strip() == '':
+        filename = 'courses_2023.csv'
+    if key_codec is None:
+        key_codec = StrKeyCodec()
+    
+    try:
+        with open(filename, 'rb') as csvfile:
+            header_line = csvfile.readline()
+        header = [field.strip() for field in
+                  next(csv.reader([header_line.decode('utf-8')]), [])]
+        bounds = _chunk_boundaries(filename, len(header_line), chunk_bytes)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file '{filename}' not found")
+    
+    ranges = list(zip(bounds, bounds[1:]))
+    pool = StringPool()
+    workers = min(max_workers or os.cpu_count() or 1, len(ranges))
+    if workers <= 1:
+        results = [_parse_chunk_batch(filename, header, start, end, key_codec, False, pool)
+                   for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_chunk_batch, repeat(filename), repeat(header),
+                                        bounds[:-1], bounds[1:], repeat(key_codec)))
+    
+    missing_crn_rows = []
+    malformed_rows = []
+    row_num = 1  # the header
+    for keys, rows, missing, malformed, row_count in results:
+        missing_crn_rows.extend(row_num + n for n in missing)
+        malformed_rows.extend(row_num + n for n in malformed)
+        row_num += row_count
+    _warn_rows(missing_crn_rows, "missing CRN/Class Nbr")
+    _warn_rows(malformed_rows, "with more fields than the header")
+    return _merge_batches([(keys, rows) for keys, rows, *_ in results], pool=pool)
+
+
+def _chunk_boundaries(filename, start, chunk_bytes):
+    """
+    Split the bytes of filename from start to the end into ranges of about
+    chunk_bytes that each end just after a record.
+    
+    A newline ends a record only outside quotes, i.e. when the number of
+    quote characters before it is even (a doubled "" inside a quoted field
+    counts twice, so it does not change the parity). Commas inside quotes,
+    as in "Scott,Terrence D", never matter since ranges are only cut at
+    newlines. The quote count is a bytes.count() pass over the file, far
+    cheaper than parsing it.
+    
+    Returns:
+        list: Offsets [start, ..., file size]; consecutive pairs are ranges
+    """
+    bounds = [start]
+    with open(filename, 'rb') as csvfile:
+        size = os.fstat(csvfile.fileno()).st_size
+        quotes = 0  # quote characters in [start, pos)
+        pos = start
+        while size - bounds[-1] > chunk_bytes:
+            target = bounds[-1] + chunk_bytes
+            csvfile.seek(pos)
+            quotes += csvfile.read(target - pos).count(b'"')
+            pos = target
+            # move to the end of the first line that leaves no quote open
+            while True:
+                line = csvfile.readline()
+                pos += len(line)
+                quotes += line.count(b'"')
+                if not line.endswith(b'\n') or quotes % 2 == 0:
+                    break
+            if pos >= size:
+                break
+            bounds.append(pos)
+    bounds.append(size)
+    return bounds
+
+
+def _parse_chunk_batch(filename, header, start, end, key_codec, as_rows=True, pool=None):
+    """
+    Worker for parse_schedule_csv_chunked(): parse bytes [start, end).
+    In-process callers pass their StringPool to share it across chunks.
+    
+    Returns:
+        tuple: (keys, rows, missing-CRN rows, malformed rows, rows read),
+        with row numbers counted from the start of the chunk
+    """
+    try:
+        with open(filename, 'rb') as csvfile:
+            csvfile.seek(start)
+            data = csvfile.read(end - start)
+        # decode like open(filename, 'r', encoding='utf-8') does
+        reader = csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'))
+        intern = (pool if pool is not None else StringPool()).__getitem__
+        records, missing, malformed, row_count = _read_fast_rows(
+            reader, header, intern, row_num=0)
+    except Exception as e:
+        raise Exception(f"Error reading CSV file: {e}")
+    keys, rows = _sorted_batch(records, key_codec, as_rows)
+    return keys, rows, missing, malformed, row_count
 
 
 def create_sample_csv(filename='courses.csv'):
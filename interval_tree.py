@@ -0,0 +1,137 @@
+"""
+interval_tree.py
+IntervalTreeMap: an AVL tree of intervals augmented for overlap queries.
+
+Keys are (start, end, tag) tuples describing half-open [start, end)
+intervals; the tag (e.g. a CRN) keeps keys unique when two values share an
+interval. The tree is ordered by start, and every node also records the
+largest end in its subtree (max_end), kept current by the AVL _pull() that
+already maintains height and size. A subtree whose max_end is at or before
+a query's start cannot hold a match, so whole subtrees are skipped.
+"""
+
+import heapq
+from SearchTrees import AVLTreeMap, _AVLNode
+
+
+class _IntervalNode(_AVLNode):
+    """Node of an Interval Tree."""
+    __slots__ = ("max_end",)
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 0
+        self.size = 1
+        self.max_end = key[1]  # largest interval end in this subtree
+
+
+class IntervalTreeMap(AVLTreeMap):
+    """AVL Tree Map of (start, end, tag) keys with stabbing and overlap queries."""
+
+    _node_class = _IntervalNode
+
+    # ------------------- AUGMENTATION -------------------
+    def _pull(self, node):
+        """Recompute node's height, subtree size and max_end from its children."""
+        # inlined: this runs for every node of a bulk build and every rotation
+        left, right = node.left, node.right
+        height, size, max_end = -1, 1, node.key[1]
+        if left is not None:
+            height, size = left.height, size + left.size
+            if left.max_end > max_end:
+                max_end = left.max_end
+        if right is not None:
+            if right.height > height:
+                height = right.height
+            size += right.size
+            if right.max_end > max_end:
+                max_end = right.max_end
+        node.height = height + 1
+        node.size = size
+        node.max_end = max_end
+
+    @staticmethod
+    def _pull_max_end(node):
+        max_end = node.key[1]
+        if node.left is not None and node.left.max_end > max_end:
+            max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+    def _rebalance_path(self, path):
+        # AVLTreeMap stops once a subtree keeps its height, but the max_end
+        # of every ancestor can still change, so finish the path here
+        super()._rebalance_path(path)
+        for node in reversed(path):
+            self._pull_max_end(node)
+
+    # ------------------------ QUERIES ------------------------
+    def _overlap_items(self, lo, hi, include_hi):
+        """
+        Yield (key, value) pairs for intervals with end > lo and a start
+        before hi (or at hi when include_hi), in key order.
+        """
+        stack = []
+        node = self._root
+        while True:
+            # subtrees ending at or before lo hold no matches
+            while node is not None and node.max_end > lo:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            start = node.key[0]
+            if start > hi or (start == hi and not include_hi):
+                return  # every later interval starts even later
+            if node.key[1] > lo:
+                yield (node.key, node.value)
+            node = node.right
+
+    def stabbing(self, point):
+        """Yield (key, value) pairs for intervals containing point, by start."""
+        return self._overlap_items(point, point, True)
+
+    def overlapping(self, lo, hi):
+        """
+        Yield (key, value) pairs for intervals overlapping [lo, hi), by start.
+
+        Intervals that only touch the range (ending at lo or starting at hi)
+        do not overlap it.
+        """
+        return self._overlap_items(lo, hi, False)
+
+    def find_conflicts(self, group=None):
+        """
+        Yield every pair of overlapping intervals, by a sweep over the starts.
+
+        The in-order walk already visits intervals by start, and a min-heap
+        per group holds the intervals still open, keyed by end. Each start
+        first drops the intervals that have ended and then pairs with every
+        one left, so the sweep is O(n log n + k) for k reported pairs.
+
+        Args:
+            group (callable): Maps a value to the resource it books (e.g. a
+                room); only intervals of the same resource conflict, and
+                values mapped to None are skipped. By default every
+                interval is compared with every other.
+
+        Returns:
+            generator: ((key, value), (key, value)) pairs, the earlier start first
+        """
+        open_by_group = {}  # resource -> heap of (end, seq, key, value)
+        for seq, (key, value) in enumerate(self.inorder_items()):
+            resource = group(value) if group is not None else None
+            if resource is None and group is not None:
+                continue
+            heap = open_by_group.setdefault(resource, [])
+            start = key[0]
+            while heap and heap[0][0] <= start:
+                heapq.heappop(heap)
+            for _, _, other_key, other_value in heap:
+                yield (other_key, other_value), (key, value)
+            heapq.heappush(heap, (key[1], seq, key, value))
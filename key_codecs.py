@@ -0,0 +1,84 @@
+"""
+key_codecs.py
+Key codecs translate CRNs between the string form used in the CSV files and
+at the Schedule API, and the form stored as tree map keys.
+- StrKeyCodec: stores CRN strings as-is (lexicographic order; the default)
+- IntKeyCodec: stores CRNs as ints, so "9999" sorts before "10000" and
+  every tree comparison is a cheap int compare
+- CompositeKeyCodec: stores CRNs such as "2232-24301" as tuples of parts
+
+encode() raises ValueError for a CRN the codec cannot represent. Codecs
+compare equal when they produce the same keys, so sorted batches can be
+shared between schedules using equal codecs.
+"""
+
+
+class StrKeyCodec:
+    """Identity codec: CRN strings are stored and compared as strings."""
+    snapshot_id = 0
+
+    def __eq__(self, other):
+        return type(other) is type(self)
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def encode(self, crn):
+        return crn
+
+    def decode(self, key):
+        return key
+
+
+class IntKeyCodec:
+    """Stores CRNs as ints (leading zeros are not preserved in the key)."""
+    snapshot_id = 1
+
+    def __eq__(self, other):
+        return type(other) is type(self)
+
+    def __hash__(self):
+        return hash(type(self))
+
+    def encode(self, crn):
+        return int(crn)
+
+    def decode(self, key):
+        return str(key)
+
+
+class CompositeKeyCodec:
+    """
+    Stores CRNs made of separated parts as tuples, e.g. "2232-24301" with
+    CompositeKeyCodec('-', (int, int)) becomes (2232, 24301).
+    """
+    snapshot_id = 2
+
+    def __init__(self, separator="-", converters=(int, int)):
+        self.separator = separator
+        self.converters = tuple(converters)
+
+    def __eq__(self, other):
+        return (type(other) is type(self) and other.separator == self.separator
+                and other.converters == self.converters)
+
+    def __hash__(self):
+        return hash((self.separator, self.converters))
+
+    def encode(self, crn):
+        parts = str(crn).split(self.separator)
+        if len(parts) != len(self.converters):
+            raise ValueError(f"CRN {crn!r} does not have {len(self.converters)} "
+                             f"'{self.separator}'-separated parts")
+        return tuple(convert(part) for convert, part in zip(self.converters, parts))
+
+    def decode(self, key):
+        return self.separator.join(str(part) for part in key)
+
+
+def codec_for_snapshot_id(snapshot_id):
+    """Return a default-configured codec for the id stored in a snapshot header."""
+    for codec_class in (StrKeyCodec, IntKeyCodec, CompositeKeyCodec):
+        if codec_class.snapshot_id == snapshot_id:
+            return codec_class()
+    raise ValueError(f"Unknown key codec id {snapshot_id}")
@@ -0,0 +1,154 @@
+"""
+meeting_times.py
+Parse the schedule's free-text meeting times into minute intervals.
+
+The loader keeps days as letters ("MW", "TR", "MTWRF") and the meeting
+time as one string such as "9:00:00 AM-10:40:00 AM" or "13:00-14:30".
+meeting_intervals() turns the pair into half-open [start, end) intervals
+measured in minutes from Monday 00:00, one per meeting day, so meetings on
+different days never overlap and one interval tree can hold the week.
+"""
+
+import re
+from functools import lru_cache
+
+MINUTES_PER_DAY = 24 * 60
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# one-letter codes used by the schedule (R = Thursday, U = Sunday)
+_DAY_CODES = {"M": 0, "T": 1, "W": 2, "R": 3, "F": 4, "S": 5, "U": 6}
+# two-letter forms seen in other exports ("TuTh", "Sa"); only read in
+# mixed-case strings, since in "MTWRFSU" the "SU" is Saturday and Sunday
+_TWO_LETTER_DAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_MIXED_CASE_TOKEN = re.compile(r"[A-Z][a-z]?")
+_CLOCK = re.compile(r"\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([AP]\.?M\.?)?\s*$", re.IGNORECASE)
+
+
+def parse_days(days):
+    """
+    Return the weekday indexes (0 = Monday) named by a days string.
+
+    A string in one case ("MWF", "tr") has one letter per day; a mixed-case
+    one ("TuTh", "MWTh") may also use two-letter day names.
+
+    Args:
+        days (str): Day letters, e.g. "MWF", "TR" or "TuTh"
+
+    Raises:
+        ValueError: If days contains anything but day codes and spaces
+    """
+    text = days.replace(" ", "")
+    if text.isupper() or text.islower():
+        tokens = text.upper()
+    else:
+        tokens = []
+        pos = 0
+        while pos < len(text):
+            match = _MIXED_CASE_TOKEN.match(text, pos)
+            if match is None:
+                raise ValueError(f"unrecognized days: {days!r}")
+            tokens.append(match.group().upper())
+            pos = match.end()
+    result = []
+    for token in tokens:
+        day = _DAY_CODES.get(token) if len(token) == 1 else _TWO_LETTER_DAYS.get(token)
+        if day is None:
+            raise ValueError(f"unrecognized days: {days!r}")
+        if day not in result:
+            result.append(day)
+    return sorted(result)
+
+
+def parse_day(day):
+    """
+    Return the weekday index (0 = Monday) for one day given as a code
+    ("T", "R") or a name ("Tue", "thursday").
+
+    Raises:
+        ValueError: If day is not recognized
+    """
+    text = day.strip().lower()
+    for index, name in enumerate(DAY_NAMES):
+        if len(text) >= 3 and (name.lower().startswith(text) or text.startswith(name.lower())):
+            return index
+    if text.upper() in _TWO_LETTER_DAYS:
+        # a single day, so "SU" or "th" can only be a two-letter name
+        return _TWO_LETTER_DAYS[text.upper()]
+    days = parse_days(text)
+    if len(days) != 1:
+        raise ValueError(f"expected one day, got {day!r}")
+    return days[0]
+
+
+def parse_clock(text):
+    """
+    Return minutes after midnight for "9:00:00 AM", "9:00 pm" or "13:00".
+
+    Raises:
+        ValueError: If text is not a time of day
+    """
+    match = _CLOCK.match(text)
+    if match is None:
+        raise ValueError(f"unrecognized time: {text!r}")
+    hours, minutes = int(match.group(1)), int(match.group(2))
+    meridiem = match.group(4)
+    if meridiem is not None:
+        if not 1 <= hours <= 12:
+            raise ValueError(f"unrecognized time: {text!r}")
+        hours = hours % 12 + (12 if meridiem[0].upper() == "P" else 0)
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"unrecognized time: {text!r}")
+    return hours * 60 + minutes
+
+
+def parse_time_range(time):
+    """
+    Return (start, end) minutes after midnight for "9:00:00 AM-10:40:00 AM".
+
+    Raises:
+        ValueError: If time is not a range, or does not end after it starts
+    """
+    start_text, sep, end_text = time.partition("-")
+    if not sep:
+        raise ValueError(f"unrecognized time range: {time!r}")
+    start = parse_clock(start_text)
+    end = parse_clock(end_text)
+    if end <= start:
+        raise ValueError(f"time range ends before it starts: {time!r}")
+    return start, end
+
+
+@lru_cache(maxsize=1024)
+def meeting_intervals(days, time):
+    """
+    Return the week-minute intervals for a days/time pair.
+
+    Items without a usable meeting time (online or TBA sections, blank or
+    malformed fields) have no intervals. Results are cached because the
+    same few days/time strings repeat across the whole schedule.
+
+    Returns:
+        tuple: (start, end) pairs in minutes from Monday 00:00, half-open
+    """
+    if not days or not time:
+        return ()
+    try:
+        start, end = parse_time_range(time)
+        week_days = parse_days(days)
+    except ValueError:
+        return ()
+    return tuple((day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end)
+                 for day in week_days)
+
+
+def week_minute(day, clock):
+    """Minutes from Monday 00:00 for a day ("T", "Tue") and a time ("1:30 PM")."""
+    return parse_day(day) * MINUTES_PER_DAY + parse_clock(clock)
+
+
+def format_week_minute(minute):
+    """Format a week minute as e.g. "Tue 1:30 PM"."""
+    day, minute = divmod(minute, MINUTES_PER_DAY)
+    hours, minutes = divmod(minute, 60)
+    meridiem = "AM" if hours < 12 else "PM"
+    return f"{DAY_NAMES[day % 7]} {(hours - 1) % 12 + 1}:{minutes:02d} {meridiem}"
@@ -0,0 +1,192 @@
+"""
+persistent_avl.py
+PersistentAVLTreeMap: an AVL tree map whose nodes are never modified once
+they are part of a tree.
+
+insert() and delete() copy only the nodes on the search path (plus the
+O(1) nodes a rotation rebuilds), giving a new root that shares every other
+node with the previous version; each write allocates O(log n) nodes.
+snapshot() is therefore O(1): it keeps the current root, and no later
+write can change what that root reaches. Readers of a snapshot, and any
+traversal already under way, see one consistent version while writers go
+on without locks or copies.
+
+With enable_stats() on, a write's allocations count every node it builds,
+the path copies included, not only the node for a new key.
+
+Reads (search, rank, select, paging, range queries, ...) are the shared
+_TreeMapBase implementations, which never modify nodes.
+"""
+
+from SearchTrees import AVLTreeMap
+
+
+class _PersistentNode:
+    """Node of a Persistent AVL Tree; height and size are set at creation."""
+    __slots__ = "key", "value", "left", "right", "height", "size"
+
+    def __init__(self, key, value, left=None, right=None):
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+        self.height = 1 + max(left.height if left is not None else -1,
+                              right.height if right is not None else -1)
+        self.size = 1 + (left.size if left is not None else 0) + \
+            (right.size if right is not None else 0)
+
+
+class PersistentAVLTreeMap(AVLTreeMap):
+    """AVL Tree Map with path-copying writes and O(1) snapshots."""
+
+    _node_class = _PersistentNode
+    _counts_allocations = True
+
+    def __init__(self, read_only=False):
+        super().__init__()
+        self.read_only = read_only
+
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError("PersistentAVLTreeMap snapshot is read-only")
+
+    # ------------------------ SNAPSHOTS ------------------------
+    def snapshot(self):
+        """
+        Return a read-only map of the current version, in O(1).
+
+        The snapshot shares all nodes with this map; later writes to this
+        map build new nodes instead, so the snapshot never changes.
+        """
+        snapshot = PersistentAVLTreeMap(read_only=True)
+        snapshot._root = self._root
+        return snapshot
+
+    # ------------------------ INSERT ------------------------
+    def insert(self, key, value):
+        """Insert or update a key-value pair, copying the search path."""
+        self._check_writable()
+        path = []  # (ancestor, went_left) from the root down
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif key > node.key:
+                path.append((node, False))
+                node = node.right
+            else:
+                # same shape, new value: no rebalancing needed
+                replacement = _PersistentNode(key, value, node.left, node.right)
+                self._root = self._copy_path(path, replacement, rebalance=False)
+                self._count_allocations(len(path) + 1)
+                return
+        self._root = self._copy_path(path, _PersistentNode(key, value))
+        # rotations count their extra nodes in _balanced
+        self._count_allocations(len(path) + 1)
+
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        self._check_writable()
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif key > node.key:
+                path.append((node, False))
+                node = node.right
+            else:
+                break
+        else:
+            return None
+
+        if node.left is None:
+            replacement = node.right
+        elif node.right is None:
+            replacement = node.left
+        else:
+            # take over the in-order successor, copying the right subtree's
+            # left spine down to it
+            spine = []
+            successor = node.right
+            while successor.left is not None:
+                spine.append(successor)
+                successor = successor.left
+            subtree = successor.right
+            for ancestor in reversed(spine):
+                subtree = self._balanced(ancestor.key, ancestor.value, subtree, ancestor.right)
+            replacement = self._balanced(successor.key, successor.value, node.left, subtree)
+            self._count_allocations(len(spine) + 1)
+        self._root = self._copy_path(path, replacement)
+        self._count_allocations(len(path))
+        return node.value
+
+    # ------------------------ BULK WRITES ------------------------
+    def bulk_load(self, items):
+        # the balanced build creates fresh nodes, so older versions are untouched
+        self._check_writable()
+        super().bulk_load(items)
+
+    def delete_many(self, keys):
+        self._check_writable()
+        return super().delete_many(keys)
+
+    # ------------------- PATH COPYING -------------------
+    def _copy_path(self, path, child, rebalance=True):
+        """
+        Rebuild the ancestors in path bottom-up around a new child subtree
+        and return the new root. The old nodes are left as they were.
+        """
+        make = self._balanced if rebalance else _PersistentNode
+        for node, went_left in reversed(path):
+            if went_left:
+                child = make(node.key, node.value, child, node.right)
+            else:
+                child = make(node.key, node.value, node.left, child)
+        return child
+
+    def _balanced(self, key, value, left, right):
+        """
+        Return a new AVL subtree holding key above left and right (whose
+        heights differ by at most 2), rotating with new nodes if needed.
+        """
+        left_height = left.height if left is not None else -1
+        right_height = right.height if right is not None else -1
+
+        if left_height > right_height + 1:
+            # Case 3: Left Right (Case 1, Left Left, needs only the right rotation)
+            if self._get_height(left.left) >= self._get_height(left.right):
+                case = "LL"
+                subtree = _PersistentNode(left.key, left.value, left.left,
+                                          _PersistentNode(key, value, left.right, right))
+            else:
+                case = "LR"
+                pivot = left.right
+                subtree = _PersistentNode(
+                    pivot.key, pivot.value,
+                    _PersistentNode(left.key, left.value, left.left, pivot.left),
+                    _PersistentNode(key, value, pivot.right, right))
+        elif right_height > left_height + 1:
+            # Case 4: Right Left (Case 2, Right Right, needs only the left rotation)
+            if self._get_height(right.right) >= self._get_height(right.left):
+                case = "RR"
+                subtree = _PersistentNode(right.key, right.value,
+                                          _PersistentNode(key, value, left, right.left),
+                                          right.right)
+            else:
+                case = "RL"
+                pivot = right.left
+                subtree = _PersistentNode(
+                    pivot.key, pivot.value,
+                    _PersistentNode(key, value, left, pivot.left),
+                    _PersistentNode(right.key, right.value, pivot.right, right.right))
+        else:
+            return _PersistentNode(key, value, left, right)
+
+        self._count_rotation(case)
+        # one node more than an unrotated copy for a single rotation, two for a double
+        self._count_allocations(1 if case in ("LL", "RR") else 2)
+        return subtree
@@ -0,0 +1,77 @@
+"""
+query_cache.py
+QueryCache: a bounded LRU cache of query results for Schedule.
+
+Entries are tagged with the schedule's generation counter, which Schedule
+bumps on every change to its contents. A lookup made at a newer
+generation drops every cached result first, so a result computed before
+an add or remove is never served after it.
+"""
+
+from collections import OrderedDict
+
+
+class QueryCache:
+    """LRU cache of query results with hit/miss/eviction counters."""
+
+    def __init__(self, capacity=128):
+        if capacity < 1:
+            raise ValueError("QueryCache capacity must be at least 1")
+        self.capacity = capacity
+        self._entries = OrderedDict()  # key -> result, least recently used first
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0  # entries dropped because the data changed
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, generation, compute):
+        """
+        Return the cached result for key, or compute(), cache and return it.
+
+        Args:
+            key: Hashable query key, e.g. ("code", "CSC 134")
+            generation (int): Current generation of the data being queried
+            compute (callable): Produces the result on a miss
+        """
+        entries = self._entries
+        if generation != self._generation:
+            self.invalidations += len(entries)
+            entries.clear()
+            self._generation = generation
+        try:
+            result = entries[key]
+        except KeyError:
+            pass
+        else:
+            entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = entries[key] = compute()
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        """Drop every cached result (the counters are kept)."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self):
+        """Return the cache's size, capacity and counters as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,246 @@
+"""
+rb_tree.py
+RedBlackTreeMap: a red-black tree map.
+
+Red-black trees are less strictly balanced than AVL trees (height up to
+2*log2(n+1)), but an insert needs at most two rotations and a delete at
+most three, so write-heavy workloads do less restructuring. Like the maps
+in SearchTrees.py, every operation is iterative and tracks subtree sizes,
+so the shared read operations (search, rank/select, range queries) come
+from _TreeMapBase.
+"""
+
+from SearchTrees import _TreeMapBase
+
+
+class _RBNode:
+    """Node of a Red-Black Tree."""
+    __slots__ = "key", "value", "left", "right", "red", "size"
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.red = True  # new nodes start red
+        self.size = 1  # number of nodes in this subtree
+
+
+def _is_red(node):
+    return node is not None and node.red
+
+
+class RedBlackTreeMap(_TreeMapBase):
+    """Red-Black Tree Map."""
+
+    _node_class = _RBNode
+
+    def __init__(self):
+        super().__init__()
+        self._height = -1  # cached height; None when a change made it stale
+
+    # ------------------------ INSERT ------------------------
+    def insert(self, key, value):
+        """Insert or update a key-value pair, then restore the red-black rules."""
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                node.value = value  # update existing
+                return
+
+        node = _RBNode(key, value)
+        self._height = None
+        if not path:
+            node.red = False
+            self._root = node
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        for ancestor in path:
+            ancestor.size += 1
+
+        # path holds the ancestors of node; path[-1] is its parent
+        while path and path[-1].red:
+            parent = path.pop()
+            grand = path[-1]  # a red parent is never the root
+            if parent is grand.left:
+                uncle = grand.right
+                if _is_red(uncle):
+                    # Case 1: red uncle -> recolor and continue from grand
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = path.pop()
+                    continue
+                case = "LL"
+                if node is parent.right:
+                    # Case 2: inner child -> rotate it to the outside
+                    grand.left = self._rotate_left(parent)
+                    node, parent = parent, node
+                    case = "LR"
+                # Case 3: outer child -> rotate grand right
+                parent.red = False
+                grand.red = True
+                path.pop()
+                self._replace_child(path, grand, self._rotate_right(grand))
+            else:
+                uncle = grand.left
+                if _is_red(uncle):
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = path.pop()
+                    continue
+                case = "RR"
+                if node is parent.left:
+                    grand.right = self._rotate_right(parent)
+                    node, parent = parent, node
+                    case = "RL"
+                parent.red = False
+                grand.red = True
+                path.pop()
+                self._replace_child(path, grand, self._rotate_left(grand))
+            self._count_rotation(case)
+            break
+        self._root.red = False
+
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        else:
+            return None
+
+        value = node.value
+        if node.left is not None and node.right is not None:
+            # take over the in-order successor's entry and unlink it instead
+            target = node
+            path.append(node)
+            node = node.right
+            while node.left is not None:
+                path.append(node)
+                node = node.left
+            target.key = node.key
+            target.value = node.value
+
+        child = node.left if node.left is not None else node.right
+        is_left = bool(path) and path[-1].left is node
+        if not path:
+            self._root = child
+        elif is_left:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        for ancestor in path:
+            ancestor.size -= 1
+        self._height = None
+
+        if not node.red:
+            self._fix_double_black(child, is_left, path)
+        return value
+
+    def _fix_double_black(self, x, is_left, path):
+        """
+        Restore equal black heights after a black node was unlinked.
+
+        x (possibly None) carries the extra black; path holds its ancestors,
+        and is_left tells which side of path[-1] it is on.
+        """
+        while path and not _is_red(x):
+            parent = path[-1]
+            if is_left:
+                sibling = parent.right
+                if sibling.red:
+                    # Case 1: red sibling -> rotate so the sibling is black
+                    sibling.red = False
+                    parent.red = True
+                    self._replace_child(path[:-1], parent, self._rotate_left(parent))
+                    path.insert(len(path) - 1, sibling)
+                    sibling = parent.right
+                    self._count_rotation("RR")
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    # Case 2: black nephews -> recolor and move up
+                    sibling.red = True
+                    x = path.pop()
+                    is_left = bool(path) and path[-1].left is x
+                    continue
+                case = "RR"
+                if not _is_red(sibling.right):
+                    # Case 3: only the inner nephew is red -> rotate it outside
+                    sibling.left.red = False
+                    sibling.red = True
+                    parent.right = sibling = self._rotate_right(sibling)
+                    case = "RL"
+                # Case 4: red outer nephew -> rotate parent and finish
+                sibling.red = parent.red
+                parent.red = False
+                sibling.right.red = False
+                self._replace_child(path[:-1], parent, self._rotate_left(parent))
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._replace_child(path[:-1], parent, self._rotate_right(parent))
+                    path.insert(len(path) - 1, sibling)
+                    sibling = parent.left
+                    self._count_rotation("LL")
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    x = path.pop()
+                    is_left = bool(path) and path[-1].left is x
+                    continue
+                case = "LL"
+                if not _is_red(sibling.left):
+                    sibling.right.red = False
+                    sibling.red = True
+                    parent.left = sibling = self._rotate_left(sibling)
+                    case = "LR"
+                sibling.red = parent.red
+                parent.red = False
+                sibling.left.red = False
+                self._replace_child(path[:-1], parent, self._rotate_right(parent))
+            self._count_rotation(case)
+            x = self._root
+            break
+        if x is not None:
+            x.red = False
+
+    # ------------------------ BULK LOAD ------------------------
+    def bulk_load(self, items):
+        super().bulk_load(items)
+        # A balanced build has all leaves on the last two levels: coloring the
+        # deepest level red and the rest black gives equal black heights.
+        level = [self._root] if self._root is not None else []
+        while level:
+            next_level = [child for node in level
+                          for child in (node.left, node.right) if child is not None]
+            for node in level:
+                node.red = bool(not next_level and node is not self._root)
+            level = next_level
+        self._height = None
+
+    # ------------------------ HEIGHT ------------------------
+    def height(self):
+        """Height of the tree (-1 if empty); recomputed only after changes."""
+        if self._height is None:
+            self._height = self._subtree_height(self._root)
+        return self._height
@@ -1,43 +1,293 @@
+import bisect
+import heapq
+import threading
 from schedule_item import ScheduleItem
+from key_codecs import StrKeyCodec
+from query_cache import QueryCache
+from interval_tree import IntervalTreeMap
+from meeting_times import MINUTES_PER_DAY, meeting_intervals, parse_clock, parse_day
+
+# Placeholder rooms and instructors (normalized) that are never double-booked
+_UNBOOKED_ROOMS = frozenset({"", "TBA", "ARR", "ONLINE", "TUAL"})  # TUAL: distance ed
+_UNBOOKED_INSTRUCTORS = frozenset({"", "tba", "staff", "staff,tba"})
 
 class Schedule:
-    # Manages course schedules using a tree-based backend (AVL or BST)
+    # Manages course schedules using a tree-based backend (AVL or BST).
+    # Hash indexes (normalized course code / instructor -> CRNs and items) are
+    # kept next to the tree so lookups don't need a full walk; instructor
+    # names are also indexed by trigram for partial-name queries.
+    # With sorted_code_index=True (default) each code's entries stay in CRN
+    # order, matching the in-order output. With False, add_item appends to
+    # an entry instead of inserting in order (a cheaper update), so items
+    # added one at a time keep insertion order; any full rebuild (bulk
+    # loads, load_snapshot, assigning tree_map) resets entries to CRN order.
+    # key_codec (see key_codecs.py) decides how CRNs are stored as tree keys,
+    # e.g. IntKeyCodec() for numeric order; the API still takes CRN strings.
+    # Course-code and instructor query results are kept in an LRU cache of
+    # query_cache_size entries (0 disables it). Every change to the indexed
+    # items bumps a generation counter, which empties the cache on the next
+    # query, so results are never stale.
+    # Meeting times are parsed into week-minute intervals (see
+    # meeting_times.py) and kept in an IntervalTreeMap for time-of-day
+    # queries and room/instructor conflict reports.
     
-    def __init__(self, tree_map):
+    def __init__(self, tree_map, sorted_code_index=True, key_codec=None,
+                 query_cache_size=128):
+        self._init_state(sorted_code_index,
+                         key_codec if key_codec is not None else StrKeyCodec(),
+                         QueryCache(query_cache_size) if query_cache_size else None)
         self.tree_map = tree_map
     
-    # Add item to schedule
+    # Set every field except the tree and its indexes; shared with
+    # ScheduleSnapshot, which attaches its tree without building indexes
+    def _init_state(self, sorted_code_index, key_codec, query_cache):
+        self.sorted_code_index = sorted_code_index
+        self.key_codec = key_codec
+        self._encode = key_codec.encode
+        self._generation = 0
+        self._query_cache = query_cache
+        self._depth_cache = None  # (tree, generation, average depth)
+    
+    # Tree backend; assigning a new tree rebuilds the secondary indexes
+    @property
+    def tree_map(self):
+        return self._tree_map
+    
+    @tree_map.setter
+    def tree_map(self, tree_map):
+        self._tree_map = tree_map
+        self._rebuild_indexes()
+    
+    # Tree key for an item (its CRN encoded by the key codec); sort by this
+    # before calling add_items_sorted
+    def item_key(self, schedule_item):
+        return self._encode(schedule_item.get_crn())
+    
+    # Encode a CRN query; None if the codec can't represent it (so no match)
+    def _query_key(self, crn):
+        try:
+            return self._encode(crn)
+        except (ValueError, TypeError):
+            return None
+    
+    # Add item to schedule. The tree is written first, so if it refuses the
+    # write (e.g. read-only after freeze()) the indexes are left untouched.
     def add_item(self, schedule_item):
-        crn = schedule_item.get_crn()
-        self.tree_map.insert(crn, schedule_item)
+        key = self.item_key(schedule_item)
+        old_item = self.tree_map.get(key)  # get() isn't counted as a search
+        self.tree_map.insert(key, schedule_item)
+        if old_item is not None:
+            self._unindex_item(key, old_item)
+        self._index_item(key, schedule_item)
+    
+    # Add many items at once; items must already be sorted by item_key.
+    # Builds a balanced tree in linear time instead of n separate inserts.
+    def add_items_sorted(self, schedule_items):
+        self.tree_map.bulk_load((self.item_key(item), item) for item in schedule_items)
+        self._rebuild_indexes()
+    
+    # Save all items to a binary snapshot (see snapshot.py); pass the CSV
+    # they came from so later loads can detect a stale snapshot
+    def save_snapshot(self, filename, source_csv=None):
+        from snapshot import write_snapshot
+        return write_snapshot(filename, self.get_all_items(), source_csv, self.key_codec)
+    
+    # Add all items from a binary snapshot with a linear-time bulk build.
+    # Raises snapshot.SnapshotError if it is invalid or stale vs source_csv.
+    def load_snapshot(self, filename, source_csv=None):
+        from snapshot import open_snapshot
+        with open_snapshot(filename, source_csv, self.key_codec) as reader:
+            items = reader.items()
+            if reader.key_codec_id != self.key_codec.snapshot_id:
+                items.sort(key=self.item_key)  # saved in another key order
+        self.add_items_sorted(items)
+        return len(items)
+    
+    # Replace the tree with a SortedArrayMap of the same items, for a catalog
+    # that is published and then mostly read. With read_only=True any later
+    # add/remove raises TypeError; otherwise writes are buffered and merged.
+    def freeze(self, read_only=True):
+        from sorted_array_map import SortedArrayMap
+        # same keys and items, so the secondary indexes stay valid
+        self._tree_map = SortedArrayMap.from_tree(self._tree_map, read_only)
+    
+    # Read-only view of the schedule as it is now (see ScheduleSnapshot), for
+    # long traversals or readers that need one consistent catalog while
+    # writes go on. Needs a tree with an O(1) snapshot(), i.e. the
+    # "persistent-avl" engine; raises TypeError for other trees.
+    def snapshot(self):
+        take_snapshot = getattr(self._tree_map, "snapshot", None)
+        if take_snapshot is None:
+            raise TypeError(f"{type(self._tree_map).__name__} does not support snapshots "
+                            "(use the 'persistent-avl' engine)")
+        return ScheduleSnapshot(take_snapshot(), self.key_codec, self._generation)
     
     # Add course to schedule (alias for add_item)
     def add_course(self, schedule_item):
         self.add_item(schedule_item)
     
-    # Remove item by CRN (placeholder)
+    # Remove item by CRN; returns the removed item, or None if not found
     def remove_item(self, crn):
-        print(f"Note: Removal not implemented in tree-based version")
+        key = self._query_key(crn)
+        if key is None:
+            return None
+        item = self.tree_map.delete(key)
+        if item is not None:
+            self._unindex_item(key, item)
+        return item
+    
+    # Remove several items by CRN in one batch; returns the removed items
+    def remove_items(self, crns):
+        keys = [key for key in map(self._query_key, crns) if key is not None]
+        removed = []
+        for key, item in self.tree_map.delete_many(keys):
+            self._unindex_item(key, item)
+            removed.append(item)
+        return removed
     
     # Find item by CRN
     def find_by_crn(self, crn):
-        return self.tree_map.search(crn)
+        key = self._query_key(crn)
+        return self.tree_map.search(key) if key is not None else None
     
-    # Find items by course code
-    def find_by_course_code(self, course_code):
-        results = []
-        for crn, item in self.tree_map.inorder_items():
-            if item.get_course_code().upper() == course_code.upper():
-                results.append(item)
+    # Find items for many CRNs at once (e.g. a whole shopping cart) with one
+    # sorted pass over the tree; returns them in input order, None for misses
+    def find_many_by_crn(self, crns):
+        crns = list(crns)
+        keys = [self._query_key(crn) for crn in crns]
+        valid = [i for i, key in enumerate(keys) if key is not None]
+        results = [None] * len(crns)
+        found = self.tree_map.search_many([keys[i] for i in valid])
+        for i, item in zip(valid, found):
+            results[i] = item
         return results
     
-    # Find items taught by a specific instructor
+    # Lazily yield items whose CRN is between lo and hi (inclusive).
+    # Bounds go through the key codec, so with IntKeyCodec the range is numeric.
+    # A bound the codec can't encode matches nothing (like find_by_crn).
+    def iter_crn_range(self, lo, hi):
+        lo, hi = self._query_key(lo), self._query_key(hi)
+        if lo is None or hi is None:
+            return
+        for key, item in self.tree_map.range_items(lo, hi):
+            yield item
+    
+    # Find items whose CRN is between lo and hi (inclusive)
+    def find_by_crn_range(self, lo, hi):
+        return list(self.iter_crn_range(lo, hi))
+    
+    # Lazily yield items with CRN >= crn in sorted order (none if the codec
+    # can't encode crn)
+    def iter_items_from(self, crn):
+        key = self._query_key(crn)
+        if key is None:
+            return
+        for key, item in self.tree_map.items_from(key):
+            yield item
+    
+    # Find item with the largest CRN <= crn (None if there is none, or if
+    # the codec can't encode crn)
+    def find_floor_crn(self, crn):
+        key = self._query_key(crn)
+        pair = self.tree_map.floor(key) if key is not None else None
+        return pair[1] if pair else None
+    
+    # Find item with the smallest CRN >= crn (None if there is none, or if
+    # the codec can't encode crn)
+    def find_ceiling_crn(self, crn):
+        key = self._query_key(crn)
+        pair = self.tree_map.ceiling(key) if key is not None else None
+        return pair[1] if pair else None
+    
+    # Get item with the smallest CRN (None if empty)
+    def get_first_item(self):
+        pair = self.tree_map.min()
+        return pair[1] if pair else None
+    
+    # Get item with the largest CRN (None if empty)
+    def get_last_item(self):
+        pair = self.tree_map.max()
+        return pair[1] if pair else None
+    
+    # Find items by course code (case-insensitive) using the code index
+    def find_by_course_code(self, course_code):
+        return self._cached_query("code", self._normalize_code(course_code),
+                                  self._lookup_course_code)
+    
+    def _lookup_course_code(self, code):
+        entry = self._code_index.get(code)
+        return tuple(entry[1]) if entry else ()
+    
+    # Find items taught by a specific instructor (case-insensitive, partial
+    # match) using the instructor trigram index; results are in CRN order
     def find_by_instructor(self, instructor):
-        results = []
-        for crn, item in self.tree_map.inorder_items():
-            if instructor.lower() in item.get_instructor().lower():
-                results.append(item)  # Fixed typo: appened -> append
-        return results
+        return self._cached_query("instructor", self._normalize_instructor(instructor),
+                                  self._lookup_instructor)
+    
+    def _lookup_instructor(self, query):
+        names = self._matching_instructors(query)
+        if len(names) == 1:
+            return tuple(self._instructor_index[names[0]][1])
+        entries = [zip(*self._instructor_index[name]) for name in names]
+        return tuple(item for crn, item in heapq.merge(*entries, key=lambda pair: pair[0]))
+    
+    # Answer a normalized query through the result cache (if enabled).
+    # Results are cached as tuples; callers always get a fresh list.
+    def _cached_query(self, kind, query, lookup):
+        if self._query_cache is None:
+            return list(lookup(query))
+        return list(self._query_cache.get_or_compute(
+            (kind, query), self._generation, lambda: lookup(query)))
+    
+    # Hit/miss/eviction counters of the query cache (None if disabled)
+    def query_cache_stats(self):
+        return self._query_cache.stats() if self._query_cache is not None else None
+    
+    # Empty the query cache (normally unnecessary: changes invalidate it)
+    def clear_query_cache(self):
+        if self._query_cache is not None:
+            self._query_cache.clear()
+    
+    # Find items meeting at a moment, e.g. find_meetings_at("T", "1:30 PM");
+    # results are ordered by start time. Raises ValueError for a bad day/time.
+    def find_meetings_at(self, day, time):
+        point = parse_day(day) * MINUTES_PER_DAY + parse_clock(time)
+        return [item for key, item in self._meetings.stabbing(point)]
+    
+    # Find items meeting on day at any time between start and end, e.g.
+    # find_meetings_between("Tue", "1:00 PM", "3:00 PM"); ordered by start.
+    # Classes that end exactly at start (or begin at end) are not included.
+    def find_meetings_between(self, day, start, end):
+        offset = parse_day(day) * MINUTES_PER_DAY
+        lo, hi = offset + parse_clock(start), offset + parse_clock(end)
+        if hi <= lo:
+            raise ValueError("end time must be after start time")
+        return [item for key, item in self._meetings.overlapping(lo, hi)]
+    
+    # Report double-bookings: pairs of items meeting at the same time in the
+    # same room or with the same instructor (placeholder rooms such as TBA
+    # and "Staff" instructors are ignored). Each entry is
+    # (kind, resource, first item, second item, overlap start, overlap end)
+    # with kind "room" or "instructor" and times in week minutes (see
+    # meeting_times.format_week_minute); one entry per overlapping meeting.
+    def find_conflicts(self):
+        conflicts = []
+        for kind, resource in (("room", self._room_resource),
+                               ("instructor", self._instructor_resource)):
+            for (key_a, item_a), (key_b, item_b) in self._meetings.find_conflicts(resource):
+                conflicts.append((kind, resource(item_a), item_a, item_b,
+                                  key_b[0], min(key_a[1], key_b[1])))
+        return conflicts
+    
+    @staticmethod
+    def _room_resource(item):
+        room = item.location.strip().upper()
+        return None if room in _UNBOOKED_ROOMS else room
+    
+    @classmethod
+    def _instructor_resource(cls, item):
+        name = cls._normalize_instructor(item.get_instructor()).strip()
+        return None if name in _UNBOOKED_INSTRUCTORS else name
     
     # Get all items sorted by CRN
     def get_all_items(self):
@@ -47,12 +297,150 @@ class Schedule:
     def get_tree_height(self):
         return self.tree_map.height()
     
-    # Get number of items in schedule
+    # Get items by position in CRN order, e.g. get_items_page(500, 550)
+    # returns the 500th through 549th courses without building the full list
+    def get_items_page(self, start, stop):
+        return [item for crn, item in self.tree_map.items_by_rank(start, stop)]
+    
+    # Get position of a CRN in sorted order (number of smaller CRNs); None
+    # if the codec can't encode crn, since it has no place in the order
+    def get_crn_rank(self, crn):
+        key = self._query_key(crn)
+        return self.tree_map.rank(key) if key is not None else None
+    
+    # Average nodes a successful CRN search visits, over all keys (None if
+    # the tree can't report it). That takes a full walk of the tree, so the
+    # value is kept until the next change (generation bump) or new tree.
+    def get_average_depth(self):
+        if not hasattr(self._tree_map, "average_depth"):
+            return None
+        cache = self._depth_cache
+        if cache is None or cache[0] is not self._tree_map or cache[1] != self._generation:
+            cache = self._depth_cache = (self._tree_map, self._generation,
+                                         self._tree_map.average_depth())
+        return cache[2]
+    
+    # Get number of items in schedule (O(1) from the root's subtree size)
     def get_item_count(self):
-        count = 0
-        for _ in self.tree_map.inorder_items():
-            count += 1
-        return count
+        return len(self.tree_map)
+    
+    # ------------------- SECONDARY INDEXES -------------------
+    # Normalize a course code for index lookups
+    @staticmethod
+    def _normalize_code(course_code):
+        return course_code.upper()
+    
+    # Normalize an instructor name (or partial name) for index lookups
+    @staticmethod
+    def _normalize_instructor(instructor):
+        return instructor.lower()
+    
+    # Rebuild all secondary indexes from the tree (in-order, so key-sorted).
+    # Index entries hold tree keys, so their order matches the tree's.
+    # The indexes are built aside and published in one dict update, so a
+    # reader on another thread never finds one half-filled.
+    def _rebuild_indexes(self):
+        self._generation += 1
+        code_index = {}
+        instructor_index = {}
+        trigram_index = {}
+        meetings = []
+        for crn, item in self._tree_map.inorder_items():
+            for start, end in meeting_intervals(item.days, item.time):
+                meetings.append(((start, end, crn), item))
+            crns, items = code_index.setdefault(
+                self._normalize_code(item.get_course_code()), ([], []))
+            crns.append(crn)
+            items.append(item)
+            name = self._normalize_instructor(item.get_instructor())
+            if name not in instructor_index:
+                instructor_index[name] = ([], [])
+                self._add_trigrams(trigram_index, name)
+            crns, items = instructor_index[name]
+            crns.append(crn)
+            items.append(item)
+        meetings.sort(key=lambda meeting: meeting[0])
+        vars(self).update(_code_index=code_index,
+                          _instructor_index=instructor_index,
+                          _trigram_index=trigram_index,
+                          _meetings=IntervalTreeMap.from_sorted_items(meetings))
+    
+    # Add one item to the secondary indexes
+    def _index_item(self, crn, item):
+        self._generation += 1
+        self._index_add(self._code_index, self._normalize_code(item.get_course_code()),
+                        crn, item, self.sorted_code_index)
+        name = self._normalize_instructor(item.get_instructor())
+        if name not in self._instructor_index:
+            self._add_trigrams(self._trigram_index, name)
+        self._index_add(self._instructor_index, name, crn, item, True)
+        for start, end in meeting_intervals(item.days, item.time):
+            self._meetings.insert((start, end, crn), item)
+    
+    # Remove one item from the secondary indexes
+    def _unindex_item(self, crn, item):
+        self._generation += 1
+        self._index_remove(self._code_index, self._normalize_code(item.get_course_code()),
+                           crn, self.sorted_code_index)
+        name = self._normalize_instructor(item.get_instructor())
+        self._index_remove(self._instructor_index, name, crn, True)
+        if name not in self._instructor_index:
+            self._remove_trigrams(name)
+        for start, end in meeting_intervals(item.days, item.time):
+            self._meetings.delete((start, end, crn))
+    
+    # Add crn/item to an index entry, in CRN order or appended
+    @staticmethod
+    def _index_add(index, key, crn, item, keep_sorted):
+        crns, items = index.setdefault(key, ([], []))
+        pos = bisect.bisect_left(crns, crn) if keep_sorted else len(crns)
+        crns.insert(pos, crn)
+        items.insert(pos, item)
+    
+    # Remove crn from an index entry, dropping the entry once it is empty
+    @staticmethod
+    def _index_remove(index, key, crn, keep_sorted):
+        crns, items = index[key]
+        pos = bisect.bisect_left(crns, crn) if keep_sorted else crns.index(crn)
+        del crns[pos]
+        del items[pos]
+        if not crns:
+            del index[key]
+    
+    # Distinct 3-character substrings of a normalized name
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    @classmethod
+    def _add_trigrams(cls, trigram_index, name):
+        for gram in cls._trigrams(name):
+            trigram_index.setdefault(gram, set()).add(name)
+    
+    def _remove_trigrams(self, name):
+        for gram in self._trigrams(name):
+            names = self._trigram_index[gram]
+            names.discard(name)
+            if not names:
+                del self._trigram_index[gram]
+    
+    # Distinct normalized instructor names containing the normalized query.
+    # Queries of 3+ characters intersect trigram posting sets; shorter ones
+    # have no trigrams, so they scan the distinct names (not every item).
+    def _matching_instructors(self, query):
+        grams = self._trigrams(query)
+        if not grams:
+            return [name for name in self._instructor_index if query in name]
+        postings = []
+        for gram in grams:
+            names = self._trigram_index.get(gram)
+            if not names:
+                return []
+            postings.append(names)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        # trigrams can match out of order, so confirm the real substring
+        return [name for name in candidates if query in name]
     
     # Display schedule items in sorted order
     def display_all(self):
@@ -91,5 +479,69 @@ class Schedule:
             optimal_height = math.floor(math.log2(count))
             print(f"Optimal Height: {optimal_height}")
             print(f"Height Efficiency: {(optimal_height / height * 100):.1f}%" if height > 0 else "N/A")
+            average_depth = self.get_average_depth()
+            if average_depth is not None:
+                print(f"Average Search Path: {average_depth:.2f} nodes (over all keys)")
+            print(f"Meeting Intervals: {len(self._meetings)} "
+                  f"(interval tree height {self._meetings.height()})")
         
-        print(f"{'=' * 80}\n")
\ No newline at end of file
+        cache = self.query_cache_stats()
+        if cache is not None and cache["hits"] + cache["misses"]:
+            print(f"Query Cache: {cache['size']}/{cache['capacity']} entries, "
+                  f"{cache['hits']} hits, {cache['misses']} misses "
+                  f"({cache['hit_rate']:.0%} hit rate), {cache['evictions']} evictions")
+        
+        # measured counters, when the tree has stats enabled
+        stats = getattr(self.tree_map, "stats", None)
+        if stats is not None and stats.operations:
+            print("Measured Operations:")
+            for line in stats.summary_lines():
+                print(f"  {line}")
+        
+        print(f"{'=' * 80}\n")
+
+
+class ScheduleSnapshot(Schedule):
+    # A frozen version of a Schedule, made by Schedule.snapshot(). The tree
+    # is a read-only PersistentAVLTreeMap sharing its nodes with the live
+    # schedule, whose later writes copy paths instead of changing them, so
+    # taking a snapshot is O(1) and it never sees a partial update.
+    # version is the live schedule's generation when the snapshot was taken.
+    # CRN queries go straight to the shared tree. The secondary indexes
+    # (course code, instructor, meeting times) are built from the snapshot
+    # on the first query that needs them, once, even when several threads
+    # ask at the same time. Every write raises TypeError.
+    
+    _LAZY_INDEXES = frozenset({"_code_index", "_instructor_index",
+                               "_trigram_index", "_meetings"})
+    
+    def __init__(self, tree_map, key_codec, version):
+        # no query cache: the indexes never change, so lookups are cheap
+        self._init_state(True, key_codec, None)
+        self._tree_map = tree_map
+        self.version = version
+        self._index_lock = threading.Lock()
+    
+    # Build the secondary indexes the first time one is looked up. Readers
+    # that arrive during the build wait for it; _rebuild_indexes publishes
+    # all of them at once, so a reader never sees a half-built index.
+    def __getattr__(self, name):
+        if name not in ScheduleSnapshot._LAZY_INDEXES:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        with self._index_lock:
+            if name not in self.__dict__:  # unless a waiting reader built them
+                try:
+                    self._rebuild_indexes()
+                except AttributeError as e:
+                    # escaping __getattr__ it would read as a missing index
+                    raise RuntimeError(f"building the snapshot's indexes failed: {e}") from e
+        return self.__dict__[name]
+    
+    # The tree can't be swapped out either
+    tree_map = property(Schedule.tree_map.fget)
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("ScheduleSnapshot is read-only")
+    
+    add_item = add_items_sorted = load_snapshot = freeze = _read_only
+    remove_item = remove_items = _read_only
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleItem:
-    """Represents a single course schedule entry"""
+    """Represents a single course schedule entry (slotted: no per-instance __dict__)"""
     crn: str
     course_code: str
     course_title: str
@@ -0,0 +1,257 @@
+"""
+schedule_server.py
+Asyncio query server for a loaded Schedule: line-delimited JSON over TCP or
+a Unix socket.
+
+Every request is one JSON object on one line, and every response is one
+line carrying the request's id:
+    {"id": 1, "op": "find_by_crn", "crn": "24301"}
+    {"id": 2, "op": "find_many", "crns": ["24301", "99999"]}
+    {"id": 3, "op": "find_by_course_code", "code": "CSC134"}
+    {"id": 4, "op": "find_by_instructor", "name": "scott"}
+    {"id": 5, "op": "stats"}
+
+    {"id": 1, "ok": true, "result": {"crn": "24301", ...}}
+    {"id": 2, "ok": true, "count": 2, "result": [{...}, null]}
+    {"id": 9, "ok": false, "error": "unknown op 'x'"}
+
+find_by_crn returns null for an unknown CRN and find_many has null for
+each miss. Clients may pipeline: send any number of requests without
+waiting. A connection's responses always come back in request order.
+List results are written STREAM_CHUNK items at a time, waiting for the
+socket to drain between pieces, so a large result is streamed under flow
+control instead of being built as one string.
+
+Queries run on the event loop thread. They are in-memory tree and index
+lookups, so one request never blocks the others for long.
+
+Usage:
+    python schedule_server.py --csv courses_2023.csv --port 8765
+    python schedule_server.py --unix /tmp/schedule.sock --engine btree
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+
+from csv_loader import ingest_records, parse_schedule_csv
+from schedule import Schedule
+from schedule_item import ScheduleItem
+from tree_engines import DEFAULT_ENGINE, available_engines, create_tree_map
+
+DEFAULT_PORT = 8765
+STREAM_CHUNK = 256  # list items written per piece of a streamed result
+MAX_REQUEST_BYTES = 1024 * 1024  # longest accepted request line
+
+ITEM_FIELDS = ScheduleItem.__slots__
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class RequestError(Exception):
+    """A request the server cannot answer; sent back as an error response."""
+
+
+def item_to_dict(item):
+    """Return a ScheduleItem's fields as a dict (None stays None)."""
+    if item is None:
+        return None
+    return {field: getattr(item, field) for field in ITEM_FIELDS}
+
+
+class ScheduleServer:
+    """Serves one Schedule to any number of connections."""
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.requests = Counter()  # op name -> requests answered
+        self.errors = 0
+        self.connections = 0
+        self.active_connections = 0
+        self.started = time.monotonic()
+        self._ops = {
+            "find_by_crn": self._find_by_crn,
+            "find_many": self._find_many,
+            "find_by_course_code": self._find_by_course_code,
+            "find_by_instructor": self._find_by_instructor,
+            "stats": self._stats,
+        }
+
+    # ------------------------ LISTENING ------------------------
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        """Start listening (on unix_path if given) and return the asyncio Server."""
+        if unix_path is not None:
+            return await asyncio.start_unix_server(
+                self.handle_connection, unix_path, limit=MAX_REQUEST_BYTES)
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_REQUEST_BYTES)
+
+    async def handle_connection(self, reader, writer):
+        """Answer one connection's requests in order until it closes."""
+        self.connections += 1
+        self.active_connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # an over-long line can't be resynchronized: report and hang up
+                    self.errors += 1
+                    writer.write(self._error_line(None, "request line too long"))
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await self._respond(line, writer)
+            await writer.drain()
+        except ConnectionError:
+            pass  # client went away mid-response
+        except asyncio.CancelledError:
+            # server shutting down: end quietly (on Python 3.11 a handler that
+            # ends cancelled makes asyncio log a traceback per connection)
+            pass
+        finally:
+            self.active_connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # ------------------------ DISPATCH ------------------------
+    async def _respond(self, line, writer):
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise RequestError("request is not valid JSON")
+            if not isinstance(request, dict):
+                raise RequestError("request must be a JSON object")
+            request_id = request.get("id")
+            op = request.get("op")
+            handler = self._ops.get(op)
+            if handler is None:
+                raise RequestError(f"unknown op {op!r}")
+            result = handler(request)
+        except Exception as e:
+            # bad requests (RequestError) and failed lookups alike are
+            # reported on this request; the connection stays usable
+            self.errors += 1
+            message = str(e) if isinstance(e, RequestError) else f"{type(e).__name__}: {e}"
+            writer.write(self._error_line(request_id, message))
+            await writer.drain()
+            return
+        self.requests[op] += 1
+        head = f'{{"id":{_encode_json(request_id)},"ok":true'
+        if isinstance(result, list):
+            await self._write_list(writer, head, result)
+        else:
+            writer.write(f'{head},"result":{_encode_json(result)}}}\n'.encode())
+            await writer.drain()  # returns at once unless the client is slow to read
+
+    async def _write_list(self, writer, head, items):
+        """Write a list result in pieces, draining between them."""
+        writer.write(f'{head},"count":{len(items)},"result":['.encode())
+        for start in range(0, len(items), STREAM_CHUNK):
+            piece = ",".join(_encode_json(item_to_dict(item))
+                             for item in items[start:start + STREAM_CHUNK])
+            writer.write((piece if not start else "," + piece).encode())
+            await writer.drain()
+        writer.write(b"]}\n")
+        await writer.drain()
+
+    @staticmethod
+    def _error_line(request_id, message):
+        return f'{{"id":{_encode_json(request_id)},"ok":false,"error":{_encode_json(message)}}}\n'.encode()
+
+    @staticmethod
+    def _param(request, name, kind=str):
+        value = request.get(name)
+        if not isinstance(value, kind):
+            raise RequestError(f"'{name}' must be a {'list' if kind is list else 'string'}")
+        return value
+
+    # ------------------------ OPERATIONS ------------------------
+    def _find_by_crn(self, request):
+        return item_to_dict(self.schedule.find_by_crn(self._param(request, "crn")))
+
+    def _find_many(self, request):
+        crns = self._param(request, "crns", list)
+        if not all(isinstance(crn, str) for crn in crns):
+            raise RequestError("'crns' must be a list of strings")
+        return self.schedule.find_many_by_crn(crns)
+
+    def _find_by_course_code(self, request):
+        return self.schedule.find_by_course_code(self._param(request, "code"))
+
+    def _find_by_instructor(self, request):
+        return self.schedule.find_by_instructor(self._param(request, "name"))
+
+    def _stats(self, request):
+        schedule = self.schedule
+        return {
+            "items": schedule.get_item_count(),
+            "height": schedule.get_tree_height(),
+            "engine": type(schedule.tree_map).__name__,
+            "query_cache": schedule.query_cache_stats(),
+            "server": {
+                "uptime_s": round(time.monotonic() - self.started, 3),
+                "connections": self.connections,
+                "active_connections": self.active_connections,
+                "requests": dict(self.requests),
+                "errors": self.errors,
+            },
+        }
+
+
+# ---------------------------------------------------------
+# ------------------------- MAIN --------------------------
+# ---------------------------------------------------------
+def load_schedule(csv_filename, engine=DEFAULT_ENGINE):
+    """Build a Schedule on the given engine from a CSV file (bulk loaded)."""
+    schedule = Schedule(create_tree_map(engine))
+    ingest_records(parse_schedule_csv(csv_filename, fast=True), schedule, bulk=True)
+    return schedule
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Schedule queries as line-delimited JSON.")
+    parser.add_argument("--csv", default="courses_2023.csv", help="schedule CSV to load")
+    parser.add_argument("--engine", choices=available_engines(), default=DEFAULT_ENGINE,
+                        help="tree engine (default: %(default)s)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="TCP port (0 picks a free one; default: %(default)s)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    schedule = load_schedule(args.csv, args.engine)
+    server = ScheduleServer(schedule)
+    listener = await server.start(args.host, args.port, args.unix)
+    if args.unix:
+        where = args.unix
+    else:
+        host, port = listener.sockets[0].getsockname()[:2]
+        where = f"{host}:{port}"
+    # bench_schedule_server.py reads the address from this line
+    print(f"Serving {schedule.get_item_count()} courses on {where}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""
+skip_list.py
+SkipListMap: an indexable skip list with the same interface as the tree maps.
+
+Each node sits on a random number of levels (1 with probability 1/2, 2 with
+1/4, ...); searches start on the top level and drop down, so they take
+O(log n) expected steps. Every link also records its width, the number of
+level-0 positions it skips, which gives rank(), select() and paging in
+O(log n) the way subtree sizes do in the trees.
+
+Positions are 1-based (the head sentinel is position 0); a link to the end
+of the list (None) has a width reaching position len + 1.
+"""
+
+import random
+from SearchTrees import _dedupe_sorted, _merge_sorted, _split_sorted
+
+MAX_LEVEL = 32
+
+
+class _SkipNode:
+    """Node of a Skip List: one forward link and link width per level."""
+    __slots__ = "key", "value", "next", "width"
+
+    def __init__(self, key, value, levels):
+        self.key = key
+        self.value = value
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class SkipListMap:
+    """Indexable Skip List Map. Pass seed for reproducible node levels."""
+
+    def __init__(self, seed=None):
+        self._head = _SkipNode(None, None, MAX_LEVEL)
+        self._levels = 1  # levels in use; the head's higher links are ignored
+        self._size = 0
+        self._getrandbits = random.Random(seed).getrandbits
+
+    @classmethod
+    def from_sorted_items(cls, items):
+        """Build a map from (key, value) pairs sorted by key, in O(n)."""
+        skip_list = cls()
+        skip_list.bulk_load(items)
+        return skip_list
+
+    def __len__(self):
+        return self._size
+
+    def _random_levels(self):
+        # the lowest set bit of a random word is geometric with p = 1/2
+        bits = self._getrandbits(MAX_LEVEL - 1) | (1 << (MAX_LEVEL - 1))
+        return (bits & -bits).bit_length()
+
+    def _find_path(self, key):
+        """
+        Return (update, positions): per level, the last node with a key below
+        key, and that node's position.
+        """
+        update = [None] * self._levels
+        positions = [0] * self._levels
+        node = self._head
+        position = 0
+        for level in range(self._levels - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                position += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+            update[level] = node
+            positions[level] = position
+        return update, positions
+
+    # ------------------------ INSERT ------------------------
+    def insert(self, key, value):
+        """Insert or update a key-value pair."""
+        update, positions = self._find_path(key)
+        candidate = update[0].next[0]
+        if candidate is not None and candidate.key == key:
+            candidate.value = value  # update existing
+            return
+
+        levels = self._random_levels()
+        if levels > self._levels:
+            for level in range(self._levels, levels):
+                self._head.next[level] = None
+                self._head.width[level] = self._size + 1
+                update.append(self._head)
+                positions.append(0)
+            self._levels = levels
+
+        node = _SkipNode(key, value, levels)
+        position = positions[0] + 1
+        for level in range(levels):
+            prev = update[level]
+            node.next[level] = prev.next[level]
+            node.width[level] = prev.width[level] + positions[level] + 1 - position
+            prev.next[level] = node
+            prev.width[level] = position - positions[level]
+        for level in range(levels, self._levels):
+            update[level].width[level] += 1  # these links now skip one more node
+        self._size += 1
+
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        update, _ = self._find_path(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return None
+        for level in range(self._levels):
+            prev = update[level]
+            if prev.next[level] is node:
+                prev.next[level] = node.next[level]
+                prev.width[level] += node.width[level] - 1
+            else:
+                prev.width[level] -= 1
+        while self._levels > 1 and self._head.next[self._levels - 1] is None:
+            self._levels -= 1
+        self._size -= 1
+        return node.value
+
+    def delete_many(self, keys):
+        """
+        Delete every key in keys that is present.
+
+        Large batches (more than 1/8 of the list) are applied with one pass
+        and a linear rebuild instead of one O(log n) delete per key.
+
+        Returns:
+            list: The removed (key, value) pairs in key order
+        """
+        keys = sorted(set(keys))
+        if len(keys) * 8 <= len(self):
+            removed = []
+            for key in keys:
+                value = self.delete(key)
+                if value is not None:
+                    removed.append((key, value))
+            return removed
+
+        kept_keys, kept_values, removed = _split_sorted(self.inorder_items(), keys)
+        self._rebuild(kept_keys, kept_values)
+        return removed
+
+    # ------------------------ BULK LOAD ------------------------
+    def bulk_load(self, items):
+        """
+        Load (key, value) pairs sorted by key in O(n + m), merging them with
+        the current contents (new values win on duplicate keys).
+
+        Raises:
+            ValueError: If items are not sorted by key
+        """
+        keys, values = _merge_sorted(self.inorder_items(), _dedupe_sorted(items))
+        self._rebuild(keys, values)
+
+    def _rebuild(self, keys, values):
+        """
+        Relink the list from sorted keys/values. Levels are deterministic:
+        the node at position p gets 1 + (trailing zeros of p) levels, the
+        perfectly balanced layout.
+        """
+        head = self._head
+        last = [head] * MAX_LEVEL  # last node linked on each level
+        last_position = [0] * MAX_LEVEL
+        levels_used = 1
+        for position, (key, value) in enumerate(zip(keys, values), 1):
+            levels = min((position & -position).bit_length(), MAX_LEVEL)
+            node = _SkipNode(key, value, levels)
+            for level in range(levels):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_position[level]
+                last[level] = node
+                last_position[level] = position
+            if levels > levels_used:
+                levels_used = levels
+        end = len(keys) + 1
+        for level in range(levels_used):
+            last[level].next[level] = None
+            last[level].width[level] = end - last_position[level]
+        self._levels = levels_used
+        self._size = len(keys)
+
+    # ------------------------ SEARCH ------------------------
+    def search(self, key):
+        """Return the value for key, or None."""
+        node = self._head
+        for level in range(self._levels - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                node = nxt
+                nxt = node.next[level]
+        node = node.next[0]
+        if node is not None and node.key == key:
+            return node.value
+        return None
+
+    get = search  # see _TreeMapBase.get
+
+    def search_many(self, keys):
+        """
+        Look up many keys at once, in sorted order.
+
+        When the probes are dense (their keys span at most about 8 list
+        positions per probe, as for a roster of neighbouring CRNs), each
+        search is a finger search: it climbs from the previous search's
+        predecessors only as high as needed instead of starting at the
+        head. Sparse probes are searched from the head as usual.
+
+        Returns:
+            list: The value for each key in input order, None for misses
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        if not keys or not self._size:
+            return results
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        head = self._head
+        levels = self._levels
+        span = self.rank(keys[order[-1]]) - self.rank(keys[order[0]])
+        dense = span <= 8 * len(keys)
+        update = [head] * levels  # per level, last node with key < previous probe
+        for i in order:
+            key = keys[i]
+            if dense:
+                # climb while the previous predecessor's link still falls short of key
+                level = 0
+                while level + 1 < levels:
+                    nxt = update[level + 1].next[level + 1]
+                    if nxt is None or not nxt.key < key:
+                        break
+                    level += 1
+                node = update[level]
+                while True:
+                    nxt = node.next[level]
+                    while nxt is not None and nxt.key < key:
+                        node = nxt
+                        nxt = node.next[level]
+                    update[level] = node
+                    if level == 0:
+                        break
+                    level -= 1
+                    finger = update[level]
+                    if finger is not head and (node is head or node.key < finger.key):
+                        node = finger
+            else:
+                node = head
+                for level in range(levels - 1, -1, -1):
+                    nxt = node.next[level]
+                    while nxt is not None and nxt.key < key:
+                        node = nxt
+                        nxt = node.next[level]
+            node = node.next[0]
+            if node is not None and node.key == key:
+                results[i] = node.value
+        return results
+
+    # ------------------------ RANK / SELECT ------------------------
+    def rank(self, key):
+        """Return the number of keys strictly less than key, in O(log n)."""
+        return self._find_path(key)[1][0]
+
+    def _node_at(self, position):
+        """Return the node at a 1-based position (0 gives the head)."""
+        node = self._head
+        reached = 0
+        for level in range(self._levels - 1, -1, -1):
+            while node.next[level] is not None and reached + node.width[level] <= position:
+                reached += node.width[level]
+                node = node.next[level]
+        return node
+
+    def select(self, index):
+        """
+        Return the (key, value) pair with the given 0-based rank, in O(log n).
+
+        Negative indexes count from the end, as with lists.
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("select index out of range")
+        node = self._node_at(index + 1)
+        return (node.key, node.value)
+
+    def items_by_rank(self, start, stop=None):
+        """Yield (key, value) pairs with ranks in [start, stop), in O(log n + k)."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return
+        node = self._node_at(start + 1)
+        for _ in range(stop - start):
+            yield (node.key, node.value)
+            node = node.next[0]
+
+    # ------------------------ TRAVERSAL ------------------------
+    def inorder_items(self):
+        """Yield (key, value) pairs in key order."""
+        node = self._head.next[0]
+        while node is not None:
+            yield (node.key, node.value)
+            node = node.next[0]
+
+    def min(self):
+        """Return the (key, value) pair with the smallest key, or None."""
+        node = self._head.next[0]
+        return (node.key, node.value) if node is not None else None
+
+    def max(self):
+        """Return the (key, value) pair with the largest key, or None."""
+        if not self._size:
+            return None
+        node = self._node_at(self._size)
+        return (node.key, node.value)
+
+    def floor(self, key):
+        """Return the (key, value) pair with the largest key <= key, or None."""
+        node = self._head
+        for level in range(self._levels - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and not key < nxt.key:
+                node = nxt
+                nxt = node.next[level]
+        return (node.key, node.value) if node is not self._head else None
+
+    def _ceiling_node(self, key):
+        update, _ = self._find_path(key)
+        return update[0].next[0]
+
+    def ceiling(self, key):
+        """Return the (key, value) pair with the smallest key >= key, or None."""
+        node = self._ceiling_node(key)
+        return (node.key, node.value) if node is not None else None
+
+    def items_from(self, key):
+        """Yield (key, value) pairs with keys >= key, in key order."""
+        node = self._ceiling_node(key)
+        while node is not None:
+            yield (node.key, node.value)
+            node = node.next[0]
+
+    def range_items(self, lo, hi):
+        """Yield (key, value) pairs with lo <= key <= hi, in key order."""
+        node = self._ceiling_node(lo)
+        while node is not None and not hi < node.key:
+            yield (node.key, node.value)
+            node = node.next[0]
+
+    # ------------------------ HEIGHT ------------------------
+    def height(self):
+        """Index levels above the base list (-1 if empty), the analogue of tree height."""
+        return self._levels - 1 if self._size else -1
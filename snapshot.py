@@ -0,0 +1,282 @@
+"""
+snapshot.py
+Compact binary snapshots of a Schedule for fast startup.
+
+File layout (all integers little-endian):
+- Header: magic, format version, key codec id, record count, string
+  count, the source CSV's mtime/size/SHA-256, and the offsets of the two
+  sections below
+- String table: (string count + 1) uint32 offsets, then one UTF-8 blob.
+  Every distinct field value is stored once.
+- Records: one fixed-width row of 8 uint32 string indexes per item
+  (the ScheduleItem fields in order), sorted by tree key (see key_codecs.py)
+
+Snapshots are read through mmap. A SnapshotReader can answer CRN lookups in
+place with a binary search over the records, or hand its items (already in
+key order) to a tree's linear-time bulk build.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from schedule_item import ScheduleItem
+from key_codecs import StrKeyCodec, codec_for_snapshot_id
+
+SNAPSHOT_MAGIC = b"CSTSNAP\0"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIIqq32sQQ")
+_OFFSET_PAIR = struct.Struct("<II")
+_RECORD = struct.Struct("<8I")
+_ITEM_FIELDS = ("crn", "course_code", "course_title", "instructor",
+                "credits", "days", "time", "location")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is corrupt, of another version, or out of date."""
+
+
+# ---------------------------------------------------------
+# ----------------------- SOURCE CHECK --------------------
+# ---------------------------------------------------------
+def _file_sha256(filename):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def _source_signature(source_csv):
+    """Return (mtime_ns, size, sha256) of the source CSV, or zeros if none."""
+    if source_csv is None:
+        return 0, 0, bytes(32)
+    stat = os.stat(source_csv)
+    return stat.st_mtime_ns, stat.st_size, _file_sha256(source_csv)
+
+
+# ---------------------------------------------------------
+# -------------------------- WRITE ------------------------
+# ---------------------------------------------------------
+def write_snapshot(filename, items, source_csv=None, key_codec=None):
+    """
+    Write schedule items to a binary snapshot file.
+
+    Args:
+        filename (str): Path of the snapshot to create (replaced atomically)
+        items (iterable): ScheduleItem objects sorted by tree key, e.g. from
+            Schedule.get_all_items()
+        source_csv (str, optional): CSV the items were loaded from; its
+            mtime, size and hash are recorded for staleness checks
+        key_codec (optional): Codec whose key order the items follow;
+            defaults to plain CRN strings
+
+    Returns:
+        int: Number of records written
+    """
+    strings = {}
+    records = bytearray()
+    count = 0
+    for item in items:
+        indexes = []
+        for field in _ITEM_FIELDS:
+            value = getattr(item, field)
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings)
+            indexes.append(index)
+        records += _RECORD.pack(*indexes)
+        count += 1
+
+    blob = bytearray()
+    offsets = [0]
+    for value in strings:  # dicts keep insertion order == index order
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    string_table = struct.pack(f"<{len(offsets)}I", *offsets) + blob
+
+    mtime_ns, size, sha256 = _source_signature(source_csv)
+    strings_offset = _HEADER.size
+    records_offset = strings_offset + len(string_table)
+    records_offset += -records_offset % 4  # keep records 4-byte aligned
+    codec_id = (key_codec or StrKeyCodec()).snapshot_id
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, codec_id, count, len(strings),
+                          mtime_ns, size, sha256, strings_offset, records_offset)
+
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, "wb") as f:
+        f.write(header)
+        f.write(string_table)
+        f.write(bytes(records_offset - strings_offset - len(string_table)))
+        f.write(records)
+    os.replace(temp_filename, filename)
+    return count
+
+
+# ---------------------------------------------------------
+# -------------------------- READ -------------------------
+# ---------------------------------------------------------
+class SnapshotReader:
+    """
+    Read-only, mmap-backed view of a snapshot file.
+
+    key_codec is used to compare CRNs in search(); by default it is the
+    codec recorded in the header (pass one to configure a CompositeKeyCodec).
+    """
+
+    def __init__(self, filename, key_codec=None):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"Snapshot '{filename}' is empty")
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise SnapshotError(f"Snapshot '{filename}' is truncated")
+
+        (magic, version, self.key_codec_id, self._count, self._string_count,
+         self.source_mtime_ns, self.source_size, self.source_sha256,
+         self._strings_offset, self._records_offset) = _HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError(f"'{filename}' is not a schedule snapshot")
+        if version != SNAPSHOT_VERSION:
+            self.close()
+            raise SnapshotError(f"Snapshot '{filename}' has version {version}, "
+                                f"expected {SNAPSHOT_VERSION}")
+        try:
+            self.key_codec = key_codec or codec_for_snapshot_id(self.key_codec_id)
+        except ValueError as e:
+            self.close()
+            raise SnapshotError(f"Snapshot '{filename}': {e}")
+        self._blob_offset = self._strings_offset + 4 * (self._string_count + 1)
+        if self._records_offset + _RECORD.size * self._count > len(self._mm):
+            self.close()
+            raise SnapshotError(f"Snapshot '{filename}' is truncated")
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    # ------------------------ VALIDATION ------------------------
+    def is_current(self, source_csv):
+        """
+        True if the snapshot was built from source_csv as it is now.
+
+        A matching mtime and size is trusted; otherwise the file is hashed,
+        so a CSV that was only touched still counts as current.
+        """
+        try:
+            stat = os.stat(source_csv)
+        except FileNotFoundError:
+            return False
+        if stat.st_size != self.source_size:
+            return False
+        if stat.st_mtime_ns == self.source_mtime_ns:
+            return True
+        return _file_sha256(source_csv) == self.source_sha256
+
+    # ------------------------ DECODING ------------------------
+    def _string(self, index):
+        start, end = _OFFSET_PAIR.unpack_from(self._mm, self._strings_offset + 4 * index)
+        return str(self._mm[self._blob_offset + start:self._blob_offset + end], "utf-8")
+
+    def _crn(self, position):
+        return self._string(_RECORD.unpack_from(self._mm, self._records_offset
+                                                + _RECORD.size * position)[0])
+
+    def _item(self, position):
+        indexes = _RECORD.unpack_from(self._mm, self._records_offset + _RECORD.size * position)
+        return ScheduleItem(*[self._string(index) for index in indexes])
+
+    # ------------------------ QUERIES IN PLACE ------------------------
+    def search(self, crn):
+        """Binary search the records for crn; return its ScheduleItem or None."""
+        encode = self.key_codec.encode
+        try:
+            key = encode(crn)
+        except (ValueError, TypeError):
+            return None
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if encode(self._crn(mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and encode(self._crn(lo)) == key:
+            return self._item(lo)
+        return None
+
+    def items(self):
+        """Return every ScheduleItem in CRN order, decoding each string once."""
+        offsets = struct.unpack_from(f"<{self._string_count + 1}I", self._mm, self._strings_offset)
+        blob = self._mm[self._blob_offset:self._blob_offset + offsets[-1]]
+        strings = [str(blob[offsets[i]:offsets[i + 1]], "utf-8")
+                   for i in range(self._string_count)]
+        records = self._mm[self._records_offset:self._records_offset + _RECORD.size * self._count]
+        return [ScheduleItem(*[strings[index] for index in indexes])
+                for indexes in _RECORD.iter_unpack(records)]
+
+    def inorder_items(self):
+        """Yield (crn, item) pairs in CRN order."""
+        for item in self.items():
+            yield (item.get_crn(), item)
+
+
+def open_snapshot(filename, source_csv=None, key_codec=None):
+    """
+    Open a snapshot, optionally checking that it matches its source CSV.
+    key_codec is passed on to SnapshotReader.
+
+    Raises:
+        FileNotFoundError: If the snapshot doesn't exist
+        SnapshotError: If it is invalid, or stale with respect to source_csv
+    """
+    reader = SnapshotReader(filename, key_codec)
+    if source_csv is not None and not reader.is_current(source_csv):
+        reader.close()
+        raise SnapshotError(f"Snapshot '{filename}' is out of date with '{source_csv}'")
+    return reader
+
+
+def load_schedule_cached(schedule, csv_filename, snapshot_filename=None):
+    """
+    Fill schedule from a snapshot of csv_filename, rebuilding it if needed.
+
+    If the snapshot is missing, invalid or stale, the CSV is parsed (fast
+    path), bulk-loaded and a fresh snapshot is written for next time.
+
+    Args:
+        schedule (Schedule): Schedule object to populate
+        csv_filename (str): Source CSV file
+        snapshot_filename (str, optional): Defaults to csv_filename + '.snap'
+
+    Returns:
+        int: Number of courses in the schedule afterwards, one per CRN
+        (the same on both paths: a CSV row repeating a CRN replaces the
+        earlier row and is not counted again)
+    """
+    from csv_loader import parse_schedule_csv, ingest_records
+
+    if snapshot_filename is None:
+        snapshot_filename = csv_filename + ".snap"
+    try:
+        schedule.load_snapshot(snapshot_filename, csv_filename)
+        return schedule.get_item_count()
+    except (FileNotFoundError, SnapshotError):
+        pass
+
+    ingest_records(parse_schedule_csv(csv_filename, fast=True), schedule, bulk=True)
+    schedule.save_snapshot(snapshot_filename, source_csv=csv_filename)
+    return schedule.get_item_count()
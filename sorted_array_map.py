@@ -0,0 +1,280 @@
+"""
+sorted_array_map.py
+SortedArrayMap: a read-optimized map stored as two parallel sorted lists.
+
+Meant for a published, read-mostly catalog: build it once from any tree's
+inorder_items() and every lookup is a bisect over a contiguous key list,
+with no node objects to chase. Rank is the bisect position itself and
+select is a list index, both O(log n) / O(1).
+
+Writes are either refused (read_only=True, they raise TypeError) or
+buffered in a small delta (key -> value, or a deletion marker). Point
+lookups consult the delta first; the delta is merged into the lists in one
+linear pass when it grows past merge_threshold, or before any ordered
+query (ranges, rank/select, traversal) so those always see sorted lists.
+"""
+
+from bisect import bisect_left, bisect_right
+from SearchTrees import _dedupe_sorted, _merge_sorted, _split_sorted
+
+_DELETED = object()  # delta marker for a key deleted from the lists
+
+
+class SortedArrayMap:
+    """Static sorted-array map with an optional write buffer."""
+
+    def __init__(self, read_only=False, merge_threshold=None):
+        self._keys = []
+        self._values = []
+        self._delta = {}
+        self._size = 0
+        self.read_only = read_only
+        # None: merge once the delta reaches 1/16 of the map (at least 64),
+        # so each buffered write costs O(1) amortized list work
+        self.merge_threshold = merge_threshold
+
+    @classmethod
+    def from_sorted_items(cls, items, read_only=False):
+        """Build a map from (key, value) pairs sorted by key, in O(n)."""
+        array_map = cls(read_only=read_only)
+        keys, values = _merge_sorted((), _dedupe_sorted(items))
+        array_map._keys = keys
+        array_map._values = values
+        array_map._size = len(keys)
+        return array_map
+
+    @classmethod
+    def from_tree(cls, tree_map, read_only=False):
+        """Freeze the current contents of any tree map."""
+        return cls.from_sorted_items(tree_map.inorder_items(), read_only)
+
+    def __len__(self):
+        return self._size
+
+    # ------------------------ WRITE BUFFER ------------------------
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError("SortedArrayMap is read-only")
+
+    def _base_index(self, key):
+        """Index of key in the sorted lists, or -1."""
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and not key < self._keys[i]:
+            return i
+        return -1
+
+    def _maybe_merge(self):
+        threshold = self.merge_threshold
+        if threshold is None:
+            threshold = max(64, len(self._keys) // 16)
+        if len(self._delta) >= threshold:
+            self.merge()
+
+    def merge(self):
+        """Apply buffered writes to the sorted lists in one linear pass."""
+        if not self._delta:
+            return
+        pending = sorted(self._delta.items())
+        self._delta = {}
+        keys = []
+        values = []
+        old_keys = self._keys
+        old_values = self._values
+        i = 0
+        n = len(old_keys)
+        for key, value in pending:
+            j = bisect_left(old_keys, key, i)
+            keys += old_keys[i:j]
+            values += old_values[i:j]
+            i = j
+            if i < n and not key < old_keys[i]:
+                i += 1  # replaced or deleted by the delta entry
+            if value is not _DELETED:
+                keys.append(key)
+                values.append(value)
+        keys += old_keys[i:]
+        values += old_values[i:]
+        self._keys = keys
+        self._values = values
+
+    # ------------------------ INSERT / DELETE ------------------------
+    def insert(self, key, value):
+        """Insert or update a key-value pair (buffered until the next merge)."""
+        self._check_writable()
+        delta = self._delta
+        if key in delta:
+            if delta[key] is _DELETED:
+                self._size += 1
+        elif self._base_index(key) < 0:
+            self._size += 1
+        delta[key] = value
+        self._maybe_merge()
+
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        self._check_writable()
+        delta = self._delta
+        in_base = self._base_index(key)
+        if key in delta:
+            value = delta[key]
+            if value is _DELETED:
+                return None
+            if in_base >= 0:
+                delta[key] = _DELETED
+            else:
+                del delta[key]
+        elif in_base >= 0:
+            value = self._values[in_base]
+            delta[key] = _DELETED
+        else:
+            return None
+        self._size -= 1
+        self._maybe_merge()
+        return value
+
+    def delete_many(self, keys):
+        """
+        Delete every key in keys that is present, in one linear pass.
+
+        Returns:
+            list: The removed (key, value) pairs in key order
+        """
+        self._check_writable()
+        self.merge()
+        keys = sorted(set(keys))
+        kept_keys, kept_values, removed = _split_sorted(zip(self._keys, self._values), keys)
+        self._keys = kept_keys
+        self._values = kept_values
+        self._size = len(kept_keys)
+        return removed
+
+    def bulk_load(self, items):
+        """
+        Load (key, value) pairs sorted by key in O(n + m), merging them with
+        the current contents (new values win on duplicate keys).
+
+        Raises:
+            ValueError: If items are not sorted by key
+        """
+        self._check_writable()
+        self.merge()
+        self._keys, self._values = _merge_sorted(zip(self._keys, self._values),
+                                                 _dedupe_sorted(items))
+        self._size = len(self._keys)
+
+    # ------------------------ SEARCH ------------------------
+    def search(self, key):
+        """Return the value for key, or None."""
+        if self._delta and key in self._delta:
+            value = self._delta[key]
+            return None if value is _DELETED else value
+        keys = self._keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and not key < keys[i]:
+            return self._values[i]
+        return None
+
+    get = search  # see _TreeMapBase.get
+
+    def search_many(self, keys):
+        """
+        Look up many keys at once: the probes are sorted and each bisect
+        starts where the previous one ended.
+
+        Returns:
+            list: The value for each key in input order, None for misses
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        delta = self._delta
+        sorted_keys = self._keys
+        n = len(sorted_keys)
+        lo = 0
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[i]
+            if delta and key in delta:
+                value = delta[key]
+                results[i] = None if value is _DELETED else value
+                continue
+            lo = bisect_left(sorted_keys, key, lo)
+            if lo < n and not key < sorted_keys[lo]:
+                results[i] = self._values[lo]
+        return results
+
+    # ------------------------ RANK / SELECT ------------------------
+    def rank(self, key):
+        """Return the number of keys strictly less than key."""
+        self.merge()
+        return bisect_left(self._keys, key)
+
+    def select(self, index):
+        """
+        Return the (key, value) pair with the given 0-based rank, in O(1).
+
+        Negative indexes count from the end, as with lists.
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        self.merge()
+        try:
+            return (self._keys[index], self._values[index])
+        except IndexError:
+            raise IndexError("select index out of range") from None
+
+    def items_by_rank(self, start, stop=None):
+        """Return (key, value) pairs with ranks in [start, stop)."""
+        self.merge()
+        return zip(self._keys[start:stop], self._values[start:stop])
+
+    # ------------------------ TRAVERSAL ------------------------
+    def inorder_items(self):
+        """Return an iterator over (key, value) pairs in key order."""
+        self.merge()
+        return zip(self._keys, self._values)
+
+    def min(self):
+        """Return the (key, value) pair with the smallest key, or None."""
+        self.merge()
+        return (self._keys[0], self._values[0]) if self._keys else None
+
+    def max(self):
+        """Return the (key, value) pair with the largest key, or None."""
+        self.merge()
+        return (self._keys[-1], self._values[-1]) if self._keys else None
+
+    def floor(self, key):
+        """Return the (key, value) pair with the largest key <= key, or None."""
+        self.merge()
+        i = bisect_right(self._keys, key)
+        return (self._keys[i - 1], self._values[i - 1]) if i else None
+
+    def ceiling(self, key):
+        """Return the (key, value) pair with the smallest key >= key, or None."""
+        self.merge()
+        i = bisect_left(self._keys, key)
+        return (self._keys[i], self._values[i]) if i < len(self._keys) else None
+
+    def _slice_items(self, start, stop):
+        # yields lazily instead of copying the slice, so callers that stop
+        # early (paging from a key) only touch what they consume
+        keys = self._keys
+        values = self._values
+        for i in range(start, stop):
+            yield (keys[i], values[i])
+
+    def items_from(self, key):
+        """Return an iterator over (key, value) pairs with keys >= key."""
+        self.merge()
+        return self._slice_items(bisect_left(self._keys, key), len(self._keys))
+
+    def range_items(self, lo, hi):
+        """Return an iterator over (key, value) pairs with lo <= key <= hi."""
+        self.merge()
+        i = bisect_left(self._keys, lo)
+        return self._slice_items(i, bisect_right(self._keys, hi, i))
+
+    # ------------------------ HEIGHT ------------------------
+    def height(self):
+        """Depth of the implicit binary search over the keys (-1 if empty)."""
+        return self._size.bit_length() - 1
@@ -0,0 +1,70 @@
+"""
+test_schedule.py
+Tests for Schedule's CRN queries (run with python -m unittest or pytest).
+"""
+
+import unittest
+from key_codecs import CompositeKeyCodec, IntKeyCodec
+from schedule import Schedule
+from schedule_item import ScheduleItem
+from tree_engines import create_tree_map
+
+
+def make_item(crn):
+    return ScheduleItem(crn, "CSC134", "Intro", "Scott, Terrence", "3",
+                        "MW", "9:00:00 AM-10:40:00 AM", "RM 101")
+
+
+class UnencodableCrnTests(unittest.TestCase):
+    """A CRN the key codec can't encode finds nothing instead of raising."""
+
+    codec = IntKeyCodec()
+    bad_crn = "ABC"
+
+    def setUp(self):
+        self.schedule = Schedule(create_tree_map("avl"), key_codec=self.codec)
+        for crn in self.crns():
+            self.schedule.add_item(make_item(crn))
+
+    def crns(self):
+        return ["10010", "10020", "10030"]
+
+    def test_find_by_crn(self):
+        self.assertIsNone(self.schedule.find_by_crn(self.bad_crn))
+
+    def test_find_by_crn_range(self):
+        low, high = self.crns()[0], self.crns()[-1]
+        self.assertEqual(self.schedule.find_by_crn_range(self.bad_crn, high), [])
+        self.assertEqual(self.schedule.find_by_crn_range(low, self.bad_crn), [])
+        self.assertEqual(len(self.schedule.find_by_crn_range(low, high)), 3)
+
+    def test_iter_crn_range(self):
+        self.assertEqual(list(self.schedule.iter_crn_range(self.bad_crn, self.bad_crn)), [])
+
+    def test_iter_items_from(self):
+        self.assertEqual(list(self.schedule.iter_items_from(self.bad_crn)), [])
+        self.assertEqual(len(list(self.schedule.iter_items_from(self.crns()[1]))), 2)
+
+    def test_find_floor_crn(self):
+        self.assertIsNone(self.schedule.find_floor_crn(self.bad_crn))
+        self.assertEqual(self.schedule.find_floor_crn(self.crns()[1]).crn, self.crns()[1])
+
+    def test_find_ceiling_crn(self):
+        self.assertIsNone(self.schedule.find_ceiling_crn(self.bad_crn))
+        self.assertEqual(self.schedule.find_ceiling_crn(self.crns()[1]).crn, self.crns()[1])
+
+    def test_get_crn_rank(self):
+        self.assertIsNone(self.schedule.get_crn_rank(self.bad_crn))
+        self.assertEqual(self.schedule.get_crn_rank(self.crns()[2]), 2)
+
+
+class UnencodableCompositeCrnTests(UnencodableCrnTests):
+    codec = CompositeKeyCodec()
+    bad_crn = "24301"  # only one part
+
+    def crns(self):
+        return ["2232-10010", "2232-10020", "2232-10030"]
+
+
+if __name__ == "__main__":
+    unittest.main()
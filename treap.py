@@ -0,0 +1,133 @@
+"""
+treap.py
+TreapMap: a randomized binary search tree (tree + heap).
+
+Every node gets a random priority and the tree is kept heap-ordered on it,
+so its shape is that of a BST built in random order: expected height
+O(log n) whatever order the CRNs arrive in, with no balance bookkeeping
+beyond the priority. Shared read operations come from _TreeMapBase.
+"""
+
+import random
+from SearchTrees import _TreeMapBase
+
+
+class _TreapNode:
+    """Node of a Treap."""
+    __slots__ = "key", "value", "left", "right", "priority", "size"
+
+    def __init__(self, key, value, priority):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.priority = priority  # parents have higher priority than children
+        self.size = 1  # number of nodes in this subtree
+
+
+class TreapMap(_TreeMapBase):
+    """Randomized Treap Map. Pass seed for a reproducible shape."""
+
+    def __init__(self, seed=None):
+        super().__init__()
+        self._random = random.Random(seed).random
+        self._height = -1  # cached height; None when a change made it stale
+
+    def _node_class(self, key, value):
+        return _TreapNode(key, value, self._random())
+
+    # ------------------------ INSERT ------------------------
+    def insert(self, key, value):
+        """Insert or update a key-value pair, rotating the new node up by priority."""
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                node.value = value  # update existing
+                return
+
+        node = self._node_class(key, value)
+        self._height = None
+        if not path:
+            self._root = node
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        for ancestor in path:
+            ancestor.size += 1
+
+        # restore heap order
+        while path and path[-1].priority < node.priority:
+            parent = path.pop()
+            if parent.left is node:
+                case, subtree = "LL", self._rotate_right(parent)
+            else:
+                case, subtree = "RR", self._rotate_left(parent)
+            self._replace_child(path, parent, subtree)
+            self._count_rotation(case)
+
+    # ------------------------ DELETE ------------------------
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        else:
+            return None
+
+        # rotate the node down, always lifting the higher-priority child
+        while node.left is not None and node.right is not None:
+            if node.left.priority > node.right.priority:
+                case, subtree = "LL", self._rotate_right(node)
+            else:
+                case, subtree = "RR", self._rotate_left(node)
+            self._replace_child(path, node, subtree)
+            path.append(subtree)
+            self._count_rotation(case)
+
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path, node, child)
+        for ancestor in path:
+            ancestor.size -= 1
+        self._height = None
+        return node.value
+
+    # ------------------------ BULK LOAD ------------------------
+    def bulk_load(self, items):
+        super().bulk_load(items)
+        # the balanced build ignores priorities: hand out fresh ones in
+        # level order, highest first, so every parent outranks its children
+        nodes = []
+        level = [self._root] if self._root is not None else []
+        while level:
+            nodes.extend(level)
+            level = [child for node in level
+                     for child in (node.left, node.right) if child is not None]
+        priorities = sorted((self._random() for _ in nodes), reverse=True)
+        for node, priority in zip(nodes, priorities):
+            node.priority = priority
+        self._height = None
+
+    # ------------------------ HEIGHT ------------------------
+    def height(self):
+        """Height of the tree (-1 if empty); recomputed only after changes."""
+        if self._height is None:
+            self._height = self._subtree_height(self._root)
+        return self._height
@@ -0,0 +1,159 @@
+"""
+tree_engines.py
+The ordered-map protocol that Schedule relies on, and a registry of the map
+implementations ("engines") that provide it, selectable by name.
+
+Engines:
+- bst:       BSTMap, unbalanced binary search tree (height depends on CRN order)
+- avl:       AVLTreeMap, strictly balanced binary tree
+- persistent-avl: PersistentAVLTreeMap, AVL tree whose writes copy the
+  search path, so snapshot() is O(1) and snapshots never change
+- array-avl: ArrayAVLTreeMap, AVL tree stored in array columns (less memory)
+- rbtree:    RedBlackTreeMap, fewer rotations per insert/delete than AVL
+- treap:     TreapMap, randomized balancing with no per-node balance rules
+- skiplist:  SkipListMap, indexable skip list
+- btree:     BTreeMap, wide nodes searched with bisect (few levels)
+- sorted-array: SortedArrayMap, bisect over sorted lists; writes are
+  buffered and merged in batches (for read-mostly catalogs)
+"""
+
+from typing import Protocol, runtime_checkable
+from SearchTrees import BSTMap, AVLTreeMap
+from persistent_avl import PersistentAVLTreeMap
+from array_avl_tree import ArrayAVLTreeMap
+from rb_tree import RedBlackTreeMap
+from treap import TreapMap
+from skip_list import SkipListMap
+from btree import BTreeMap
+from sorted_array_map import SortedArrayMap
+
+DEFAULT_ENGINE = "avl"
+
+
+@runtime_checkable
+class TreeMap(Protocol):
+    """
+    Ordered map of keys to values, as used by Schedule.
+
+    Keys are compared with < only. Queries that find nothing return None
+    rather than raising; (key, value) pairs are returned as tuples and
+    iterators yield them in key order.
+    """
+
+    def insert(self, key, value):
+        """Insert a pair, replacing the value of an existing key."""
+
+    def delete(self, key):
+        """Remove key and return its value, or None if not found."""
+
+    def delete_many(self, keys):
+        """Remove every present key; return the removed pairs in key order."""
+
+    def bulk_load(self, items):
+        """Merge in pairs sorted by key (ValueError if unsorted); new values win."""
+
+    def search(self, key):
+        """Return the value for key, or None."""
+
+    def get(self, key):
+        """Like search(), but never counted by enable_stats()."""
+
+    def search_many(self, keys):
+        """Return the value for each key in input order, None for misses."""
+
+    def inorder_items(self):
+        """Iterate over all pairs in key order."""
+
+    def items_from(self, key):
+        """Iterate over pairs with keys >= key."""
+
+    def range_items(self, lo, hi):
+        """Iterate over pairs with lo <= key <= hi."""
+
+    def items_by_rank(self, start, stop=None):
+        """Iterate over pairs with ranks in [start, stop), slice-style."""
+
+    def floor(self, key):
+        """Return the pair with the largest key <= key, or None."""
+
+    def ceiling(self, key):
+        """Return the pair with the smallest key >= key, or None."""
+
+    def min(self):
+        """Return the pair with the smallest key, or None."""
+
+    def max(self):
+        """Return the pair with the largest key, or None."""
+
+    def rank(self, key):
+        """Return the number of keys strictly less than key."""
+
+    def select(self, index):
+        """Return the pair with the given 0-based rank (IndexError if out of range)."""
+
+    def height(self):
+        """Return the structure's height (-1 if empty)."""
+
+    def __len__(self):
+        """Return the number of keys."""
+
+
+# ---------------------------------------------------------
+# ------------------------ REGISTRY -----------------------
+# ---------------------------------------------------------
+ENGINES = {}  # name -> (factory, description)
+
+
+def register_engine(name, factory, description=""):
+    """
+    Register a tree map engine under a name.
+
+    Args:
+        name (str): Name used by create_tree_map() and the --engine flag
+        factory (callable): Returns a new, empty map implementing TreeMap
+        description (str): One-line summary shown in engine listings
+
+    Raises:
+        ValueError: If name is already registered
+    """
+    if name in ENGINES:
+        raise ValueError(f"Tree engine '{name}' is already registered")
+    ENGINES[name] = (factory, description)
+
+
+def create_tree_map(name=DEFAULT_ENGINE):
+    """
+    Create an empty tree map of the named engine.
+
+    Raises:
+        ValueError: If no engine has that name
+    """
+    try:
+        factory, _ = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown tree engine '{name}' "
+                         f"(available: {', '.join(available_engines())})") from None
+    return factory()
+
+
+def available_engines():
+    """Return the registered engine names, in registration order."""
+    return list(ENGINES)
+
+
+def describe_engine(name):
+    """Return the description an engine was registered with."""
+    return ENGINES[name][1]
+
+
+register_engine("bst", BSTMap, "Unbalanced binary search tree")
+register_engine("avl", AVLTreeMap, "AVL tree (strict balance, fastest lookups)")
+register_engine("persistent-avl", PersistentAVLTreeMap,
+                "Path-copying AVL tree (O(1) read-only snapshots)")
+register_engine("array-avl", ArrayAVLTreeMap,
+                "AVL tree in array columns (low memory)")
+register_engine("rbtree", RedBlackTreeMap, "Red-black tree (fewer rotations on writes)")
+register_engine("treap", TreapMap, "Randomized treap")
+register_engine("skiplist", SkipListMap, "Indexable skip list")
+register_engine("btree", BTreeMap, "B-tree with wide nodes (few levels)")
+register_engine("sorted-array", SortedArrayMap, "Sorted arrays + bisect (read-mostly data)")
@@ -0,0 +1,116 @@
+"""
+tree_stats.py
+Operation counters and latency histograms for the tree maps.
+
+A TreeStats object is attached with tree_map.enable_stats(). For every
+search, insert and delete it records the key comparisons made, the nodes
+visited, the nodes allocated and the rotations performed (by AVL case:
+LL, RR, LR, RL), plus the call's latency in a power-of-two histogram.
+Allocations are one node per new key, except for the persistent AVL
+tree, whose writes also count every node they copy along the path.
+Red-black trees and treaps report their rotations in the same terms: a
+single right or left rotation as LL or RR, a double rotation as LR or RL.
+
+While stats are disabled nothing is recorded and the maps run their
+normal code: enable_stats() swaps in instrumented methods on the one
+instance and disable_stats() removes them again.
+"""
+
+ROTATION_KINDS = ("LL", "RR", "LR", "RL")
+
+
+class OperationStats:
+    """Totals and a latency histogram for one kind of operation."""
+    __slots__ = ("calls", "comparisons", "nodes_visited", "allocations",
+                 "rotations", "total_ns", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.comparisons = 0
+        self.nodes_visited = 0
+        self.allocations = 0
+        self.rotations = 0
+        self.total_ns = 0
+        # histogram[b] counts calls taking [2**(b-1), 2**b) ns
+        self.histogram = [0] * 64
+
+    def average(self, field):
+        """Average of a counter (e.g. 'nodes_visited') per call, or None."""
+        return getattr(self, field) / self.calls if self.calls else None
+
+    def latency_percentile(self, fraction):
+        """
+        Upper bound of the histogram bucket holding the given fraction of
+        calls (0.5 for p50), in ns; None if there were no calls.
+        """
+        if not self.calls:
+            return None
+        target = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return 1 << bucket
+        return 1 << 63
+
+
+class TreeStats:
+    """Per-operation statistics for one tree map."""
+
+    def __init__(self):
+        self.operations = {}  # operation name -> OperationStats
+        self.rotations = dict.fromkeys(ROTATION_KINDS, 0)
+        self.rotation_count = 0
+        self.allocation_count = 0
+
+    def reset(self):
+        self.__init__()
+
+    def record(self, operation, elapsed_ns, comparisons, nodes_visited,
+               allocations=0, rotations=0):
+        """Add one call of operation to the totals."""
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = OperationStats()
+        stats.calls += 1
+        stats.comparisons += comparisons
+        stats.nodes_visited += nodes_visited
+        stats.allocations += allocations
+        stats.rotations += rotations
+        stats.total_ns += elapsed_ns
+        stats.histogram[min(elapsed_ns.bit_length(), 63)] += 1
+
+    def count_rotation(self, kind):
+        """Count one rebalancing case (LL, RR, LR or RL)."""
+        self.rotations[kind] += 1
+        self.rotation_count += 1
+
+    def count_allocations(self, count):
+        """Count nodes built by a write beyond one per new key."""
+        self.allocation_count += count
+
+    def get(self, operation):
+        """Return the OperationStats for operation (empty if never called)."""
+        return self.operations.get(operation) or OperationStats()
+
+    def average_path_length(self, operation="search"):
+        """Measured average nodes visited per call, or None if never called."""
+        return self.get(operation).average("nodes_visited")
+
+    def average_comparisons(self, operation="search"):
+        """Measured average key comparisons per call, or None if never called."""
+        return self.get(operation).average("comparisons")
+
+    def summary_lines(self):
+        """Human-readable report lines, one per operation plus rotations."""
+        lines = []
+        for name, stats in self.operations.items():
+            lines.append(
+                f"{name:<7} calls={stats.calls:<8,} "
+                f"visited/call={stats.average('nodes_visited'):6.2f} "
+                f"cmp/call={stats.average('comparisons'):6.2f} "
+                f"alloc={stats.allocations:<7,} "
+                f"p50≤{stats.latency_percentile(0.5):,}ns p99≤{stats.latency_percentile(0.99):,}ns")
+        kinds = ", ".join(f"{kind}={self.rotations[kind]:,}" for kind in ROTATION_KINDS)
+        lines.append(f"rebalancing cases: {kinds} (total {self.rotation_count:,})")
+        return lines